@@ -1,23 +1,45 @@
 # backend/app.py
 """FastAPI backend for Multilingual Health Assistant - humanized & minimal."""
 
+import asyncio
+import functools
+import json
 import os
+import re
+import shutil
 import sqlite3
-import threading
+import time
 from datetime import datetime
-from typing import Dict, Any
+from typing import Dict, Any, List
 
-from fastapi import FastAPI, HTTPException
+from fastapi import Depends, FastAPI, Header, HTTPException, Request
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import FileResponse, Response, StreamingResponse
 from pydantic import BaseModel
-import httpx
 import openai
 from dotenv import load_dotenv
 import logging
 
+import deadline
+import http_clients
+from translation_cache import TranslationCache, normalize_text
+from provider_chain import HedgedChain, LatencyTracker
+from circuit_breaker import CircuitBreaker, probe_loop
+from singleflight import SingleFlight
+from segmenter import approx_tokens, chunk_text, join_sentences, split_sentences
+from provider_router import ProviderRouter
+from providers import build_providers
+from language_matrix import LanguageMatrix
+from rate_limiter import RateLimited, RateLimiter
+from phrasebook import Phrasebook
+from translation_jobs import JobRunner, JobStore
+from tts_service import PRIORITIES, TTSQueueFull, TTSService, make_engine
+from audio_cache import AudioCache, audio_key, parse_range, streaming_wav_header, wav_frames
+import langid
+
 # optional TTS
 try:
-    import pyttsx3
+    import pyttsx3  # noqa: F401 (engines are built in tts_service.make_engine)
     TTS_AVAILABLE = True
 except Exception:
     TTS_AVAILABLE = False
@@ -32,6 +54,68 @@ GROQ_API_KEY = os.getenv("GROQ_API_KEY", "")
 BASE_DIR = os.path.dirname(__file__)
 DB_PATH = os.getenv("DB_PATH", os.path.join(BASE_DIR, "reminders.db"))
 
+# Translation cache: in-process LRU in front of a SQLite table beside reminders.db
+TRANSLATION_CACHE_DB = os.getenv("TRANSLATION_CACHE_DB", os.path.join(os.path.dirname(DB_PATH), "translation_cache.db"))
+translation_cache = TranslationCache(
+    TRANSLATION_CACHE_DB,
+    memory_size=int(os.getenv("CACHE_MEMORY_SIZE", "2048")),
+    ttl_seconds=float(os.getenv("CACHE_TTL_SECONDS", str(30 * 24 * 3600))),
+    max_rows=int(os.getenv("CACHE_MAX_ROWS", "100000")),
+)
+
+# Phrasebook: prebuilt pack of common phrases (build_phrasebook.py), checked before
+# the cache and reloaded when the file is replaced
+PHRASEBOOK_PATH = os.getenv("PHRASEBOOK_PATH", os.path.join(BASE_DIR, "phrasebook.pack"))
+PHRASEBOOK_CHECK_SECONDS = float(os.getenv("PHRASEBOOK_CHECK_SECONDS", "30"))
+phrasebook = Phrasebook(PHRASEBOOK_PATH)
+
+# Local language ID: text already in the target language is returned as is, and
+# providers get the detected source instead of "auto"
+LANGID_ENABLED = os.getenv("LANGID_ENABLED", "1") == "1"
+
+# Sentence-level translation: long messages are cached and translated per sentence
+SEGMENT_TRANSLATION = os.getenv("SEGMENT_TRANSLATION", "1") == "1"
+
+# Long documents: above CHUNK_THRESHOLD_TOKENS the text is split into chunks of
+# about CHUNK_MAX_TOKENS at paragraph / sentence boundaries instead of sentences.
+# Pieces are translated CHUNK_CONCURRENCY at a time (provider rate limits still
+# apply) and a piece that fails is retried CHUNK_RETRIES times.
+CHUNK_THRESHOLD_TOKENS = int(os.getenv("CHUNK_THRESHOLD_TOKENS", "400"))
+CHUNK_MAX_TOKENS = int(os.getenv("CHUNK_MAX_TOKENS", "300"))
+CHUNK_CONCURRENCY = int(os.getenv("CHUNK_CONCURRENCY", "8"))
+CHUNK_RETRIES = int(os.getenv("CHUNK_RETRIES", "1"))
+
+# Translation jobs (POST /translate/jobs): documents too long to wait for are
+# chunked into a SQLite table beside reminders.db and worked off by JOB_WORKERS
+# background tasks; unfinished chunks are picked up again after a restart.
+TRANSLATION_JOBS_DB = os.getenv("TRANSLATION_JOBS_DB", os.path.join(os.path.dirname(DB_PATH), "translation_jobs.db"))
+JOB_WORKERS = int(os.getenv("JOB_WORKERS", "4"))
+JOB_MAX_CHARS = int(os.getenv("JOB_MAX_CHARS", "200000"))
+JOB_RETENTION_SECONDS = float(os.getenv("JOB_RETENTION_SECONDS", str(7 * 24 * 3600)))
+
+# Single-flight: concurrent /translate calls for the same (text, target) share one upstream walk
+inflight_translations = SingleFlight()
+
+# Request deadline: X-Request-Timeout (seconds) or REQUEST_DEADLINE, capped at
+# REQUEST_DEADLINE_MAX; provider calls only get what is left of it. The default
+# stays under the 12s client timeout in streamlit_app.py.
+REQUEST_DEADLINE = float(os.getenv("REQUEST_DEADLINE", "10"))
+REQUEST_DEADLINE_MAX = float(os.getenv("REQUEST_DEADLINE_MAX", "30"))
+
+BATCH_MAX_TEXTS = int(os.getenv("BATCH_MAX_TEXTS", "200"))
+BATCH_MAX_TARGETS = int(os.getenv("BATCH_MAX_TARGETS", "10"))
+
+# Hedged fallback: the next provider starts once the current one exceeds its
+# observed latency percentile (HEDGE_DELAY until enough samples exist)
+hedged_chain = HedgedChain(
+    LatencyTracker(window=int(os.getenv("HEDGE_WINDOW", "200"))),
+    default_delay=float(os.getenv("HEDGE_DELAY", "1.5")),
+    percentile=float(os.getenv("HEDGE_PERCENTILE", "95")),
+    min_delay=float(os.getenv("HEDGE_MIN_DELAY", "0.2")),
+    max_delay=float(os.getenv("HEDGE_MAX_DELAY", "5.0")),
+    enabled=os.getenv("HEDGE_ENABLED", "1") == "1",
+)
+
 app = FastAPI(title="Multilingual Health Assistant API", version="1.0")
 
 # Logger
@@ -98,14 +182,133 @@ LINGO_PROJECT_ID = _load_secret_from_file("LINGO_PROJECT_ID")
 OPENAI_API_KEY = _load_secret_from_file("OPENAI_API_KEY")
 GROQ_API_KEY = _load_secret_from_file("GROQ_API_KEY")
 
+# Providers: PROVIDER_CHAIN names the registered providers (see providers.py) in
+# fallback order; endpoints are overridable for staging / local stub servers
+PROVIDER_CHAIN = [n.strip() for n in os.getenv("PROVIDER_CHAIN", "lingo,groq,openai,libretranslate").split(",") if n.strip()]
+HTTP_WARMUP = os.getenv("HTTP_WARMUP", "1") == "1"
+PROVIDER_SETTINGS = {
+    "lingo": {
+        "api_key": LINGO_API_KEY,
+        "project_id": LINGO_PROJECT_ID,
+        "base_url": os.getenv("LINGO_BASE_URL", "https://api.lingo.dev"),
+        "warm_up": HTTP_WARMUP,
+    },
+    "groq": {
+        "api_key": GROQ_API_KEY,
+        "base_url": os.getenv("GROQ_BASE_URL", "https://api.groq.com/openai/v1"),
+        "model": os.getenv("GROQ_MODEL", "llama-3.1-8b-instant"),
+        "timeout": float(os.getenv("GROQ_TIMEOUT", "5.0")),
+        "warm_up": HTTP_WARMUP,
+    },
+    "openai": {
+        "api_key": OPENAI_API_KEY,
+        "base_url": os.getenv("OPENAI_BASE_URL", "https://api.openai.com/v1"),
+        "model": os.getenv("OPENAI_MODEL", "gpt-3.5-turbo"),
+        "timeout": float(os.getenv("OPENAI_TIMEOUT", "10.0")),
+        "max_retries": int(os.getenv("OPENAI_MAX_RETRIES", "1")),
+        # Micro-batching: OpenAI-bound texts arriving within OPENAI_BATCH_WINDOW_MS of
+        # each other (same target) share one packed completion; 0 disables it
+        "batch_window": float(os.getenv("OPENAI_BATCH_WINDOW_MS", "20")) / 1000,
+        "batch_max": int(os.getenv("OPENAI_BATCH_MAX", "20")),
+        # longer texts (document chunks) get a completion of their own, in parallel
+        "batch_text_tokens": int(os.getenv("OPENAI_BATCH_TEXT_TOKENS", "50")),
+        # /translate/stream streams tokens from the first streaming-capable provider
+        "streaming": os.getenv("OPENAI_STREAMING", "1") == "1",
+        "warm_up": HTTP_WARMUP,
+    },
+    "libretranslate": {
+        "base_url": os.getenv("LIBRETRANSLATE_URL", "https://libretranslate.de"),
+        "warm_up": HTTP_WARMUP,
+    },
+}
+providers = build_providers(PROVIDER_CHAIN, PROVIDER_SETTINGS)
+
+# Language capability matrix: seeded from the offline fallback file and the Lingo
+# project's targetLanguages, refreshed from provider language-list endpoints
+LINGO_CONFIG = os.getenv("LINGO_CONFIG", os.path.join(BASE_DIR, "..", "lingo.config.json"))
+language_matrix = LanguageMatrix.from_files(
+    os.getenv("LANGUAGE_FALLBACK_FILE", os.path.join(BASE_DIR, "language_capabilities.json")),
+    LINGO_CONFIG,
+)
+LANGUAGE_REFRESH_SECONDS = float(os.getenv("LANGUAGE_REFRESH_SECONDS", str(24 * 3600)))
+
+
+# Client-side rate limits per provider: {NAME}_RPS / {NAME}_BURST / {NAME}_TPM
+# (0 = unlimited). Bursts wait in a bounded queue; a call that can't start
+# within RATE_LIMIT_MAX_WAIT (or the request deadline) moves down the chain.
+def rate_limiter_for(name: str) -> RateLimiter:
+    prefix = name.upper()
+    return RateLimiter(
+        name,
+        rps=float(os.getenv(f"{prefix}_RPS", "0")),
+        burst=float(os.getenv(f"{prefix}_BURST", "0")),
+        tpm=float(os.getenv(f"{prefix}_TPM", "0")),
+        max_queue=int(os.getenv("RATE_LIMIT_QUEUE_MAX", "100")),
+        max_wait=float(os.getenv("RATE_LIMIT_MAX_WAIT", "2.0")),
+    )
+
+def apply_rate_limits():
+    for name, provider in providers.items():
+        provider.limiter = rate_limiter_for(name)
+
+apply_rate_limits()
+
+
+def apply_language_matrix():
+    for name, provider in providers.items():
+        provider.languages = language_matrix.languages(name)
+
+apply_language_matrix()
+
+
+async def refresh_languages() -> Dict[str, str]:
+    outcome = await language_matrix.refresh({n: p for n, p in providers.items() if p.configured()})
+    apply_language_matrix()
+    return outcome
+
+
+async def _phrasebook_reload_loop():
+    while True:
+        await asyncio.sleep(PHRASEBOOK_CHECK_SECONDS)
+        phrasebook.reload_if_changed()
+
+
+async def _language_refresh_loop():
+    while True:
+        await refresh_languages()
+        await asyncio.sleep(LANGUAGE_REFRESH_SECONDS)
+
+
+def resolve_target(target: str) -> str:
+    """Canonical target code; unknown codes are rejected before any provider is tried."""
+    code = language_matrix.canonical(target)
+    if code is None:
+        raise HTTPException(status_code=400, detail=f"Unsupported target language: {target!r}.")
+    return code
+
+
+def available_providers(target: str) -> List[str]:
+    """Configured providers in chain order that declare support for `target`."""
+    return [name for name in PROVIDER_CHAIN if providers[name].configured() and providers[name].supports(target)]
+
 # Models
 class TranslateRequest(BaseModel):
     text: str
     target_lang: str
 
+class TranslationJobRequest(BaseModel):
+    text: str
+    target_lang: str
+
+
+class BatchTranslateRequest(BaseModel):
+    texts: List[str]
+    target_langs: List[str]
+
 class SpeakRequest(BaseModel):
     text: str
     target_lang: str = "en"
+    priority: str = "normal"  # high | normal | low
 
 class ReminderRequest(BaseModel):
     medicine: str
@@ -114,176 +317,820 @@ class ReminderRequest(BaseModel):
     language: str = "en"
 
 # Helpers
-async def call_lingo_translate(text: str, target: str) -> str | None:
-    if not LINGO_API_KEY or not LINGO_PROJECT_ID:
-        return None
-    try:
-        url = f"https://api.lingo.dev/v1/projects/{LINGO_PROJECT_ID}/translate"
-        payload = {"text": text, "target": target, "source": "auto"}
-        headers = {"Authorization": f"Bearer {LINGO_API_KEY}"}
-        async with httpx.AsyncClient(timeout=10.0) as client:
-            r = await client.post(url, json=payload, headers=headers)
-            if r.status_code == 200:
-                data = r.json()
-                translation = data.get("translation") or data.get("translatedText") or data.get("result")
-                logger.info("translation_provider=lingo status=ok target=%s", target)
-                return translation
-    except Exception:
-        logger.exception("translation_provider=lingo status=error target=%s", target)
-        return None
-    return None
+# TTS engine: pyttsx3 (default) or "espeak", the espeak-ng CLI, for hosts that
+# only render audio files. TTS_VOICE / TTS_RATE apply to every engine.
+TTS_ENGINE = os.getenv("TTS_ENGINE", "pyttsx3")
+ESPEAK_COMMAND = os.getenv("ESPEAK_COMMAND", "espeak-ng")
+if TTS_ENGINE == "espeak":
+    TTS_AVAILABLE = shutil.which(ESPEAK_COMMAND) is not None
+TTS_VOICE = os.getenv("TTS_VOICE", "")
+TTS_RATE = int(os.getenv("TTS_RATE", "120"))
+TTS_RENDER_TIMEOUT = float(os.getenv("TTS_RENDER_TIMEOUT", "30"))
+# /speak/stream renders this many sentences ahead of the one being sent
+TTS_STREAM_AHEAD = max(1, int(os.getenv("TTS_STREAM_AHEAD", "3")))
 
+# Rendered speech (POST /speak/audio) is kept on disk, named by a hash of
+# everything that shapes the audio, and trimmed to TTS_CACHE_MAX_BYTES
+audio_cache = AudioCache(
+    os.getenv("TTS_CACHE_DIR", os.path.join(os.path.dirname(DB_PATH), "tts_cache")),
+    max_bytes=int(os.getenv("TTS_CACHE_MAX_BYTES", str(200 * 1024 * 1024))),
+)
+inflight_audio = SingleFlight()
 
-async def call_libretranslate(text: str, target: str) -> str | None:
-    """Fallback translation using LibreTranslate public instance for demo purposes."""
-    try:
-        url = "https://libretranslate.de/translate"
-        payload = {"q": text, "source": "auto", "target": target, "format": "text"}
-        async with httpx.AsyncClient(timeout=10.0) as client:
-            r = await client.post(url, data=payload)
-            if r.status_code == 200:
-                data = r.json()
-                translation = data.get("translatedText") or data.get("translation")
-                logger.info("translation_provider=libretranslate status=ok target=%s", target)
-                return translation
-    except Exception:
-        logger.exception("translation_provider=libretranslate status=error target=%s", target)
-        return None
-    return None
 
+new_tts_engine = functools.partial(make_engine, TTS_ENGINE, rate=TTS_RATE, volume=0.9, voice=TTS_VOICE,
+                                   command=ESPEAK_COMMAND)
 
-def openai_translate(text: str, target: str) -> str:
-    if not OPENAI_API_KEY:
-        raise RuntimeError("OpenAI key not configured.")
-    # Try the commonly-used `openai` package first (stable API), then
-    # fall back to the newer `OpenAI` client if available.
-    language_names = {
-        "hi": "Hindi", "ta": "Tamil", "te": "Telugu", "bn": "Bengali",
-        "es": "Spanish", "fr": "French", "ar": "Arabic", "en": "English"
+
+# TTS: /speak queues onto a fixed pool of long-lived engines instead of a new
+# thread and engine per request; a full queue answers 429. TTS_BACKEND=process
+# puts each engine in its own process (one per core by default).
+TTS_BACKEND = os.getenv("TTS_BACKEND", "thread")
+# Voices: each language in TTS_LANGUAGES (default: the lingo.config.json
+# languages) is mapped to an installed voice at startup, and gets
+# TTS_LANE_WORKERS engines of its own already set to that voice. In-process
+# pyttsx3 engines are one shared engine, so that setup switches voices on
+# demand instead.
+TTS_LANGUAGES = [code.strip() for code in os.getenv("TTS_LANGUAGES", "").split(",") if code.strip()] or sorted(
+    (language_matrix.languages("lingo") or set()) | {"en"})
+_shared_engine = TTS_BACKEND == "thread" and TTS_ENGINE == "pyttsx3"
+tts_service = TTSService(
+    new_tts_engine,
+    backend=TTS_BACKEND,
+    lane_workers=int(os.getenv("TTS_LANE_WORKERS", "0" if _shared_engine else "1")),
+    workers=int(os.getenv("TTS_WORKERS", str(os.cpu_count() or 1) if TTS_BACKEND == "process" else "1")),
+    max_queue=int(os.getenv("TTS_QUEUE_MAX", "32")),
+    max_age=float(os.getenv("TTS_MAX_AGE", "30")),
+)
+
+def demo_translation(text: str, target: str) -> str:
+    # Simple demo translations for testing
+    demo_translations = {
+        "hi": "यह एक डेमो अनुवाद है: " + text,
+        "ta": "இது ஒரு டெமோ மொழிபெயர்ப்பு: " + text,
+        "te": "ఇది డెమో అనువాదం: " + text,
+        "bn": "এটি একটি ডেমো অনুবাদ: " + text,
+        "es": "Esta es una traducción de demostración: " + text,
+        "fr": "Ceci est une traduction de démonstration: " + text,
+        "ar": "هذه ترجمة تجريبية: " + text,
+        "en": text
     }
-    target_name = language_names.get(target, target)
-    prompt = (
-        f"You are a translator writing for elderly users. Translate the text below into {target_name}. "
-        "Use short, clear sentences and easy words.\n\n"
-        f"Text: {text}\n\nTranslation:"
+    if target in demo_translations:
+        return demo_translations[target]
+    return f"[Demo Mode - API Error] {text}"
+
+
+async def request_deadline(x_request_timeout: str = Header(default="")) -> float:
+    """Dependency: start the request's time budget; returns its length in seconds.
+
+    Async on purpose: sync dependencies run in a worker thread, whose context
+    changes would not reach the endpoint.
+    """
+    try:
+        seconds = float(x_request_timeout) if x_request_timeout else REQUEST_DEADLINE
+    except ValueError:
+        raise HTTPException(status_code=400, detail="X-Request-Timeout must be a number of seconds.")
+    seconds = min(max(seconds, 0.05), REQUEST_DEADLINE_MAX)
+    deadline.start(seconds)
+    return seconds
+
+
+def detect_source(text: str) -> str | None:
+    """Detected language of `text`, or None when unsure (or detection is off)."""
+    return langid.detect(text).lang if LANGID_ENABLED else None
+
+
+def local_translation(text: str, target: str) -> tuple[str, str, str] | None:
+    """Phrasebook, then cache; returns (translation, provider, tier) or None."""
+    phrase = phrasebook.lookup(text, target)
+    if phrase is not None:
+        return phrase, "phrasebook", "phrasebook"
+    return translation_cache.get(text, target, PROVIDER_CHAIN)
+
+
+def best_effort_translation(text: str, target: str) -> tuple[str, str, str | None]:
+    """What we can answer without going upstream: phrasebook or cached translation, else demo text."""
+    return local_translation(text, target) or (demo_translation(text, target), "demo", None)
+
+
+# Adaptive routing: PROVIDER_CHAIN is the starting order; per target language the
+# router promotes whichever provider has been fastest to a good answer
+provider_router = ProviderRouter(
+    alpha=float(os.getenv("ROUTER_EWMA_ALPHA", "0.2")),
+    epsilon=float(os.getenv("ROUTER_EPSILON", "0.1")),
+    min_samples=int(os.getenv("ROUTER_MIN_SAMPLES", "5")),
+    enabled=os.getenv("ADAPTIVE_ROUTING", "1") == "1",
+)
+ADMIN_TOKEN = _load_secret_from_file("ADMIN_TOKEN")
+
+# Circuit breakers: providers with an open breaker are skipped without a network call
+breakers = {
+    name: CircuitBreaker(
+        name,
+        window=int(os.getenv("BREAKER_WINDOW", "20")),
+        min_calls=int(os.getenv("BREAKER_MIN_CALLS", "5")),
+        failure_rate=float(os.getenv("BREAKER_FAILURE_RATE", "0.5")),
+        open_seconds=float(os.getenv("BREAKER_OPEN_SECONDS", "30")),
     )
+    for name in PROVIDER_CHAIN
+}
+BREAKER_PROBE_INTERVAL = float(os.getenv("BREAKER_PROBE_INTERVAL", "15"))
+
+
+
+async def translate_with_providers(text: str, target: str, source: str = "auto") -> tuple[str, str]:
+    """Race the available providers (hedged); returns (translation, provider)."""
+    # the breaker itself is consulted when the chain launches a provider (breakers[name].wrap)
+    available = [name for name in available_providers(target) if breakers[name].available()]
+    chain = [
+        (name, provider_router.wrap(name, target, breakers[name].wrap(
+            functools.partial(providers[name].translate, source=source))))
+        for name in provider_router.order(target, available)
+    ]
+    result = await hedged_chain.run(chain, text, target)
+    if result:
+        return result
+
+    translation = demo_translation(text, target)
+    logger.info("translation_provider=fallback final_target=%s used_demo=%s", target, translation.startswith("[Demo Mode"))
+    return translation, "demo"
+
+async def translate_segment(text: str, target: str, source: str = "auto") -> tuple[str, str, str | None]:
+    """Phrasebook and cache lookup, then a coalesced provider walk; returns (translation, provider, cache tier)."""
+    cached = local_translation(text, target)
+    if cached:
+        logger.info("translation_provider=%s status=cached tier=%s target=%s", cached[1], cached[2], target)
+        return cached
+    # identical requests arriving while this one is upstream share its result
     try:
-        # Classic `openai` package (openai==0.x)
-        import openai as _openai
-        _openai.api_key = OPENAI_API_KEY
-        resp = _openai.ChatCompletion.create(
-            model="gpt-3.5-turbo",
-            messages=[
-                {"role": "system", "content": "You are a helpful translator."},
-                {"role": "user", "content": prompt},
-            ],
-            temperature=0.2,
-            max_tokens=400
-        )
-        # Support both response shapes
-        if hasattr(resp, "choices") and len(resp.choices) > 0:
-            choice = resp.choices[0]
-            # new-sdk style
-            if hasattr(choice, "message"):
-                return choice.message.get("content", "").strip()
-            # older style
-            return getattr(choice, "text", "").strip()
-    except Exception:
+        translation, provider = await deadline.bounded(inflight_translations.do(
+            (normalize_text(text), target), lambda: translate_and_cache(text, target, source)
+        ))
+    except deadline.DeadlineExceeded:
+        logger.warning("translation_provider=none status=deadline_exceeded target=%s", target)
+        return best_effort_translation(text, target)
+    return translation, provider, None
+
+
+async def translate_pieces(pieces: List[str], target: str, source: str = "auto") -> Dict[str, tuple[str, str, str | None]]:
+    """Translate distinct sentences / chunks concurrently (bounded), retrying failed ones.
+
+    Returns piece -> (translation, provider, cache tier).
+    """
+    limit = asyncio.Semaphore(CHUNK_CONCURRENCY)
+
+    async def one(piece: str):
+        async with limit:
+            for attempt in range(CHUNK_RETRIES + 1):
+                result = await translate_segment(piece, target, source)
+                if result[1] != "demo" or attempt == CHUNK_RETRIES or deadline.expired():
+                    return result
+                logger.warning("translation_provider=demo status=piece_retry target=%s attempt=%d chars=%d",
+                               target, attempt + 1, len(piece))
+                await asyncio.sleep(0.1 * 2 ** attempt)
+
+    unique = list(dict.fromkeys(pieces))
+    return dict(zip(unique, await asyncio.gather(*(one(p) for p in unique))))
+
+
+async def translate_and_cache(text: str, target: str, source: str = "auto") -> tuple[str, str]:
+    translation, provider = await translate_with_providers(text, target, source)
+    if provider != "demo":
+        translation_cache.put(text, target, provider, translation)
+    return translation, provider
+
+
+async def translate_batch_with_providers(texts: List[str], target: str, source: str = "auto") -> List[tuple[str, str]]:
+    """Translate `texts` into `target` with one multi-text call per provider.
+
+    Whatever a provider leaves untranslated moves on to the next one; the
+    rest ends up as demo text. Returns (translation, provider) per input.
+    """
+    results: List[tuple[str, str] | None] = [None] * len(texts)
+    for name in provider_router.order(target, available_providers(target)):
+        todo = [i for i, r in enumerate(results) if r is None]
+        if not todo:
+            break
+        breaker = breakers[name]
+        if not breaker.allow():
+            continue
         try:
-            # Newer `OpenAI` client
-            from openai import OpenAI as _OpenAIClient
-            client = _OpenAIClient(api_key=OPENAI_API_KEY)
-            response = client.chat.completions.create(
-                model="gpt-3.5-turbo",
-                messages=[
-                    {"role": "system", "content": "You are a helpful translator."},
-                    {"role": "user", "content": prompt},
-                ],
-                temperature=0.2,
-                max_tokens=400
-            )
-            # response shape similar to above
-            if response and getattr(response, "choices", None):
-                ch = response.choices[0]
-                if getattr(ch, "message", None):
-                    return ch.message.get("content", "").strip()
-                return getattr(ch, "text", "").strip()
-        except Exception as e2:
-            raise RuntimeError(f"OpenAI translation failed: {str(e2)}")
-
-def speak_text_in_background(text: str):
-    if not TTS_AVAILABLE:
-        return
-    def _worker(t):
+            translated = await providers[name].translate_many([texts[i] for i in todo], target, source)
+        except RateLimited as exc:
+            logger.info("translation_provider=%s status=rate_limited target=%s batch=%d error=%s", name, target, len(todo), exc)
+            continue
+        except Exception as exc:
+            logger.warning("translation_provider=%s status=error target=%s batch=%d error=%s", name, target, len(todo), exc)
+            breaker.record_failure()
+            continue
+        if any(translated):
+            breaker.record_success()
+        else:
+            breaker.record_failure()
+        for i, translation in zip(todo, translated):
+            if translation:
+                results[i] = (translation, name)
+    return [r or (demo_translation(texts[i], target), "demo") for i, r in enumerate(results)]
+
+job_store = JobStore(TRANSLATION_JOBS_DB)
+job_runner = JobRunner(
+    job_store,
+    translate_segment,
+    demo_translation,
+    workers=JOB_WORKERS,
+    chunk_timeout=float(os.getenv("JOB_CHUNK_TIMEOUT", "60")),
+    max_attempts=int(os.getenv("JOB_MAX_ATTEMPTS", "3")),
+)
+
+# Lifecycle: shared provider clients live as long as the app
+_probe_task = None
+_language_task = None
+_phrasebook_task = None
+
+@app.on_event("startup")
+async def _startup():
+    for provider in providers.values():
+        await provider.startup()
+    global _probe_task
+    probes = {name: p.probe for name, p in providers.items() if p.configured()}
+    _probe_task = asyncio.create_task(probe_loop(breakers, probes, BREAKER_PROBE_INTERVAL))
+    # seeded rows serve requests until the first refresh lands
+    global _language_task
+    if LANGUAGE_REFRESH_SECONDS > 0:
+        _language_task = asyncio.create_task(_language_refresh_loop())
+    global _phrasebook_task
+    if PHRASEBOOK_CHECK_SECONDS > 0:
+        _phrasebook_task = asyncio.create_task(_phrasebook_reload_loop())
+    purged = await asyncio.to_thread(job_store.purge, time.time() - JOB_RETENTION_SECONDS)
+    if purged:
+        logger.info("jobs status=purged count=%d", purged)
+    job_runner.start()
+    if TTS_AVAILABLE:
         try:
-            engine = pyttsx3.init()
-            engine.setProperty("rate", 120)
-            engine.setProperty("volume", 0.9)
-            engine.say(t)
-            engine.runAndWait()
-        except Exception:
-            pass
-    threading.Thread(target=_worker, args=(text,), daemon=True).start()
+            await asyncio.to_thread(tts_service.load_voices, TTS_LANGUAGES)
+        except Exception as exc:
+            logger.warning("tts status=voices_unavailable error=%s", exc)
+        tts_service.start()
+
+@app.on_event("shutdown")
+async def _shutdown():
+    if _probe_task is not None:
+        _probe_task.cancel()
+    if _language_task is not None:
+        _language_task.cancel()
+    if _phrasebook_task is not None:
+        _phrasebook_task.cancel()
+    # workers hand chunks in flight back (lease cleared), so the next process picks them up at once
+    await job_runner.stop()
+    await asyncio.to_thread(tts_service.stop)
+    for provider in providers.values():
+        await provider.shutdown()
+    await http_clients.close_all()
 
 # Endpoints
 @app.get("/health")
 def health():
-    return {"status": "ok", "time": datetime.utcnow().isoformat() + "Z"}
+    return {
+        "status": "ok",
+        "time": datetime.utcnow().isoformat() + "Z",
+        "providers": {
+            name: {"configured": providers[name].configured(), "breaker": breakers[name].snapshot()}
+            for name in PROVIDER_CHAIN
+        },
+    }
+
+@app.get("/metrics")
+def metrics():
+    return {
+        "cache": translation_cache.stats(),
+        "phrasebook": phrasebook.stats(),
+        "coalescing": inflight_translations.stats(),
+        "provider_latency": hedged_chain.tracker.snapshot(),
+        "providers": {name: p.stats() for name, p in providers.items() if p.stats() is not None},
+        "rate_limits": {name: p.limiter.stats() for name, p in providers.items()},
+        "jobs": job_runner.stats(),
+        "tts": tts_service.stats() if TTS_AVAILABLE else None,
+        "audio_cache": audio_cache.stats(),
+    }
+
+@app.get("/admin/routing")
+def admin_routing(x_admin_token: str = Header(default="")):
+    """Router statistics and decisions per target language."""
+    if ADMIN_TOKEN and x_admin_token != ADMIN_TOKEN:
+        raise HTTPException(status_code=403, detail="Admin token required.")
+    snapshot = provider_router.snapshot()
+    snapshot["chain"] = PROVIDER_CHAIN
+    snapshot["provider_info"] = {name: p.describe() for name, p in providers.items()}
+    snapshot["breakers"] = {name: b.snapshot() for name, b in breakers.items()}
+    return snapshot
+
+@app.post("/admin/phrasebook/reload")
+def admin_reload_phrasebook(x_admin_token: str = Header(default="")):
+    if ADMIN_TOKEN and x_admin_token != ADMIN_TOKEN:
+        raise HTTPException(status_code=403, detail="Admin token required.")
+    return {"reloaded": phrasebook.reload_if_changed(), "phrasebook": phrasebook.stats()}
+
+@app.get("/languages")
+def languages():
+    """Accepted target codes and which providers serve each."""
+    return language_matrix.snapshot()
+
+@app.post("/admin/languages/refresh")
+async def admin_refresh_languages(x_admin_token: str = Header(default="")):
+    if ADMIN_TOKEN and x_admin_token != ADMIN_TOKEN:
+        raise HTTPException(status_code=403, detail="Admin token required.")
+    return {"refresh": await refresh_languages(), "matrix": language_matrix.snapshot()}
 
 @app.post("/translate")
-async def translate(req: TranslateRequest):
+async def translate(req: TranslateRequest, budget: float = Depends(request_deadline)):
     text = req.text.strip()
-    target = req.target_lang.strip()
     if not text:
         raise HTTPException(status_code=400, detail="Text is required.")
-    
-    # Try Lingo.dev first
-    translation = await call_lingo_translate(text, target)
-    
-    # If Lingo fails, try OpenAI
-    if not translation:
-        try:
-            translation = openai_translate(text, target)
-            logger.info("translation_provider=openai status=ok target=%s", target)
-        except Exception as exc:
-            # If both fail, provide a demo translation
-            logger.warning("translation_provider=openai status=error target=%s error=%s", target, str(exc))
-            
-            # Simple demo translations for testing
-            demo_translations = {
-                "hi": "यह एक डेमो अनुवाद है: " + text,
-                "ta": "இது ஒரு டெமோ மொழிபெயர்ப்பு: " + text,
-                "te": "ఇది డెమో అనువాదం: " + text,
-                "bn": "এটি একটি ডেমো অনুবাদ: " + text,
-                "es": "Esta es una traducción de demostración: " + text,
-                "fr": "Ceci est une traduction de démonstration: " + text,
-                "ar": "هذه ترجمة تجريبية: " + text,
-                "en": text
-            }
-            
-            # Try LibreTranslate fallback before returning demo text
+    target = resolve_target(req.target_lang)
+
+    # a phrasebook entry answers the whole message, however many sentences it has
+    phrase = phrasebook.lookup(text, target)
+    source = detect_source(text) if phrase is None else None
+    whole = phrase is not None or source == target or not SEGMENT_TRANSLATION
+    chunked = not whole and approx_tokens(text) > CHUNK_THRESHOLD_TOKENS
+    if whole:
+        segments = [(text, "")]
+    else:
+        segments = chunk_text(text, CHUNK_MAX_TOKENS) if chunked else split_sentences(text)
+    sentences = list(dict.fromkeys(sentence for sentence, _ in segments if sentence))
+    if phrase is not None:
+        translation, provider, tier, hits = phrase, "phrasebook", "phrasebook", 1
+    elif source == target:
+        # already in the target language: nothing to translate
+        translation, provider, tier, hits = text, "passthrough", None, 0
+    elif len(sentences) <= 1:
+        translation, provider, tier = await translate_segment(text, target, source or "auto")
+        hits = int(tier is not None)
+        sentences = [text]
+    else:
+        # each sentence (or chunk) is cached on its own; only the misses go upstream, concurrently
+        done = await translate_pieces(sentences, target, source or "auto")
+        used = {provider for _, provider, _ in done.values()}
+        tiers = {tier for _, _, tier in done.values()}
+        hits = sum(1 for _, _, tier in done.values() if tier is not None)
+        if "demo" in used:
+            translation, provider = demo_translation(text, target), "demo"
+        else:
+            translation = join_sentences([(done[s][0] if s else s, trailing) for s, trailing in segments])
+            provider = used.pop() if len(used) == 1 else "mixed"
+        tier = tiers.pop() if len(tiers) == 1 else None
+
+    return {"translated_text": translation, "target_lang": target, "source_lang": source, "success": True,
+            "provider": provider, "cache": tier,
+            "segments": {"total": len(sentences), "cache_hits": hits, "hit_rate": round(hits / len(sentences), 4),
+                         "chunked": chunked},
+            "deadline": {"budget_s": budget, "exceeded": deadline.expired()}}
+
+def _sse(event: str, data: dict) -> str:
+    return f"event: {event}\ndata: {json.dumps(data, ensure_ascii=False)}\n\n"
+
+
+def streaming_provider(target: str) -> str | None:
+    """First available provider in routing order that can stream tokens."""
+    for name in provider_router.order(target, available_providers(target)):
+        if providers[name].supports_streaming and breakers[name].available():
+            return name
+    return None
+
+
+async def _stream_segment(name: str, sentence: str, target: str, index: int, parts: List[str]):
+    """Stream one sentence as `delta` events; parts[0] collects the text.
+
+    parts[0] is left empty unless the stream finished normally, so the
+    caller falls back (and the `segment` event replaces the deltas sent).
+    """
+    breaker = breakers[name]
+    if not breaker.allow():
+        return
+    stream = providers[name].stream(sentence, target)
+    try:
+        while True:
+            try:
+                delta = await deadline.bounded(stream.__anext__())
+            except StopAsyncIteration:
+                break
+            parts[0] += delta
+            yield _sse("delta", {"index": index, "delta": delta})
+    except (deadline.DeadlineExceeded, RateLimited):
+        # out of time or turned away locally: not the provider's fault; the caller falls back
+        parts[0] = ""
+        return
+    except asyncio.CancelledError:
+        raise
+    except Exception as exc:
+        # a stream that broke off (or was cut at max_tokens) is a failure, however much text came first
+        logger.warning("translation_provider=%s status=stream_error target=%s error=%s", name, target, exc)
+        parts[0] = ""
+    finally:
+        await stream.aclose()
+    if parts[0].strip():
+        breaker.record_success()
+    else:
+        breaker.record_failure()
+
+
+async def _translate_stream_events(text: str, target: str):
+    source = detect_source(text)
+    if source == target:
+        yield _sse("done", {"translated_text": text, "target_lang": target, "source_lang": source, "success": True,
+                            "provider": "passthrough",
+                            "segments": {"total": 1, "cache_hits": 0, "hit_rate": 0.0}})
+        return
+    source = source or "auto"
+    segments = split_sentences(text) if SEGMENT_TRANSLATION else [(text, "")]
+    sentences = [sentence for sentence, _ in segments if sentence]
+    streamer = streaming_provider(target)
+    # non-streamed sentences are translated concurrently and emitted in order
+    tasks = {}
+    if streamer is None:
+        for sentence in dict.fromkeys(sentences):
+            tasks[sentence] = asyncio.ensure_future(translate_segment(sentence, target, source))
+
+    out, used, hits = [], set(), 0
+    try:
+        for index, (sentence, trailing) in enumerate(segments):
+            if not sentence:
+                out.append(trailing)
+                continue
+            cached = local_translation(sentence, target) if streamer else None
+            if streamer and cached is None:
+                parts = [""]
+                async for event in _stream_segment(streamer, sentence, target, index, parts):
+                    yield event
+                if parts[0].strip():
+                    translation, provider, tier = parts[0].strip(), streamer, None
+                    translation_cache.put(sentence, target, provider, translation)
+                else:
+                    # stream failed: this sentence takes the regular provider chain
+                    translation, provider, tier = await translate_segment(sentence, target, source)
+            elif cached is not None:
+                translation, provider, tier = cached
+            else:
+                translation, provider, tier = await tasks[sentence]
+            hits += int(tier is not None)
+            used.add(provider)
+            out.append(translation + trailing)
+            yield _sse("segment", {"index": index, "translated_text": translation + trailing,
+                                   "provider": provider, "cache": tier})
+    finally:
+        for task in tasks.values():
+            task.cancel()
+
+    if "demo" in used:
+        translation, provider = demo_translation(text, target), "demo"
+    else:
+        translation = "".join(out)
+        provider = used.pop() if len(used) == 1 else "mixed"
+    yield _sse("done", {"translated_text": translation, "target_lang": target,
+                        "source_lang": None if source == "auto" else source, "success": True,
+                        "provider": provider,
+                        "segments": {"total": len(sentences), "cache_hits": hits,
+                                     "hit_rate": round(hits / len(sentences), 4) if sentences else 0.0}})
+
+
+@app.post("/translate/stream")
+async def translate_stream(req: TranslateRequest, budget: float = Depends(request_deadline)):
+    """Server-Sent Events: `delta` (OpenAI tokens), `segment` (a finished sentence; replaces its deltas), then `done`."""
+    text = req.text.strip()
+    if not text:
+        raise HTTPException(status_code=400, detail="Text is required.")
+    target = resolve_target(req.target_lang)
+    return StreamingResponse(
+        _translate_stream_events(text, target),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+def _job_view(job) -> dict:
+    view = {"job_id": job["id"], "status": job["status"], "target_lang": job["target"],
+            "source_lang": None if job["source"] == "auto" else job["source"],
+            "progress": {"done": job["done"], "total": job["total"]},
+            "created_at": job["created_at"], "updated_at": job["updated_at"]}
+    if job["status"] in ("completed", "failed"):
+        view.update({"translated_text": job["translated_text"], "provider": job["provider"],
+                     "error": job["error"], "success": job["status"] == "completed"})
+    return view
+
+
+@app.post("/translate/jobs", status_code=202)
+def create_translation_job(req: TranslationJobRequest):
+    """Queue a long document; poll GET /translate/jobs/{id} or follow /translate/jobs/{id}/events."""
+    text = req.text.strip()
+    if not text:
+        raise HTTPException(status_code=400, detail="Text is required.")
+    if len(text) > JOB_MAX_CHARS:
+        raise HTTPException(status_code=413, detail=f"Documents are limited to {JOB_MAX_CHARS} characters.")
+    target = resolve_target(req.target_lang)
+    source = detect_source(text)
+    chunks = chunk_text(text, CHUNK_MAX_TOKENS)
+    job_id = job_store.create(text, target, source or "auto", chunks)
+    if source == target:
+        job_store.finish(job_id, "completed", text, "passthrough")
+    else:
+        job_runner.submit()
+    logger.info("job=%s status=created target=%s chunks=%d chars=%d", job_id, target, len(chunks), len(text))
+    return {"job_id": job_id, "status": job_store.get(job_id)["status"], "chunks": len(chunks),
+            "result_url": f"/translate/jobs/{job_id}", "events_url": f"/translate/jobs/{job_id}/events"}
+
+
+def _get_job(job_id: str):
+    job = job_store.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Unknown job.")
+    return job
+
+
+@app.get("/translate/jobs/{job_id}")
+def get_translation_job(job_id: str):
+    return _job_view(_get_job(job_id))
+
+
+async def _job_events(job_id: str):
+    last = None
+    while True:
+        job = await asyncio.to_thread(job_store.get, job_id)
+        if job is None:
+            return
+        if job["status"] in ("completed", "failed"):
+            yield _sse("done", _job_view(job))
+            return
+        if job["done"] != last:
+            last = job["done"]
+            yield _sse("progress", _job_view(job))
+        else:
+            yield ": keep-alive\n\n"
+        # chunks finished by another process show up on the next poll
+        await job_runner.wait_for_progress(timeout=5.0)
+
+
+@app.get("/translate/jobs/{job_id}/events")
+def translation_job_events(job_id: str):
+    """Server-Sent Events: `progress` as chunks finish, then `done` with the result."""
+    _get_job(job_id)
+    return StreamingResponse(
+        _job_events(job_id),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+@app.post("/translate/batch")
+async def translate_batch(req: BatchTranslateRequest, budget: float = Depends(request_deadline)):
+    texts = [t.strip() for t in req.texts]
+    targets = list(dict.fromkeys(t.strip() for t in req.target_langs if t.strip()))
+    if not texts or not targets:
+        raise HTTPException(status_code=400, detail="At least one text and one target language are required.")
+    if len(texts) > BATCH_MAX_TEXTS or len(targets) > BATCH_MAX_TARGETS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Batch limit is {BATCH_MAX_TEXTS} texts and {BATCH_MAX_TARGETS} target languages.",
+        )
+    targets = list(dict.fromkeys(resolve_target(t) for t in targets))
+
+    # Dedupe on the cache key so repeated strings cost one lookup / translation
+    unique: Dict[str, str] = {}
+    for t in texts:
+        if t:
+            unique.setdefault(normalize_text(t), t)
+    sources = {key: detect_source(text) for key, text in unique.items()}
+
+    async def for_target(target: str) -> Dict[str, dict]:
+        out: Dict[str, dict] = {}
+        misses = []
+        for key, text in unique.items():
+            if sources[key] == target:
+                out[key] = {"translated_text": text, "provider": "passthrough", "cache": None, "error": None}
+                continue
+            cached = local_translation(text, target)
+            if cached:
+                out[key] = {"translated_text": cached[0], "provider": cached[1], "cache": cached[2], "error": None}
+            else:
+                misses.append(key)
+        if misses:
+            # one multi-text call per provider, so a source is only passed when the misses agree on it
+            detected = {sources[k] for k in misses}
+            source = detected.pop() if len(detected) == 1 and None not in detected else "auto"
             try:
-                lt = await call_libretranslate(text, target)
-                if lt:
-                    translation = lt
-            except Exception:
-                pass
-            if not translation:
-                if target in demo_translations:
-                    translation = demo_translations[target]
+                translated = await deadline.bounded(
+                    translate_batch_with_providers([unique[k] for k in misses], target, source))
+            except deadline.DeadlineExceeded:
+                logger.warning("translation_provider=none status=deadline_exceeded target=%s batch=%d", target, len(misses))
+                translated = [best_effort_translation(unique[k], target)[:2] for k in misses]
+            for key, (translation, provider) in zip(misses, translated):
+                error = None
+                if provider == "demo":
+                    error = "All translation providers failed."
                 else:
-                    translation = f"[Demo Mode - API Error] {text}"
-            logger.info("translation_provider=fallback final_target=%s used_demo=%s", target, translation.startswith("[Demo Mode"))
-    
-    return {"translated_text": translation, "target_lang": target, "success": True}
+                    translation_cache.put(unique[key], target, provider, translation)
+                out[key] = {"translated_text": translation, "provider": provider, "cache": None, "error": error}
+        return out
+
+    per_target = dict(zip(targets, await asyncio.gather(*(for_target(t) for t in targets))))
+
+    results = []
+    for index, text in enumerate(texts):
+        for target in targets:
+            item = {"index": index, "text": text, "target_lang": target,
+                    "source_lang": sources.get(normalize_text(text)) if text else None}
+            if not text:
+                item.update({"translated_text": None, "provider": None, "cache": None, "error": "Text is required."})
+            else:
+                item.update(per_target[target][normalize_text(text)])
+            item["success"] = item["error"] is None
+            results.append(item)
+    return {"results": results, "count": len(results), "unique_texts": len(unique)}
 
 @app.post("/speak")
 def speak(req: SpeakRequest):
     text = req.text.strip()
     if not text:
         raise HTTPException(status_code=400, detail="Text is required for speech.")
-    speak_text_in_background(text)
-    return {"status": "Speech started (background)", "language": req.target_lang}
+    if req.priority not in PRIORITIES:
+        raise HTTPException(status_code=400, detail=f"priority must be one of {', '.join(PRIORITIES)}.")
+    if not TTS_AVAILABLE:
+        return {"status": "Speech unavailable on this server", "language": req.target_lang, "job_id": None}
+    try:
+        job = tts_service.submit(text, req.target_lang, req.priority)
+    except TTSQueueFull:
+        raise HTTPException(status_code=429, detail="Speech queue is full, try again shortly.",
+                            headers={"Retry-After": "2"})
+    return {"status": "Speech queued", "language": req.target_lang, "voice": job.voice, "job_id": job.id,
+            "queue_depth": tts_service.queue_depth()}
+
+def _store_rendering(key: str, tmp: str, job) -> str | None:
+    if job.status == "done":
+        return audio_cache.put(key, tmp)
+    try:
+        os.unlink(tmp)
+    except OSError:
+        pass
+    return None
+
+
+async def _render_to_cache(key: str, text: str, lang: str, priority: str) -> str:
+    loop = asyncio.get_running_loop()
+    finished = loop.create_future()
+    tmp = audio_cache.temp_path(key)
+
+    def on_finish(job):
+        loop.call_soon_threadsafe(lambda: finished.done() or finished.set_result(job))
+
+    job = tts_service.submit(text, lang, priority, output_path=tmp, on_finish=on_finish)
+    try:
+        job = await asyncio.wait_for(asyncio.shield(finished), TTS_RENDER_TIMEOUT)
+    except (asyncio.TimeoutError, asyncio.CancelledError) as exc:
+        if isinstance(exc, asyncio.CancelledError):
+            # nobody is waiting any more (listener gone): skip it unless a worker already started
+            job.cancel()
+        # a late rendering still lands in the cache for the next request (a failed or skipped one is deleted)
+        finished.add_done_callback(lambda f: _store_rendering(key, tmp, f.result()))
+        raise
+    path = _store_rendering(key, tmp, job)
+    if path is None:
+        raise RuntimeError(job.error or job.status)
+    return path
+
+
+async def render_speech(text: str, lang: str, priority: str = "normal") -> tuple[str, str]:
+    """(cache key, WAV path) for `text`; a miss is rendered through the TTS queue once, however many ask."""
+    key = audio_key(text, lang, tts_service.voice_for(lang) or TTS_VOICE or "default", TTS_RATE, TTS_ENGINE)
+    path = audio_cache.get(key)
+    if path is None:
+        path = await inflight_audio.do(key, lambda: _render_to_cache(key, text, lang, priority))
+    return key, path
+
+
+def audio_response(key: str, path: str, request: Request) -> Response:
+    """WAV file with ETag / immutable caching, honouring If-None-Match and a single byte Range."""
+    headers = {
+        "ETag": f'"{key}"',
+        "Cache-Control": "public, max-age=31536000, immutable",
+        "Accept-Ranges": "bytes",
+        "Content-Location": f"/speak/audio/{key}",
+    }
+    if request.headers.get("if-none-match", "").strip() in (f'"{key}"', "*"):
+        return Response(status_code=304, headers=headers)
+    size = os.path.getsize(path)
+    try:
+        byte_range = parse_range(request.headers.get("range", ""), size)
+    except ValueError:
+        return Response(status_code=416, headers={**headers, "Content-Range": f"bytes */{size}"})
+    if byte_range is None:
+        return FileResponse(path, media_type="audio/wav", headers=headers)
+    start, end = byte_range
+    with open(path, "rb") as fh:
+        fh.seek(start)
+        body = fh.read(end - start + 1)
+    headers["Content-Range"] = f"bytes {start}-{end}/{size}"
+    return Response(body, status_code=206, media_type="audio/wav", headers=headers)
+
+
+@app.post("/speak/audio")
+async def speak_audio(req: SpeakRequest, request: Request):
+    """Render `text` to WAV and return it (served from the audio cache when already rendered)."""
+    text = req.text.strip()
+    if not text:
+        raise HTTPException(status_code=400, detail="Text is required for speech.")
+    if req.priority not in PRIORITIES:
+        raise HTTPException(status_code=400, detail=f"priority must be one of {', '.join(PRIORITIES)}.")
+    if not TTS_AVAILABLE:
+        raise HTTPException(status_code=503, detail="Speech is unavailable on this server.")
+    key, path = await _await_rendering(render_speech(text, req.target_lang, req.priority), req.target_lang)
+    return audio_response(key, path, request)
+
+
+async def _await_rendering(awaitable, lang: str):
+    """Await a render_speech call, turning its failures into HTTP errors."""
+    try:
+        return await awaitable
+    except TTSQueueFull:
+        raise HTTPException(status_code=429, detail="Speech queue is full, try again shortly.",
+                            headers={"Retry-After": "2"})
+    except asyncio.TimeoutError:
+        raise HTTPException(status_code=504, detail="Speech rendering timed out.")
+    except RuntimeError as exc:
+        logger.warning("tts status=render_failed lang=%s error=%s", lang, exc)
+        raise HTTPException(status_code=502, detail="Speech rendering failed.")
+
+
+async def _speech_stream_chunks(first_path: str, renders: List[asyncio.Future], launch, lang: str):
+    """One WAV stream: the first sentence's header, then every sentence's frames in order."""
+    try:
+        params, frames = wav_frames(first_path)
+        yield streaming_wav_header(params) + frames
+        for index in range(1, len(renders)):
+            launch(index + TTS_STREAM_AHEAD - 1)
+            try:
+                _, path = await renders[index]
+                chunk_params, frames = wav_frames(path)
+            except Exception as exc:
+                # the status line is already sent: end the audio early
+                logger.warning("tts status=stream_cut lang=%s sentence=%d error=%s", lang, index, exc)
+                return
+            if chunk_params != params:
+                logger.warning("tts status=format_mismatch lang=%s sentence=%d", lang, index)
+                continue
+            yield frames
+    finally:
+        for render in renders:
+            if render is not None:
+                render.cancel()
+
+
+@app.post("/speak/stream")
+async def speak_stream(req: SpeakRequest):
+    """WAV over chunked HTTP, sentence by sentence: the first plays while later ones still render."""
+    text = req.text.strip()
+    if not text:
+        raise HTTPException(status_code=400, detail="Text is required for speech.")
+    if req.priority not in PRIORITIES:
+        raise HTTPException(status_code=400, detail=f"priority must be one of {', '.join(PRIORITIES)}.")
+    if not TTS_AVAILABLE:
+        raise HTTPException(status_code=503, detail="Speech is unavailable on this server.")
+    sentences = [sentence for sentence, _ in split_sentences(text) if sentence]
+    renders: List[asyncio.Future | None] = [None] * len(sentences)
+
+    def launch(index: int):
+        # sentences are queued a few at a time so one long text can't fill the TTS queue
+        if index < len(sentences) and renders[index] is None:
+            renders[index] = asyncio.ensure_future(render_speech(sentences[index], req.target_lang, req.priority))
+
+    for index in range(TTS_STREAM_AHEAD):
+        launch(index)
+    try:
+        _, first_path = await _await_rendering(renders[0], req.target_lang)
+    except HTTPException:
+        for render in renders:
+            if render is not None:
+                render.cancel()
+        raise
+    return StreamingResponse(
+        _speech_stream_chunks(first_path, renders, launch, req.target_lang),
+        media_type="audio/wav",
+        headers={"Cache-Control": "no-store", "X-Accel-Buffering": "no", "X-Sentences": str(len(sentences))},
+    )
+
+
+@app.get("/speak/audio/{key}")
+def speak_audio_cached(key: str, request: Request):
+    """A previous rendering by its key (the ETag); supports Range for audio players."""
+    path = audio_cache.get(key) if re.fullmatch(r"[0-9a-f]{64}", key) else None
+    if path is None:
+        raise HTTPException(status_code=404, detail="Unknown audio.")
+    return audio_response(key, path, request)
+
+
+@app.get("/speak/jobs/{job_id}")
+def speak_job(job_id: str):
+    job = tts_service.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Unknown speech job.")
+    return job.view()
 
 @app.post("/add-reminder")
 def add_reminder(req: ReminderRequest):
@@ -0,0 +1,176 @@
+# backend/audio_cache.py
+"""Content-addressed disk cache for rendered speech, evicted least-recently-used by total size."""
+
+import hashlib
+import json
+import logging
+import os
+import struct
+import threading
+import time
+import uuid
+import wave
+from typing import Tuple
+
+from translation_cache import normalize_text
+
+logger = logging.getLogger("healthassistant.audio_cache")
+
+
+def audio_key(text: str, lang: str, voice: str, rate: int, engine: str) -> str:
+    """Hex digest naming the audio for these settings; also used as the ETag."""
+    fields = ["v1", normalize_text(text), lang, voice, rate, engine]
+    return hashlib.sha256(json.dumps(fields, ensure_ascii=False).encode("utf-8")).hexdigest()
+
+
+class AudioCache:
+    """One `<key>.wav` file per rendering under `directory`.
+
+    Files never change once written (the key covers everything that shapes
+    the audio), so they can be served as immutable. A hit bumps the file's
+    mtime; once the directory grows past `max_bytes` the oldest files go.
+    Renderings in progress are dot-files; ones older than `stale_seconds`
+    were left by a crashed process and are removed at startup.
+    """
+
+    def __init__(self, directory: str, max_bytes: int = 200 * 1024 * 1024, suffix: str = ".wav",
+                 stale_seconds: float = 3600.0):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.suffix = suffix
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        os.makedirs(directory, exist_ok=True)
+        self.sweep_temp(stale_seconds)
+        self._bytes = sum(size for _, _, size in self._files())
+
+    def path(self, key: str) -> str:
+        return os.path.join(self.directory, key + self.suffix)
+
+    def temp_path(self, key: str) -> str:
+        """Where a renderer should write before `put` moves the file into place (unique per call)."""
+        return os.path.join(self.directory, f".{key}.{uuid.uuid4().hex}{self.suffix}")
+
+    def sweep_temp(self, older_than: float) -> int:
+        """Remove unfinished renderings last written more than `older_than` seconds ago."""
+        cutoff = time.time() - older_than
+        removed = 0
+        with os.scandir(self.directory) as entries:
+            for entry in entries:
+                if not (entry.name.startswith(".") and entry.name.endswith(self.suffix)):
+                    continue
+                try:
+                    if entry.stat().st_mtime < cutoff:
+                        os.unlink(entry.path)
+                        removed += 1
+                except OSError:
+                    continue
+        if removed:
+            logger.info("audio_cache status=swept temp_files=%d", removed)
+        return removed
+
+    def get(self, key: str) -> str | None:
+        path = self.path(key)
+        try:
+            os.utime(path)
+        except OSError:
+            with self._lock:
+                self.misses += 1
+            return None
+        with self._lock:
+            self.hits += 1
+        return path
+
+    def put(self, key: str, rendered_path: str) -> str:
+        """Move a finished rendering into the cache and return its final path."""
+        size = os.path.getsize(rendered_path)
+        path = self.path(key)
+        os.replace(rendered_path, path)
+        with self._lock:
+            self._bytes += size
+            over = self._bytes > self.max_bytes
+        if over:
+            self.evict()
+        return path
+
+    def _files(self):
+        with os.scandir(self.directory) as entries:
+            for entry in entries:
+                if entry.name.endswith(self.suffix) and not entry.name.startswith("."):
+                    st = entry.stat()
+                    yield entry.path, st.st_mtime, st.st_size
+
+    def evict(self):
+        """Drop least recently used files until the cache is under 90% of max_bytes."""
+        files = sorted(self._files(), key=lambda f: f[1])
+        total = sum(size for _, _, size in files)
+        goal = self.max_bytes * 0.9
+        removed = 0
+        for path, _, size in files:
+            if total <= goal:
+                break
+            try:
+                os.unlink(path)
+            except OSError:
+                continue
+            total -= size
+            removed += 1
+        with self._lock:
+            self._bytes = total
+            self.evictions += removed
+        if removed:
+            logger.info("audio_cache status=evicted files=%d bytes=%d", removed, total)
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "directory": self.directory,
+                "bytes": self._bytes,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+                "evictions": self.evictions,
+            }
+
+
+def parse_range(header: str, size: int) -> Tuple[int, int] | None:
+    """First (start, end) inclusive byte range of a Range header; ValueError if unsatisfiable.
+
+    None means no usable range (serve the whole file).
+    """
+    if not header or not header.startswith("bytes="):
+        return None
+    spec = header[len("bytes="):].split(",")[0].strip()
+    start_s, _, end_s = spec.partition("-")
+    try:
+        if not start_s:
+            length = int(end_s)
+            if length <= 0:
+                raise ValueError("empty suffix range")
+            return max(0, size - length), size - 1
+        start = int(start_s)
+        end = min(int(end_s), size - 1) if end_s else size - 1
+    except ValueError:
+        if start_s.isdigit() or end_s.isdigit():
+            raise
+        return None
+    if start >= size or start > end:
+        raise ValueError("range not satisfiable")
+    return start, end
+
+
+def wav_frames(path: str) -> Tuple[Tuple[int, int, int], bytes]:
+    """((channels, sample width, frame rate), PCM frames) of a WAV file."""
+    with wave.open(path, "rb") as w:
+        return (w.getnchannels(), w.getsampwidth(), w.getframerate()), w.readframes(w.getnframes())
+
+
+def streaming_wav_header(params: Tuple[int, int, int]) -> bytes:
+    """PCM WAV header for a stream whose length isn't known yet (sizes set to 0xFFFFFFFF)."""
+    channels, width, rate = params
+    return struct.pack("<4sI4s4sIHHIIHH4sI", b"RIFF", 0xFFFFFFFF, b"WAVE", b"fmt ", 16, 1, channels, rate,
+                       rate * channels * width, channels * width, width * 8, b"data", 0xFFFFFFFF)
@@ -0,0 +1,75 @@
+# backend/benchmarks/bench_chunked.py
+"""Wall-clock time of /translate on a long document against chunk size.
+
+The stub answers in time proportional to the input (like an LLM), so one
+whole-document call is the slow baseline; chunks run CHUNK_CONCURRENCY at a time.
+With the openai provider, `packed` counts micro-batched completions: sentences
+share them, document chunks should not.
+
+Run from backend/:  python -m benchmarks.bench_chunked [paragraphs] [lingo|openai]
+"""
+
+import asyncio
+import os
+import sys
+import time
+
+PORT = 8765
+PROVIDER = sys.argv[2] if len(sys.argv) > 2 else "lingo"
+os.environ.setdefault("PROVIDER_CHAIN", PROVIDER)
+os.environ.setdefault("OPENAI_BASE_URL", f"http://127.0.0.1:{PORT}/v1")
+os.environ.setdefault("OPENAI_API_KEY", "bench")
+os.environ.setdefault("LINGO_BASE_URL", f"http://127.0.0.1:{PORT}")
+os.environ.setdefault("LIBRETRANSLATE_URL", f"http://127.0.0.1:{PORT}")
+os.environ.setdefault("LINGO_API_KEY", "bench")
+os.environ.setdefault("LINGO_PROJECT_ID", "bench")
+
+import httpx  # noqa: E402
+
+import app  # noqa: E402
+import http_clients  # noqa: E402
+from benchmarks.stub_server import STUB_LATENCY, start_stub  # noqa: E402
+
+PARAGRAPH = (
+    "Take your blood pressure tablet every morning after breakfast ({n}). If you miss a dose, take it as soon "
+    "as you remember unless it is almost time for the next one ({n}). Drink plenty of water and avoid salty "
+    "food ({n}). Call your doctor if you feel dizzy, have a headache that does not go away, or notice swelling "
+    "in your legs ({n})."
+)
+
+# (label, CHUNK_THRESHOLD_TOKENS, CHUNK_MAX_TOKENS, SEGMENT_TRANSLATION)
+SETUPS = (
+    ("whole document", 0, 0, False),
+    ("sentences", 10 ** 9, 0, True),
+    ("chunks of 1000", 0, 1000, True),
+    ("chunks of 300", 0, 300, True),
+    ("chunks of 100", 0, 100, True),
+)
+
+
+async def run(client: httpx.AsyncClient, text: str):
+    t0 = time.perf_counter()
+    r = await client.post("/translate", json={"text": text, "target_lang": "hi"},
+                          headers={"X-Request-Timeout": "30"})
+    body = r.json()
+    return time.perf_counter() - t0, body["segments"]["total"], body["provider"]
+
+
+async def main(paragraphs: int):
+    async with httpx.AsyncClient(app=app.app, base_url="http://app", timeout=60.0) as client:
+        for i, (label, threshold, max_tokens, segmented) in enumerate(SETUPS):
+            app.CHUNK_THRESHOLD_TOKENS, app.CHUNK_MAX_TOKENS, app.SEGMENT_TRANSLATION = threshold, max_tokens, segmented
+            # every sentence is new each run, so nothing comes from the cache
+            text = "\n\n".join(PARAGRAPH.format(n=f"{i}.{p}") for p in range(paragraphs))
+            batcher = getattr(app.providers.get("openai"), "batcher", None)
+            packed = batcher.stats()["batches"] if batcher else 0
+            seconds, pieces, provider = await run(client, text)
+            packed = (batcher.stats()["batches"] if batcher else 0) - packed
+            print(f"{label:<16} pieces={pieces:>4}  wall={seconds:6.2f}s  provider={provider}  packed={packed}")
+    await http_clients.close_all()
+
+
+if __name__ == "__main__":
+    start_stub(PORT, latency=0.05)
+    STUB_LATENCY["per_char"] = 0.0002
+    asyncio.run(main(int(sys.argv[1]) if len(sys.argv) > 1 else 20))
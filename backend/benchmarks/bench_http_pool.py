@@ -0,0 +1,63 @@
+# backend/benchmarks/bench_http_pool.py
+"""Compare a new httpx client per call against the shared pooled client.
+
+Run from backend/:  python -m benchmarks.bench_http_pool [requests]
+"""
+
+import asyncio
+import os
+import statistics
+import sys
+import time
+
+PORT = 8765
+os.environ.setdefault("LINGO_BASE_URL", f"http://127.0.0.1:{PORT}")
+os.environ.setdefault("LIBRETRANSLATE_URL", f"http://127.0.0.1:{PORT}")
+os.environ.setdefault("LINGO_API_KEY", "bench")
+os.environ.setdefault("LINGO_PROJECT_ID", "bench")
+
+import httpx  # noqa: E402
+
+import app  # noqa: E402
+import http_clients  # noqa: E402
+from benchmarks.stub_server import start_stub  # noqa: E402
+
+
+async def per_call_client(text: str, target: str):
+    # the pre-pooling behaviour: one client (and one handshake) per request
+    lingo = app.providers["lingo"]
+    async with httpx.AsyncClient(timeout=10.0) as client:
+        r = await client.post(
+            f"{lingo.base_url}/v1/projects/{lingo.project_id}/translate",
+            json={"text": text, "target": target, "source": "auto"},
+            headers={"Authorization": f"Bearer {lingo.api_key}"},
+        )
+        return r.json().get("translation")
+
+
+async def measure(fn, n: int):
+    samples = []
+    for i in range(n):
+        t0 = time.perf_counter()
+        await fn(f"take your tablet after food {i}", "hi")
+        samples.append((time.perf_counter() - t0) * 1000)
+    return samples
+
+
+def report(label: str, samples):
+    samples = sorted(samples)
+    p50 = statistics.median(samples)
+    p95 = samples[int(len(samples) * 0.95) - 1]
+    print(f"{label:<22} p50={p50:7.3f}ms  p95={p95:7.3f}ms  mean={statistics.mean(samples):7.3f}ms")
+
+
+async def main(n: int):
+    await http_clients.warm_up(["lingo"])
+    report("client per request", await measure(per_call_client, n))
+    report("pooled client", await measure(app.providers["lingo"].translate, n))
+    await http_clients.close_all()
+
+
+if __name__ == "__main__":
+    start_stub(PORT)
+    asyncio.run(main(int(sys.argv[1]) if len(sys.argv) > 1 else 300))
@@ -0,0 +1,48 @@
+# backend/benchmarks/bench_langid.py
+"""Per-request cost of local language identification (langid.detect).
+
+Run from backend/:  python -m benchmarks.bench_langid [iterations]
+"""
+
+import statistics
+import sys
+import time
+
+from langid import detect
+
+SAMPLES = {
+    "hi short": "अपनी दवा लें",
+    "hi long": "अपनी दवा खाना खाने के बाद लें। रोज़ खूब पानी पिएं। अगर चक्कर आए तो डॉक्टर को फ़ोन करें। " * 4,
+    "mr short": "तुम्ही कसे आहात? औषध घ्या.",
+    "ta short": "உங்கள் மருந்தை எடுத்துக் கொள்ளுங்கள்",
+    "te short": "మీ మందు తీసుకోండి",
+    "bn short": "আপনার ওষুধ খান",
+    "ar short": "تناول دوائك بعد الأكل",
+    "en short": "Take your tablet after food.",
+    "en long": "Please remember to take your pills tonight and drink plenty of water before bed. " * 4,
+    "es short": "Mi abuela tiene dolor de cabeza y fiebre.",
+    "fr short": "N'oubliez pas de prendre vos pilules ce soir.",
+    "nl short": "Ik moet mijn medicijnen innemen na het eten",
+}
+
+
+def measure(text: str, n: int):
+    samples = []
+    for _ in range(n):
+        t0 = time.perf_counter()
+        detect(text)
+        samples.append((time.perf_counter() - t0) * 1e6)
+    return sorted(samples)
+
+
+def main(n: int):
+    print(f"{'sample':<10} {'chars':>5}  {'result':<6} {'p50':>9} {'p95':>9}")
+    for label, text in SAMPLES.items():
+        samples = measure(text, n)
+        p50 = statistics.median(samples)
+        p95 = samples[int(len(samples) * 0.95) - 1]
+        print(f"{label:<10} {len(text):>5}  {str(detect(text).lang):<6} {p50:7.1f}µs {p95:7.1f}µs")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 2000)
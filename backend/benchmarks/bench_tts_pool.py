@@ -0,0 +1,94 @@
+# backend/benchmarks/bench_tts_pool.py
+"""Rendering throughput of the TTS service: thread backend against the process pool.
+
+The engine burns CPU in Python for each utterance (as pyttsx3's drivers do
+under the GIL) and writes a small WAV, so with the process backend
+throughput should grow with workers up to the number of cores.
+
+Run from backend/:  python -m benchmarks.bench_tts_pool [utterances]
+"""
+
+import os
+import sys
+import tempfile
+import threading
+import time
+import wave
+
+from tts_service import TTSService
+
+WORK_PER_CHAR = 20000  # loop iterations of "synthesis" per character
+
+
+class CPUBoundEngine:
+    def __init__(self):
+        self._pending = []
+
+    def setProperty(self, name, value):
+        pass
+
+    def say(self, text):
+        self._pending.append((text, None))
+
+    def save_to_file(self, text, path):
+        self._pending.append((text, path))
+
+    def runAndWait(self):
+        pending, self._pending = self._pending, []
+        for text, path in pending:
+            acc = 0
+            for i in range(WORK_PER_CHAR * len(text)):
+                acc += i
+            if path:
+                with wave.open(path, "wb") as w:
+                    w.setnchannels(1)
+                    w.setsampwidth(2)
+                    w.setframerate(16000)
+                    w.writeframes(b"\0\0" * 1600)
+
+
+def run(backend: str, workers: int, n: int, directory: str) -> float:
+    service = TTSService(CPUBoundEngine, workers=workers, max_queue=n, max_age=600, backend=backend)
+    service.start()
+    # engines (and processes) start before the clock does
+    warm = [threading.Event() for _ in range(workers)]
+    for event in warm:
+        service.submit("warm up", "en", output_path=os.path.join(directory, "warm.wav"),
+                       on_finish=lambda job, event=event: event.set())
+    for event in warm:
+        event.wait()
+    done = threading.Event()
+    left = [n]
+    lock = threading.Lock()
+
+    def finished(job):
+        with lock:
+            left[0] -= 1
+            if not left[0]:
+                done.set()
+
+    t0 = time.perf_counter()
+    for i in range(n):
+        service.submit(f"take your tablet number {i} after food", "en",
+                       output_path=os.path.join(directory, f"{backend}-{i}.wav"), on_finish=finished)
+    done.wait()
+    elapsed = time.perf_counter() - t0
+    service.stop()
+    return n / elapsed
+
+
+def main(n: int):
+    cores = os.cpu_count() or 1
+    with tempfile.TemporaryDirectory() as directory:
+        print(f"{cores} cores")
+        print(f"{'backend':<8} {'workers':>7} {'utterances/s':>13}")
+        print(f"{'thread':<8} {1:>7} {run('thread', 1, n, directory):13.1f}")
+        print(f"{'thread':<8} {cores:>7} {run('thread', cores, n, directory):13.1f}")
+        workers = 1
+        while workers <= cores:
+            print(f"{'process':<8} {workers:>7} {run('process', workers, n, directory):13.1f}")
+            workers *= 2
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 64)
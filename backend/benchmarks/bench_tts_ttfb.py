@@ -0,0 +1,93 @@
+# backend/benchmarks/bench_tts_ttfb.py
+"""Time to first audio byte: whole-utterance /speak/audio against sentence-pipelined /speak/stream.
+
+The engine is simulated (synthesis time and audio length grow with the
+text), so the numbers show the pipeline, not a particular voice.
+
+Run from backend/:  python -m benchmarks.bench_tts_ttfb [max_sentences]
+"""
+
+import asyncio
+import os
+import sys
+import tempfile
+import threading
+import time
+import wave
+
+PORT = 8766
+os.environ.setdefault("TTS_WORKERS", "4")
+os.environ.setdefault("TTS_CACHE_DIR", tempfile.mkdtemp(prefix="tts-bench-"))
+
+import httpx  # noqa: E402
+import uvicorn  # noqa: E402
+
+import app  # noqa: E402
+
+SECONDS_PER_CHAR = 0.002  # synthesis cost
+SAMPLE_RATE = 16000
+SENTENCE = "Take one tablet of {n} milligrams after breakfast with a full glass of water."
+
+
+class SimulatedEngine:
+    """pyttsx3-shaped engine that sleeps in proportion to the text and writes silence."""
+
+    def __init__(self):
+        self._pending = []
+
+    def setProperty(self, name, value):
+        pass
+
+    def say(self, text):
+        self._pending.append((text, None))
+
+    def save_to_file(self, text, path):
+        self._pending.append((text, path))
+
+    def runAndWait(self):
+        pending, self._pending = self._pending, []
+        for text, path in pending:
+            time.sleep(SECONDS_PER_CHAR * len(text))
+            if path:
+                with wave.open(path, "wb") as w:
+                    w.setnchannels(1)
+                    w.setsampwidth(2)
+                    w.setframerate(SAMPLE_RATE)
+                    w.writeframes(b"\0\0" * int(SAMPLE_RATE * len(text) / 15))
+
+
+async def ttfb(client: httpx.AsyncClient, path: str, text: str):
+    t0 = time.perf_counter()
+    async with client.stream("POST", path, json={"text": text, "target_lang": "en"}) as r:
+        first = None
+        total = 0
+        async for chunk in r.aiter_bytes():
+            if first is None:
+                first = time.perf_counter() - t0
+            total += len(chunk)
+    return first * 1000, (time.perf_counter() - t0) * 1000, total
+
+
+async def main(max_sentences: int):
+    async with httpx.AsyncClient(base_url=f"http://127.0.0.1:{PORT}", timeout=120.0) as client:
+        print(f"{'sentences':>9} {'chars':>6}  {'audio ttfb':>11} {'audio total':>12}  {'stream ttfb':>12} {'stream total':>13}")
+        n = 1
+        while n <= max_sentences:
+            # distinct numbers per run keep every sentence out of the audio cache
+            whole = " ".join(SENTENCE.format(n=f"{n}0{i}") for i in range(n))
+            piped = " ".join(SENTENCE.format(n=f"{n}1{i}") for i in range(n))
+            a_first, a_total, _ = await ttfb(client, "/speak/audio", whole)
+            s_first, s_total, _ = await ttfb(client, "/speak/stream", piped)
+            print(f"{n:>9} {len(whole):>6}  {a_first:9.0f}ms {a_total:10.0f}ms  {s_first:10.0f}ms {s_total:11.0f}ms")
+            n *= 2
+
+
+if __name__ == "__main__":
+    app.TTS_AVAILABLE = True
+    app.tts_service.engine_factory = SimulatedEngine
+    server = uvicorn.Server(uvicorn.Config(app.app, host="127.0.0.1", port=PORT, log_level="warning"))
+    threading.Thread(target=server.run, daemon=True).start()
+    while not server.started:
+        time.sleep(0.01)
+    asyncio.run(main(int(sys.argv[1]) if len(sys.argv) > 1 else 16))
+    server.should_exit = True
@@ -0,0 +1,109 @@
+# backend/benchmarks/stub_server.py
+"""Local stand-in for the translation providers, used by the benchmarks."""
+
+import asyncio
+import json
+import threading
+import time
+from urllib.parse import parse_qs
+
+import uvicorn
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse, StreamingResponse
+
+stub = FastAPI(title="Translation provider stub")
+# fixed latency per call, plus per_char seconds for each character of input (LLM-like)
+STUB_LATENCY = {"seconds": 0.0, "per_char": 0.0}
+# the next `count` Lingo calls answer 429 with this Retry-After
+STUB_THROTTLE = {"count": 0, "retry_after": "1"}
+
+
+async def _delay(text: str):
+    await asyncio.sleep(STUB_LATENCY["seconds"] + STUB_LATENCY["per_char"] * len(text))
+
+
+@stub.head("/")
+@stub.get("/")
+def root():
+    return {"status": "ok"}
+
+
+@stub.post("/v1/projects/{project_id}/translate")
+async def lingo_translate(project_id: str, request: Request):
+    body = await request.json()
+    if STUB_THROTTLE["count"] > 0:
+        STUB_THROTTLE["count"] -= 1
+        return JSONResponse({"error": "rate limited"}, status_code=429,
+                            headers={"Retry-After": STUB_THROTTLE["retry_after"]})
+    await _delay(body.get("text") or "")
+    return {"translation": f"[{body.get('target')}] {body.get('text')}"}
+
+
+@stub.post("/translate")
+async def libretranslate(request: Request):
+    if request.headers.get("content-type", "").startswith("application/json"):
+        form = await request.json()
+    else:
+        # parsed by hand so the stub doesn't need python-multipart
+        form = {k: v[0] for k, v in parse_qs((await request.body()).decode()).items()}
+    await _delay("".join(form["q"]) if isinstance(form.get("q"), list) else form.get("q") or "")
+    if isinstance(form.get("q"), list):
+        return {"translatedText": [f"[{form.get('target')}] {q}" for q in form["q"]]}
+    return {"translatedText": f"[{form.get('target')}] {form.get('q')}"}
+
+
+@stub.get("/languages")
+def libretranslate_languages():
+    return [{"code": code, "name": code} for code in ("en", "hi", "ta", "te", "bn", "es", "fr", "ar")]
+
+
+@stub.post("/v1/chat/completions")
+async def chat_completions(request: Request):
+    # OpenAI-compatible (OpenAI, Groq); echoes the last user message
+    body = await request.json()
+    content = body["messages"][-1]["content"]
+    await _delay(content)
+    try:
+        # packed prompts end with a JSON array; answer with an array of the same length
+        items = json.loads(content[content.rindex("\n\n") + 2:])
+        content = json.dumps([f"[stub] {item}" for item in items], ensure_ascii=False)
+    except ValueError:
+        content = f"[stub] {content}"
+    if body.get("stream"):
+        return StreamingResponse(_stream_chunks(content, body.get("model", "stub")), media_type="text/event-stream")
+    return {
+        "id": "chatcmpl-stub",
+        "object": "chat.completion",
+        "created": int(time.time()),
+        "model": body.get("model", "stub"),
+        "choices": [{"index": 0, "finish_reason": "stop", "message": {"role": "assistant", "content": content}}],
+        "usage": {"prompt_tokens": 0, "completion_tokens": 0, "total_tokens": 0},
+    }
+
+
+async def _stream_chunks(content: str, model: str):
+    for i, word in enumerate(content.split(" ")):
+        delta = {"content": (" " if i else "") + word}
+        chunk = {"id": "chatcmpl-stub", "object": "chat.completion.chunk", "created": int(time.time()),
+                 "model": model, "choices": [{"index": 0, "delta": delta, "finish_reason": None}]}
+        yield f"data: {json.dumps(chunk, ensure_ascii=False)}\n\n"
+        await asyncio.sleep(STUB_LATENCY["seconds"] / 10)
+    last = {"id": "chatcmpl-stub", "object": "chat.completion.chunk", "created": int(time.time()),
+            "model": model, "choices": [{"index": 0, "delta": {}, "finish_reason": "stop"}]}
+    yield f"data: {json.dumps(last)}\n\n"
+    yield "data: [DONE]\n\n"
+
+
+@stub.get("/v1/models")
+def models():
+    return {"object": "list", "data": [{"id": "stub", "object": "model"}]}
+
+
+def start_stub(port: int = 8765, latency: float = 0.0) -> uvicorn.Server:
+    """Run the stub in a daemon thread and return once it accepts connections."""
+    STUB_LATENCY["seconds"] = latency
+    server = uvicorn.Server(uvicorn.Config(stub, host="127.0.0.1", port=port, log_level="warning"))
+    threading.Thread(target=server.run, daemon=True).start()
+    while not server.started:
+        time.sleep(0.01)
+    return server
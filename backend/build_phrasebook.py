@@ -0,0 +1,107 @@
+# backend/build_phrasebook.py
+"""Build the phrasebook pack that /translate consults before any provider.
+
+Every phrase in phrases.txt and every UI string in the lingo.config.json
+locale folder is translated into each of its targetLanguages. UI strings
+take the translation already in the target locale file. Everything else
+comes from the translation cache, then from the configured providers;
+demo answers are left out. A running server picks the new pack up on its
+next PHRASEBOOK_CHECK_SECONDS tick (or POST /admin/phrasebook/reload).
+
+Run from backend/:  python build_phrasebook.py [--offline] [--output PATH]
+"""
+
+import argparse
+import asyncio
+import json
+import os
+from typing import Dict, List, Tuple
+
+import app
+import http_clients
+from phrasebook import write_pack
+
+
+def load_phrases(path: str) -> List[str]:
+    with open(path, "r", encoding="utf-8") as fh:
+        lines = (line.strip() for line in fh)
+        return [line for line in lines if line and not line.startswith("#")]
+
+
+def _flatten(data, prefix: str = "") -> Dict[str, str]:
+    out = {}
+    for key, value in data.items():
+        if isinstance(value, dict):
+            out.update(_flatten(value, f"{prefix}{key}."))
+        elif isinstance(value, str):
+            out[prefix + key] = value
+    return out
+
+
+def load_locale(locales_dir: str, lang: str) -> Dict[str, str]:
+    try:
+        with open(os.path.join(locales_dir, f"{lang}.json"), "r", encoding="utf-8") as fh:
+            return _flatten(json.load(fh))
+    except (OSError, ValueError):
+        return {}
+
+
+async def translate_missing(texts: List[str], target: str, offline: bool) -> List[Tuple[str, str]]:
+    """(text, translation) for every text the cache or, unless offline, a provider can answer."""
+    found, misses = [], []
+    for text in texts:
+        cached = app.translation_cache.get(text, target, app.PROVIDER_CHAIN)
+        if cached:
+            found.append((text, cached[0]))
+        else:
+            misses.append(text)
+    if offline or not misses:
+        return found
+    for start in range(0, len(misses), app.BATCH_MAX_TEXTS):
+        chunk = misses[start:start + app.BATCH_MAX_TEXTS]
+        for text, (translation, provider) in zip(chunk, await app.translate_batch_with_providers(chunk, target)):
+            if provider != "demo":
+                app.translation_cache.put(text, target, provider, translation)
+                found.append((text, translation))
+    return found
+
+
+async def build(args) -> int:
+    with open(args.config, "r", encoding="utf-8") as fh:
+        config = json.load(fh)
+    source = config.get("sourceLanguage", "en")
+    locales_dir = args.locales or os.path.join(os.path.dirname(os.path.abspath(args.config)),
+                                               config.get("outputPath", "frontend/src/locales"))
+    phrases = load_phrases(args.phrases)
+    source_strings = load_locale(locales_dir, source)
+
+    entries = []
+    for target in config.get("targetLanguages", []):
+        target_strings = load_locale(locales_dir, target)
+        pending = list(phrases)
+        for key, text in source_strings.items():
+            if target_strings.get(key):
+                entries.append((text, target, target_strings[key]))
+            else:
+                pending.append(text)
+        found = await translate_missing(list(dict.fromkeys(pending)), target, args.offline)
+        entries.extend((text, target, translation) for text, translation in found)
+        print(f"{target}: {len(found)}/{len(set(pending))} phrases, {len(target_strings)} UI strings")
+    await http_clients.close_all()
+    return write_pack(args.output, entries)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--config", default=app.LINGO_CONFIG, help="lingo.config.json with targetLanguages")
+    parser.add_argument("--phrases", default=os.path.join(app.BASE_DIR, "phrases.txt"))
+    parser.add_argument("--locales", default=None, help="locale folder (default: outputPath from the config)")
+    parser.add_argument("--output", default=app.PHRASEBOOK_PATH)
+    parser.add_argument("--offline", action="store_true", help="only locale files and cached translations")
+    args = parser.parse_args()
+    count = asyncio.run(build(args))
+    print(f"wrote {count} entries to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
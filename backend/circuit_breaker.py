@@ -0,0 +1,151 @@
+# backend/circuit_breaker.py
+"""Per-provider circuit breakers with a background recovery probe."""
+
+import asyncio
+import logging
+import time
+from collections import deque
+from typing import Awaitable, Callable, Dict
+
+from rate_limiter import RateLimited
+
+logger = logging.getLogger("healthassistant.breaker")
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class BreakerOpen(Exception):
+    """The breaker refused a call: it is open, or its half-open trial is taken."""
+
+
+class CircuitBreaker:
+    """Opens when the failure rate over the last `window` calls reaches `failure_rate`.
+
+    While open, calls are refused. After `open_seconds` one trial call is let
+    through (half-open); its outcome closes or re-opens the breaker. The
+    background probe can close it earlier.
+    """
+
+    def __init__(self, name: str, window: int = 20, min_calls: int = 5, failure_rate: float = 0.5,
+                 open_seconds: float = 30.0):
+        self.name = name
+        self.min_calls = min_calls
+        self.failure_rate = failure_rate
+        self.open_seconds = open_seconds
+        self.state = CLOSED
+        self.opened_at = 0.0
+        self._trial_started = 0.0
+        self._outcomes: deque = deque(maxlen=window)
+
+    def allow(self) -> bool:
+        now = time.monotonic()
+        if self.state == CLOSED:
+            return True
+        if self.state == OPEN:
+            if now - self.opened_at < self.open_seconds:
+                return False
+            self.state = HALF_OPEN
+            self._trial_started = now
+            logger.info("breaker=%s state=half_open", self.name)
+            return True
+        # half-open: one trial at a time; a trial that never reported back expires
+        if now - self._trial_started >= self.open_seconds:
+            self._trial_started = now
+            return True
+        return False
+
+    def available(self) -> bool:
+        """Whether `allow` would let a call through, without using up the half-open trial."""
+        now = time.monotonic()
+        if self.state == CLOSED:
+            return True
+        if self.state == OPEN:
+            return now - self.opened_at >= self.open_seconds
+        return now - self._trial_started >= self.open_seconds
+
+    def record_success(self):
+        if self.state != CLOSED:
+            self.close()
+            return
+        self._outcomes.append(True)
+
+    def record_failure(self):
+        if self.state == HALF_OPEN:
+            self._open()
+            return
+        if self.state == OPEN:
+            return
+        self._outcomes.append(False)
+        if len(self._outcomes) >= self.min_calls and self.current_failure_rate() >= self.failure_rate:
+            self._open()
+
+    def current_failure_rate(self) -> float:
+        if not self._outcomes:
+            return 0.0
+        return self._outcomes.count(False) / len(self._outcomes)
+
+    def close(self):
+        self.state = CLOSED
+        self._outcomes.clear()
+        logger.info("breaker=%s state=closed", self.name)
+
+    def _open(self):
+        self.state = OPEN
+        self.opened_at = time.monotonic()
+        logger.warning("breaker=%s state=open failure_rate=%.2f", self.name, self.current_failure_rate())
+
+    def wrap(self, fn: Callable[[str, str], Awaitable[str | None]]):
+        """Wrap a provider call so its outcome feeds the breaker.
+
+        The breaker is asked when the call is actually made (so a provider the
+        chain never gets to doesn't use up the half-open trial); BreakerOpen
+        if it refuses. Cancellation and our own rate limiter turning the call
+        away are not failures.
+        """
+        async def guarded(text: str, target: str):
+            if not self.allow():
+                raise BreakerOpen(f"{self.name}: circuit open")
+            try:
+                result = await fn(text, target)
+            except (asyncio.CancelledError, RateLimited):
+                raise
+            except Exception:
+                self.record_failure()
+                raise
+            if result:
+                self.record_success()
+            else:
+                self.record_failure()
+            return result
+        return guarded
+
+    def snapshot(self) -> dict:
+        out = {"state": self.state, "failure_rate": round(self.current_failure_rate(), 3), "calls": len(self._outcomes)}
+        if self.state != CLOSED:
+            out["retry_in_s"] = round(max(0.0, self.opened_at + self.open_seconds - time.monotonic()), 1)
+        return out
+
+
+async def probe_loop(breakers: Dict[str, CircuitBreaker], probes: Dict[str, Callable[[], Awaitable[bool]]],
+                     interval: float = 15.0):
+    """Periodically probe providers whose breaker is not closed; close it on success."""
+    while True:
+        await asyncio.sleep(interval)
+        for name, breaker in breakers.items():
+            probe = probes.get(name)
+            if breaker.state == CLOSED or probe is None:
+                continue
+            try:
+                healthy = await probe()
+            except asyncio.CancelledError:
+                raise
+            except Exception as exc:
+                logger.info("breaker=%s probe=error error=%s", name, exc)
+                healthy = False
+            if healthy:
+                breaker.close()
+            elif breaker.state == OPEN:
+                # still down: restart the open period so traffic keeps skipping it
+                breaker.opened_at = time.monotonic()
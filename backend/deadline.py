@@ -0,0 +1,70 @@
+# backend/deadline.py
+"""Per-request time budget that follows the request into every provider call."""
+
+import asyncio
+import contextvars
+import time
+
+# absolute time.monotonic() by which the current request must answer (None = unbounded)
+_deadline: contextvars.ContextVar[float | None] = contextvars.ContextVar("request_deadline", default=None)
+
+
+class DeadlineExceeded(asyncio.TimeoutError):
+    pass
+
+
+def start(seconds: float):
+    """Set the budget for the current request.
+
+    Tasks started afterwards (hedged provider calls) copy the context and
+    so share the same deadline; work shared with other requests is started
+    with `detached` instead.
+    """
+    _deadline.set(time.monotonic() + seconds)
+
+
+def remaining() -> float | None:
+    deadline = _deadline.get()
+    return None if deadline is None else deadline - time.monotonic()
+
+
+def expired() -> bool:
+    left = remaining()
+    return left is not None and left <= 0
+
+
+def budget(timeout: float) -> float:
+    """`timeout` clipped to what is left of the request budget."""
+    left = remaining()
+    if left is None:
+        return timeout
+    if left <= 0:
+        raise DeadlineExceeded("Request deadline exceeded.")
+    return min(timeout, left)
+
+
+def detached(coro) -> asyncio.Task:
+    """Run `coro` as a task with no request deadline.
+
+    For work several requests wait on (single-flight calls, batches): it must
+    not die with whichever request happened to start it. Each waiter bounds
+    its own wait with `bounded`.
+    """
+    ctx = contextvars.copy_context()
+    ctx.run(_deadline.set, None)
+    return asyncio.get_running_loop().create_task(coro, context=ctx)
+
+
+async def bounded(awaitable):
+    """Await `awaitable`, cancelling it (DeadlineExceeded) once the budget runs out."""
+    left = remaining()
+    if left is None:
+        return await awaitable
+    if left <= 0:
+        if asyncio.iscoroutine(awaitable):
+            awaitable.close()
+        raise DeadlineExceeded("Request deadline exceeded.")
+    try:
+        return await asyncio.wait_for(awaitable, left)
+    except asyncio.TimeoutError as exc:
+        raise DeadlineExceeded("Request deadline exceeded.") from exc
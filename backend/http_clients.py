@@ -0,0 +1,68 @@
+# backend/http_clients.py
+"""App-lifetime pooled httpx clients for the translation providers."""
+
+import os
+import logging
+from typing import Dict
+
+import httpx
+
+# optional HTTP/2 (needs the `h2` package; httpx falls back to HTTP/1.1 without it)
+try:
+    import h2  # noqa: F401
+    HTTP2_AVAILABLE = True
+except Exception:
+    HTTP2_AVAILABLE = False
+
+logger = logging.getLogger("healthassistant.http")
+
+HTTP_MAX_CONNECTIONS = int(os.getenv("HTTP_MAX_CONNECTIONS", "100"))
+HTTP_MAX_KEEPALIVE = int(os.getenv("HTTP_MAX_KEEPALIVE", "20"))
+HTTP_KEEPALIVE_EXPIRY = float(os.getenv("HTTP_KEEPALIVE_EXPIRY", "30"))
+HTTP_CONNECT_TIMEOUT = float(os.getenv("HTTP_CONNECT_TIMEOUT", "5.0"))
+PROVIDER_TIMEOUT = float(os.getenv("PROVIDER_TIMEOUT", "10.0"))
+
+_clients: Dict[str, httpx.AsyncClient] = {}
+_base_urls: Dict[str, str] = {}
+
+
+def register_client(name: str, base_url: str):
+    """Declare a provider client; it is created lazily on first use."""
+    _base_urls[name] = base_url.rstrip("/")
+
+
+def get_client(name: str) -> httpx.AsyncClient:
+    client = _clients.get(name)
+    if client is None or client.is_closed:
+        client = httpx.AsyncClient(
+            base_url=_base_urls.get(name, ""),
+            http2=HTTP2_AVAILABLE,
+            timeout=httpx.Timeout(PROVIDER_TIMEOUT, connect=HTTP_CONNECT_TIMEOUT),
+            limits=httpx.Limits(
+                max_connections=HTTP_MAX_CONNECTIONS,
+                max_keepalive_connections=HTTP_MAX_KEEPALIVE,
+                keepalive_expiry=HTTP_KEEPALIVE_EXPIRY,
+            ),
+        )
+        _clients[name] = client
+    return client
+
+
+async def warm_up(names=None):
+    """Open one connection per provider so the first real request skips the handshake."""
+    for name in names if names is not None else list(_base_urls):
+        try:
+            await get_client(name).head("/", timeout=HTTP_CONNECT_TIMEOUT)
+            logger.info("http_client=%s warmup=ok", name)
+        except Exception as exc:
+            # the provider may be down at boot; requests will connect on demand
+            logger.warning("http_client=%s warmup=error error=%s", name, exc)
+
+
+async def close_all():
+    for name, client in list(_clients.items()):
+        try:
+            await client.aclose()
+        except Exception:
+            logger.warning("http_client=%s close=error", name)
+    _clients.clear()
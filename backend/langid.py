@@ -0,0 +1,262 @@
+# backend/langid.py
+"""Local language identification: Unicode script first, character trigrams within a shared script."""
+
+import math
+import re
+import unicodedata
+from collections import Counter
+from typing import Dict, NamedTuple
+
+# Script blocks -> language, for scripts that name the language on their own.
+# Bengali script is read as Bengali unless it carries the letters only
+# Assamese uses, Arabic script as Arabic unless it carries letters that only
+# Persian / Urdu use. Devanagari (Hindi, Marathi, Nepali) and Latin script
+# are shared, so their text goes to a trigram model (lang None here).
+SCRIPTS = (
+    (0x0900, 0x097F, "devanagari", None),
+    (0x0980, 0x09FF, "bengali", "bn"),
+    (0x0B80, 0x0BFF, "tamil", "ta"),
+    (0x0C00, 0x0C7F, "telugu", "te"),
+    (0x0600, 0x06FF, "arabic", "ar"),
+    (0x0750, 0x077F, "arabic", "ar"),
+    (0xFB50, 0xFDFF, "arabic", "ar"),
+    (0xFE70, 0xFEFF, "arabic", "ar"),
+)
+ASSAMESE_LETTERS = set("ৰৱ")
+URDU_LETTERS = set("ٹڈڑںےۓھ")
+PERSIAN_LETTERS = set("پچژگکی")
+
+# Training class for "some other language in this script": text that scores
+# best against it is reported as unknown rather than as the nearest language
+# we do know.
+OTHER = "other"
+
+# Small training texts for the Latin-script languages we translate into (es, fr)
+# and from (en), plus close neighbours so they don't get mistaken for them,
+# plus an OTHER sample of Latin-script languages we don't identify.
+TRAINING = {
+    "en": (
+        "Take your medicine after food. Drink plenty of water every day. Call your doctor if you feel dizzy "
+        "or have chest pain. It is time for your tablet. Please check your blood pressure and blood sugar in "
+        "the morning. Do not skip your dose. Rest well and walk slowly. Your appointment with the doctor is "
+        "tomorrow at ten. How are you feeling today? Help is on the way, stay calm. The nurse will visit you "
+        "this evening. Keep the medicine away from children and store it in a cool dry place. Wash your "
+        "hands before eating. I need help, please call my family. Welcome to the health assistant."
+    ),
+    "es": (
+        "Tome su medicina después de comer. Beba mucha agua todos los días. Llame a su médico si se siente "
+        "mareado o tiene dolor en el pecho. Es hora de su pastilla. Por favor revise su presión arterial y el "
+        "azúcar en la sangre por la mañana. No se salte la dosis. Descanse bien y camine despacio. Su cita con "
+        "el médico es mañana a las diez. ¿Cómo se siente hoy? La ayuda está en camino, mantenga la calma. La "
+        "enfermera lo visitará esta tarde. Mantenga el medicamento lejos de los niños y guárdelo en un lugar "
+        "fresco y seco. Lávese las manos antes de comer. Necesito ayuda, por favor llame a mi familia. "
+        "Bienvenido al asistente de salud."
+    ),
+    "fr": (
+        "Prenez votre médicament après le repas. Buvez beaucoup d'eau chaque jour. Appelez votre médecin si "
+        "vous avez des vertiges ou une douleur à la poitrine. C'est l'heure de votre comprimé. Vérifiez votre "
+        "tension artérielle et votre glycémie le matin. Ne sautez pas votre dose. Reposez-vous bien et marchez "
+        "lentement. Votre rendez-vous chez le médecin est demain à dix heures. Comment vous sentez-vous "
+        "aujourd'hui ? Les secours arrivent, restez calme. L'infirmière viendra vous voir ce soir. Gardez le "
+        "médicament hors de portée des enfants et conservez-le dans un endroit frais et sec. Lavez-vous les "
+        "mains avant de manger. J'ai besoin d'aide, appelez ma famille. Bienvenue dans l'assistant de santé."
+    ),
+    "pt": (
+        "Tome o seu remédio depois da refeição. Beba muita água todos os dias. Ligue para o seu médico se "
+        "sentir tontura ou dor no peito. Está na hora do seu comprimido. Por favor verifique a sua pressão "
+        "arterial e o açúcar no sangue de manhã. Não pule a dose. Descanse bem e caminhe devagar. A sua "
+        "consulta com o médico é amanhã às dez. Como você está se sentindo hoje? A ajuda está a caminho, "
+        "fique calmo. A enfermeira vai visitá-lo esta noite. Mantenha o remédio longe das crianças e guarde "
+        "em lugar fresco e seco. Lave as mãos antes de comer. Preciso de ajuda, ligue para a minha família."
+    ),
+    "it": (
+        "Prenda la sua medicina dopo i pasti. Beva molta acqua ogni giorno. Chiami il suo medico se ha "
+        "vertigini o dolore al petto. È l'ora della sua compressa. Per favore controlli la pressione e lo "
+        "zucchero nel sangue al mattino. Non salti la dose. Riposi bene e cammini lentamente. L'appuntamento "
+        "con il medico è domani alle dieci. Come si sente oggi? I soccorsi stanno arrivando, stia calmo. "
+        "L'infermiera verrà a trovarla stasera. Tenga il farmaco lontano dai bambini e lo conservi in un "
+        "luogo fresco e asciutto. Si lavi le mani prima di mangiare. Ho bisogno di aiuto, chiami la mia famiglia."
+    ),
+    "de": (
+        "Nehmen Sie Ihr Medikament nach dem Essen. Trinken Sie jeden Tag viel Wasser. Rufen Sie Ihren Arzt an, "
+        "wenn Ihnen schwindelig ist oder Sie Schmerzen in der Brust haben. Es ist Zeit für Ihre Tablette. Bitte "
+        "messen Sie morgens Ihren Blutdruck und Blutzucker. Lassen Sie keine Dosis aus. Ruhen Sie sich gut aus "
+        "und gehen Sie langsam. Ihr Termin beim Arzt ist morgen um zehn. Wie fühlen Sie sich heute? Hilfe ist "
+        "unterwegs, bleiben Sie ruhig. Die Pflegerin besucht Sie heute Abend. Bewahren Sie das Medikament "
+        "außerhalb der Reichweite von Kindern kühl und trocken auf. Waschen Sie sich vor dem Essen die Hände."
+    ),
+    OTHER: (
+        # Dutch, Swedish, Danish, Romanian, Polish, Indonesian, Turkish, Catalan
+        "Neem uw medicijn in na het eten. Drink elke dag veel water. Bel uw arts als u duizelig bent of pijn "
+        "op de borst heeft. Het is tijd voor uw tablet. "
+        "Ta din medicin efter maten. Drick mycket vatten varje dag. Ring din läkare om du känner dig yr. "
+        "Det är dags för din tablett. "
+        "Tag din medicin efter maden. Drik meget vand hver dag. Ring til din læge, hvis du føler dig svimmel. "
+        "Luați medicamentul după masă. Beți multă apă în fiecare zi. Sunați medicul dacă aveți amețeli sau "
+        "dureri în piept. "
+        "Proszę wziąć lek po jedzeniu. Pij dużo wody każdego dnia. Zadzwoń do lekarza, jeśli masz zawroty "
+        "głowy lub ból w klatce piersiowej. "
+        "Minum obat Anda setelah makan. Minum banyak air setiap hari. Hubungi dokter Anda jika merasa pusing "
+        "atau nyeri dada. "
+        "İlacınızı yemekten sonra alın. Her gün bol su için. Başınız dönerse doktorunuzu arayın. "
+        "Preneu el vostre medicament després de menjar. Beveu molta aigua cada dia. Truqueu al vostre metge "
+        "si teniu mareig o dolor al pit."
+    ),
+}
+
+# Devanagari-script languages we translate into, plus other Devanagari text
+DEVANAGARI_TRAINING = {
+    "hi": (
+        "खाना खाने के बाद अपनी दवा लें। हर दिन खूब पानी पिएं। अगर आपको चक्कर आए या सीने में दर्द हो तो अपने "
+        "डॉक्टर को फोन करें। आपकी गोली का समय हो गया है। कृपया सुबह अपना रक्तचाप और शुगर जांचें। अपनी खुराक "
+        "न छोड़ें। अच्छी तरह आराम करें और धीरे चलें। डॉक्टर के साथ आपकी मुलाकात कल दस बजे है। आज आप कैसा "
+        "महसूस कर रहे हैं? मदद आ रही है, शांत रहें। नर्स आज शाम आपसे मिलने आएगी। दवा को बच्चों से दूर रखें "
+        "और ठंडी सूखी जगह पर रखें। खाने से पहले हाथ धोएं। मुझे मदद चाहिए, कृपया मेरे परिवार को बुलाएं। "
+        "स्वास्थ्य सहायक में आपका स्वागत है।"
+    ),
+    "mr": (
+        "जेवणानंतर तुमचे औषध घ्या. दररोज भरपूर पाणी प्या. तुम्हाला चक्कर आल्यास किंवा छातीत दुखत असल्यास "
+        "तुमच्या डॉक्टरांना फोन करा. तुमच्या गोळीची वेळ झाली आहे. कृपया सकाळी तुमचा रक्तदाब आणि साखर "
+        "तपासा. तुमचा डोस चुकवू नका. चांगली विश्रांती घ्या आणि हळू चाला. डॉक्टरांसोबत तुमची भेट उद्या दहा "
+        "वाजता आहे. आज तुम्हाला कसे वाटत आहे? मदत येत आहे, शांत राहा. परिचारिका आज संध्याकाळी तुम्हाला "
+        "भेटायला येईल. औषध मुलांपासून दूर ठेवा आणि थंड कोरड्या जागी ठेवा. जेवण्यापूर्वी हात धुवा. मला मदत "
+        "हवी आहे, कृपया माझ्या कुटुंबाला बोलवा. आरोग्य सहाय्यकात तुमचे स्वागत आहे."
+    ),
+    "ne": (
+        "खाना खाएपछि आफ्नो औषधि खानुहोस्। हरेक दिन प्रशस्त पानी पिउनुहोस्। रिंगटा लागेमा वा छाती दुखेमा "
+        "आफ्नो डाक्टरलाई फोन गर्नुहोस्। तपाईंको चक्की खाने समय भयो। कृपया बिहान आफ्नो रक्तचाप र रगतमा "
+        "चिनी जाँच गर्नुहोस्। आफ्नो मात्रा नछुटाउनुहोस्। राम्रोसँग आराम गर्नुहोस् र बिस्तारै हिँड्नुहोस्। "
+        "डाक्टरसँग तपाईंको भेट भोलि दस बजे छ। आज तपाईंलाई कस्तो महसुस भइरहेको छ? मद्दत आउँदैछ, शान्त "
+        "रहनुहोस्। नर्स आज बेलुका तपाईंलाई भेट्न आउनुहुन्छ। औषधि बालबालिकाबाट टाढा राख्नुहोस् र चिसो "
+        "सुक्खा ठाउँमा राख्नुहोस्। खाना खानुअघि हात धुनुहोस्। मलाई मद्दत चाहिन्छ, कृपया मेरो परिवारलाई "
+        "बोलाउनुहोस्। स्वास्थ्य सहायकमा स्वागत छ।"
+    ),
+    OTHER: (
+        # Sanskrit, Konkani, Maithili
+        "भोजनानन्तरम् औषधं स्वीकरोतु। प्रतिदिनं बहु जलं पिबतु। यदि भवतः शिरोभ्रमः भवति तर्हि वैद्यं आह्वयतु। "
+        "जेवणा उपरांत तुमचें वखद घेयात. दर दिसा खूब उदक पियेयात. तुमकां भोंवळ आयल्यार दोतोराक फोन करात. "
+        "खाना खेलाक बाद अपन दबाइ लिअ। सब दिन खूब पानि पिबू। जँ माथ घुमय तँ डाक्टरकेँ फोन करू।"
+    ),
+}
+
+
+class Detection(NamedTuple):
+    lang: str | None       # None when unsure
+    confidence: float      # share of letters in the winning script, or the trigram log-odds
+    script: str
+
+
+# runs of anything but letters and apostrophes become one space (word boundary);
+# Devanagari vowel signs aren't \w but are part of the word
+_NON_LETTERS = re.compile(r"(?:[^\w'\u0900-\u097F]|[\d_\u0964\u0965])+")
+
+
+def _trigrams(text: str):
+    padded = " " + _NON_LETTERS.sub(" ", text.lower()).strip() + " "
+    return [padded[i:i + 3] for i in range(len(padded) - 2)]
+
+
+class TrigramModel:
+    """Naive Bayes over character trigrams with add-one smoothing."""
+
+    def __init__(self, corpora: Dict[str, str]):
+        self.log_probs: Dict[str, Dict[str, float]] = {}
+        self.unseen: Dict[str, float] = {}
+        vocab = set()
+        counts = {}
+        for lang, text in corpora.items():
+            counts[lang] = Counter(_trigrams(text))
+            vocab.update(counts[lang])
+        for lang, counter in counts.items():
+            total = sum(counter.values()) + len(vocab) + 1
+            self.log_probs[lang] = {g: math.log((n + 1) / total) for g, n in counter.items()}
+            self.unseen[lang] = math.log(1 / total)
+
+    def scores(self, text: str) -> Dict[str, float]:
+        """Log-likelihood of `text`'s trigrams under each language."""
+        grams = Counter(_trigrams(text)).items()
+        out = {}
+        for lang, table in self.log_probs.items():
+            unseen = self.unseen[lang]
+            out[lang] = sum(n * table.get(g, unseen) for g, n in grams)
+        return out
+
+
+_models = {"latin": TrigramModel(TRAINING), "devanagari": TrigramModel(DEVANAGARI_TRAINING)}
+
+
+# Only the start of a long message is looked at; a sentence or two settles it
+SAMPLE_CHARS = 160
+
+_char_scripts: Dict[str, tuple | None] = {}
+
+
+def _script_of(ch: str):
+    """(script, language) for a letter or combining mark, None for anything else (memoized)."""
+    try:
+        return _char_scripts[ch]
+    except KeyError:
+        pass
+    result = None
+    if ch.isalpha() or unicodedata.category(ch).startswith("M"):
+        code = ord(ch)
+        for lo, hi, script, lang in SCRIPTS:
+            if lo <= code <= hi:
+                result = (script, lang)
+                break
+        else:
+            latin = ch.isascii() or unicodedata.name(ch, "").startswith("LATIN")
+            result = ("latin", None) if latin else ("other", None)
+    if len(_char_scripts) < 65536:
+        _char_scripts[ch] = result
+    return result
+
+
+def detect(text: str, min_letters: int = 12, min_log_odds: float = 4.0, script_share: float = 0.8) -> Detection:
+    """Best guess at the language of `text`.
+
+    Scripts in SCRIPTS with a language decide on their own once
+    `script_share` of the letters use them. Latin and Devanagari text needs
+    `min_letters` letters and a trigram log-likelihood lead of
+    `min_log_odds` over the runner-up (about 98% posterior at 4.0), and
+    must not score best as OTHER; anything less is reported as unknown
+    (lang=None), so callers fall back to "auto".
+    """
+    text = text[:SAMPLE_CHARS]
+    scripts = Counter()
+    langs = {}
+    letters = 0
+    for ch, n in Counter(text).items():
+        found = _script_of(ch)
+        if found is None:
+            continue
+        letters += n
+        script, lang = found
+        scripts[script] += n
+        if lang:
+            langs[script] = lang
+    if not letters:
+        return Detection(None, 0.0, "none")
+    script, count = scripts.most_common(1)[0]
+    share = count / letters
+    if script in langs:
+        if share < script_share:
+            return Detection(None, share, script)
+        lang = langs[script]
+        chars = set(text)
+        if script == "bengali" and chars & ASSAMESE_LETTERS:
+            lang = "as"
+        elif script == "arabic":
+            if chars & URDU_LETTERS:
+                lang = "ur"
+            elif chars & PERSIAN_LETTERS:
+                lang = "fa"
+        return Detection(lang, share, script)
+    model = _models.get(script)
+    if model is None or letters < min_letters or share < script_share:
+        return Detection(None, share, script)
+    ranked = sorted(model.scores(text).items(), key=lambda kv: kv[1], reverse=True)
+    margin = ranked[0][1] - ranked[1][1]
+    if margin < min_log_odds or ranked[0][0] == OTHER:
+        return Detection(None, margin, script)
+    return Detection(ranked[0][0], margin, script)
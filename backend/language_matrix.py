@@ -0,0 +1,110 @@
+# backend/language_matrix.py
+"""Which target languages each translation provider can serve."""
+
+import asyncio
+import json
+import logging
+import time
+from typing import Dict, Iterable, List, Set
+
+logger = logging.getLogger("healthassistant.languages")
+
+
+class LanguageMatrix:
+    """Capability matrix: provider -> set of target codes (None = any known code).
+
+    Seeded from the offline fallback file (a JSON object with `known`, the
+    codes we accept at all, and `providers`, a code list or "any" per
+    provider) and from the Lingo project's `targetLanguages`. `refresh`
+    replaces a provider's row with what its language-list endpoint reports;
+    providers without one, or whose endpoint fails, keep their seeded row.
+
+    Every lookup is a dict or set membership test, so unknown codes are
+    rejected and unsupported providers skipped without any I/O.
+    """
+
+    def __init__(self, known: Iterable[str], rows: Dict[str, Set[str] | None]):
+        self._known: Dict[str, str] = {}
+        self._rows: Dict[str, Set[str] | None] = {}
+        self._sources: Dict[str, str] = {}
+        self.refreshed_at: float | None = None
+        self._add_known(known)
+        for name, codes in rows.items():
+            self._set_row(name, codes, "fallback")
+
+    @classmethod
+    def from_files(cls, fallback_path: str, lingo_config_path: str | None = None) -> "LanguageMatrix":
+        with open(fallback_path, "r", encoding="utf-8") as fh:
+            data = json.load(fh)
+        rows = {name: None if codes == "any" else set(codes) for name, codes in data.get("providers", {}).items()}
+        matrix = cls(data.get("known", []), rows)
+        if lingo_config_path:
+            try:
+                with open(lingo_config_path, "r", encoding="utf-8") as fh:
+                    targets = json.load(fh).get("targetLanguages") or []
+            except (OSError, ValueError) as exc:
+                logger.info("languages source=lingo_config status=unavailable path=%s error=%s", lingo_config_path, exc)
+            else:
+                if targets:
+                    matrix._set_row("lingo", set(targets), "lingo_config")
+        return matrix
+
+    def _add_known(self, codes: Iterable[str]):
+        for code in codes:
+            self._known.setdefault(code.strip().lower(), code.strip())
+
+    def _set_row(self, name: str, codes: Set[str] | None, source: str):
+        if codes is not None:
+            self._add_known(codes)
+            codes = {self._known[c.strip().lower()] for c in codes}
+        self._rows[name] = codes
+        self._sources[name] = source
+
+    def canonical(self, code: str) -> str | None:
+        """The known spelling of `code` (case-insensitive), or None if no provider serves it."""
+        return self._known.get(code.strip().lower())
+
+    def supports(self, provider: str, code: str) -> bool:
+        # providers without a row are not restricted
+        codes = self._rows.get(provider)
+        return codes is None or code in codes
+
+    def languages(self, provider: str) -> Set[str] | None:
+        return self._rows.get(provider)
+
+    def known(self) -> List[str]:
+        return sorted(self._known.values())
+
+    async def refresh(self, providers: Dict[str, object], timeout: float = 10.0) -> Dict[str, str]:
+        """Ask each provider for its language list; returns provider -> outcome."""
+        names = list(providers)
+        results = await asyncio.gather(
+            *(asyncio.wait_for(providers[n].list_languages(), timeout) for n in names), return_exceptions=True
+        )
+        outcome = {}
+        for name, codes in zip(names, results):
+            if isinstance(codes, BaseException):
+                logger.warning("languages provider=%s status=error error=%s", name, codes)
+                outcome[name] = "error"
+            elif codes is None:
+                outcome[name] = "static"
+            elif not codes:
+                logger.warning("languages provider=%s status=empty", name)
+                outcome[name] = "empty"
+            else:
+                self._set_row(name, set(codes), "endpoint")
+                logger.info("languages provider=%s status=ok count=%d", name, len(codes))
+                outcome[name] = "ok"
+        self.refreshed_at = time.time()
+        return outcome
+
+    def snapshot(self) -> dict:
+        return {
+            "known": self.known(),
+            "refreshed_at": self.refreshed_at,
+            "providers": {
+                name: {"source": self._sources[name],
+                       "languages": sorted(codes) if codes is not None else "any"}
+                for name, codes in self._rows.items()
+            },
+        }
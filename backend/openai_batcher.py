@@ -0,0 +1,98 @@
+# backend/openai_batcher.py
+"""Dynamic micro-batching of OpenAI-bound translations."""
+
+import asyncio
+import logging
+from collections import defaultdict
+from typing import Awaitable, Callable, Dict, List, Tuple
+
+import deadline
+
+logger = logging.getLogger("healthassistant.batcher")
+
+TranslateMany = Callable[[List[str], str], Awaitable[List[str | None]]]
+
+
+class MicroBatcher:
+    """Collects translations for `window` seconds, grouped by target language.
+
+    Each group goes out as one `translate_many` call (a packed prompt); the
+    answers are handed back to the waiting callers in order. A group is
+    flushed early once it reaches `max_batch` texts, or once the
+    `token_cost` of its texts reaches `max_tokens` (0 = no token limit),
+    so a packed reply fits in one completion. The batch call runs
+    without a request deadline; each caller only waits as long as its own
+    budget allows.
+    """
+
+    def __init__(self, translate_many: TranslateMany, window: float = 0.02, max_batch: int = 20,
+                 max_tokens: int = 0, token_cost: Callable[[str], int] | None = None):
+        self.translate_many = translate_many
+        self.window = window
+        self.max_batch = max_batch
+        self.max_tokens = max_tokens
+        self.token_cost = token_cost or (lambda text: 0)
+        self._pending: Dict[str, List[Tuple[str, asyncio.Future]]] = defaultdict(list)
+        self._tokens: Dict[str, int] = defaultdict(int)
+        self._timers: Dict[str, asyncio.TimerHandle] = {}
+        self.batches = 0
+        self.items = 0
+        self.largest = 0
+
+    async def submit(self, text: str, target: str) -> str:
+        loop = asyncio.get_running_loop()
+        fut = loop.create_future()
+        cost = self.token_cost(text)
+        if self.max_tokens and self._pending[target] and self._tokens[target] + cost > self.max_tokens:
+            # this one would overflow the packed reply: send what is waiting first
+            self._flush(target)
+        group = self._pending[target]
+        group.append((text, fut))
+        self._tokens[target] += cost
+        if len(group) >= self.max_batch or (self.max_tokens and self._tokens[target] >= self.max_tokens):
+            self._flush(target)
+        elif target not in self._timers:
+            self._timers[target] = loop.call_later(self.window, self._flush, target)
+        return await deadline.bounded(fut)
+
+    def _flush(self, target: str):
+        timer = self._timers.pop(target, None)
+        if timer is not None:
+            timer.cancel()
+        group = self._pending.pop(target, [])
+        self._tokens.pop(target, None)
+        if group:
+            deadline.detached(self._run(target, group))
+
+    async def _run(self, target: str, group: List[Tuple[str, asyncio.Future]]):
+        # callers cancelled while waiting (e.g. hedge losers) drop out of the batch
+        group = [(text, fut) for text, fut in group if not fut.done()]
+        if not group:
+            return
+        texts = list(dict.fromkeys(text for text, _ in group))
+        self.batches += 1
+        self.items += len(group)
+        self.largest = max(self.largest, len(texts))
+        try:
+            translated = dict(zip(texts, await self.translate_many(texts, target)))
+        except Exception as exc:
+            for _, fut in group:
+                if not fut.done():
+                    fut.set_exception(exc)
+            return
+        for text, fut in group:
+            if fut.done():
+                continue
+            if translated.get(text):
+                fut.set_result(translated[text])
+            else:
+                fut.set_exception(RuntimeError("OpenAI returned no translation."))
+
+    def stats(self) -> dict:
+        return {
+            "batches": self.batches,
+            "items": self.items,
+            "avg_batch_size": round(self.items / self.batches, 2) if self.batches else 0.0,
+            "largest_batch": self.largest,
+            "pending": sum(len(g) for g in self._pending.values()),
+        }
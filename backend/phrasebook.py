@@ -0,0 +1,154 @@
+# backend/phrasebook.py
+"""Precomputed phrase translations in a memory-mapped binary pack.
+
+Layout (little-endian):
+    header   "HAPB", version u32, entry count u32, data offset u32
+    index    count x (hash u64, data offset u32, key length u32, value length u32),
+             sorted by hash
+    data     key bytes ("<target>\\0<normalized text>", UTF-8) then value bytes
+
+Lookups hash the key, binary-search the index and compare the stored key,
+so nothing is parsed at load time. The file is mapped read-only: every
+worker process shares the same page-cache pages.
+"""
+
+import hashlib
+import logging
+import mmap
+import os
+import struct
+import tempfile
+import time
+from typing import Iterable, Tuple
+
+from translation_cache import normalize_text
+
+logger = logging.getLogger("healthassistant.phrasebook")
+
+MAGIC = b"HAPB"
+VERSION = 1
+_HEADER = struct.Struct("<4sIII")
+_ENTRY = struct.Struct("<QIII")
+
+
+def _key(text: str, target: str) -> bytes:
+    return f"{target}\0{normalize_text(text)}".encode("utf-8")
+
+
+def _hash(key: bytes) -> int:
+    return int.from_bytes(hashlib.blake2b(key, digest_size=8).digest(), "little")
+
+
+def write_pack(path: str, entries: Iterable[Tuple[str, str, str]]) -> int:
+    """Write (text, target, translation) entries to `path`; returns the entry count.
+
+    The pack is written beside `path` and renamed over it, so a server
+    watching the file never maps a half-written pack.
+    """
+    records = {}
+    for text, target, translation in entries:
+        if text.strip() and translation:
+            records[_key(text, target)] = translation.encode("utf-8")
+    items = sorted(((_hash(k), k, v) for k, v in records.items()), key=lambda item: (item[0], item[1]))
+
+    data_offset = _HEADER.size + _ENTRY.size * len(items)
+    index, data = bytearray(), bytearray()
+    for h, key, value in items:
+        index += _ENTRY.pack(h, data_offset + len(data), len(key), len(value))
+        data += key + value
+
+    directory = os.path.dirname(os.path.abspath(path))
+    fd, tmp = tempfile.mkstemp(prefix=".phrasebook-", dir=directory)
+    try:
+        with os.fdopen(fd, "wb") as fh:
+            fh.write(_HEADER.pack(MAGIC, VERSION, len(items), data_offset))
+            fh.write(index)
+            fh.write(data)
+        os.chmod(tmp, 0o644)
+        os.replace(tmp, path)
+    except BaseException:
+        os.unlink(tmp)
+        raise
+    return len(items)
+
+
+class Phrasebook:
+    """Read side of a phrase pack; a missing or invalid file is simply empty.
+
+    `reload_if_changed` swaps in a rebuilt pack (new inode or mtime) without
+    a restart. The old mapping is dropped, not closed, so a lookup still
+    holding it finishes safely.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._mm = None
+        self._count = 0
+        self._stat = None
+        self.loaded_at: float | None = None
+        self.hits = 0
+        self.misses = 0
+        self.reload_if_changed()
+
+    def reload_if_changed(self) -> bool:
+        try:
+            st = os.stat(self.path)
+        except OSError:
+            if self._mm is not None:
+                logger.warning("phrasebook path=%s status=missing keeping_loaded=%d", self.path, self._count)
+            return False
+        signature = (st.st_ino, st.st_mtime_ns, st.st_size)
+        if signature == self._stat:
+            return False
+        try:
+            with open(self.path, "rb") as fh:
+                mm = mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ) if st.st_size else None
+            if mm is None or mm.size() < _HEADER.size:
+                raise ValueError("file too short")
+            magic, version, count, data_offset = _HEADER.unpack_from(mm, 0)
+            if magic != MAGIC or version != VERSION or data_offset != _HEADER.size + _ENTRY.size * count:
+                raise ValueError("not a phrasebook pack")
+        except (OSError, ValueError) as exc:
+            logger.warning("phrasebook path=%s status=invalid error=%s", self.path, exc)
+            self._stat = signature
+            return False
+        self._mm, self._count, self._stat = mm, count, signature
+        self.loaded_at = time.time()
+        logger.info("phrasebook path=%s status=loaded entries=%d bytes=%d", self.path, count, st.st_size)
+        return True
+
+    def lookup(self, text: str, target: str) -> str | None:
+        mm, count = self._mm, self._count
+        if not count:
+            return None
+        key = _key(text, target)
+        h = _hash(key)
+        lo, hi = 0, count
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if struct.unpack_from("<Q", mm, _HEADER.size + mid * _ENTRY.size)[0] < h:
+                lo = mid + 1
+            else:
+                hi = mid
+        # equal hashes sit next to each other; the stored key settles collisions
+        while lo < count:
+            entry_hash, offset, key_len, value_len = _ENTRY.unpack_from(mm, _HEADER.size + lo * _ENTRY.size)
+            if entry_hash != h:
+                break
+            if mm[offset:offset + key_len] == key:
+                self.hits += 1
+                return mm[offset + key_len:offset + key_len + value_len].decode("utf-8")
+            lo += 1
+        self.misses += 1
+        return None
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "path": self.path,
+            "entries": self._count,
+            "loaded_at": self.loaded_at,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+        }
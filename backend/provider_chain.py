@@ -0,0 +1,114 @@
+# backend/provider_chain.py
+"""Hedged provider fallback: race the next provider once the current one is slow."""
+
+import asyncio
+import logging
+from collections import defaultdict, deque
+from typing import Awaitable, Callable, Dict, List, Tuple
+
+logger = logging.getLogger("healthassistant.providers")
+
+ProviderFn = Callable[[str, str], Awaitable[str | None]]
+
+
+class LatencyTracker:
+    """Rolling window of successful call latencies per provider."""
+
+    def __init__(self, window: int = 200, min_samples: int = 20):
+        self.min_samples = min_samples
+        self._samples: Dict[str, deque] = defaultdict(lambda: deque(maxlen=window))
+
+    def record(self, provider: str, seconds: float):
+        self._samples[provider].append(seconds)
+
+    def percentile(self, provider: str, pct: float) -> float | None:
+        samples = self._samples.get(provider)
+        if not samples or len(samples) < self.min_samples:
+            return None
+        ordered = sorted(samples)
+        idx = min(len(ordered) - 1, max(0, round(pct / 100 * len(ordered)) - 1))
+        return ordered[idx]
+
+    def snapshot(self) -> dict:
+        out = {}
+        for provider, samples in self._samples.items():
+            ordered = sorted(samples)
+            out[provider] = {
+                "count": len(ordered),
+                "p50_ms": round(ordered[len(ordered) // 2] * 1000, 1) if ordered else None,
+                "p95_ms": round(ordered[int(len(ordered) * 0.95) - 1] * 1000, 1) if len(ordered) >= 20 else None,
+            }
+        return out
+
+
+def _consume_result(task: asyncio.Task):
+    # losers are cancelled without being awaited; keep asyncio from logging their errors
+    if not task.cancelled():
+        task.exception()
+
+
+class HedgedChain:
+    def __init__(self, tracker: LatencyTracker, default_delay: float = 1.5, percentile: float = 95,
+                 min_delay: float = 0.2, max_delay: float = 5.0, enabled: bool = True):
+        self.tracker = tracker
+        self.default_delay = default_delay
+        self.percentile = percentile
+        self.min_delay = min_delay
+        self.max_delay = max_delay
+        self.enabled = enabled
+
+    def hedge_delay(self, provider: str) -> float | None:
+        """How long to give `provider` before starting the next one (None = wait for it)."""
+        if not self.enabled:
+            return None
+        observed = self.tracker.percentile(provider, self.percentile)
+        if observed is None:
+            return self.default_delay
+        return min(self.max_delay, max(self.min_delay, observed))
+
+    async def run(self, providers: List[Tuple[str, ProviderFn]], text: str, target: str) -> Tuple[str, str] | None:
+        """Return (translation, provider) from the first provider with a good answer."""
+        loop = asyncio.get_running_loop()
+        queue = list(providers)
+        pending: Dict[asyncio.Task, Tuple[str, float]] = {}
+        last_name, last_started = "", 0.0
+
+        def launch():
+            nonlocal last_name, last_started
+            name, fn = queue.pop(0)
+            task = asyncio.ensure_future(fn(text, target))
+            task.add_done_callback(_consume_result)
+            last_name, last_started = name, loop.time()
+            pending[task] = (name, last_started)
+
+        try:
+            if queue:
+                launch()
+            while pending:
+                timeout = None
+                if queue:
+                    delay = self.hedge_delay(last_name)
+                    if delay is not None:
+                        timeout = max(0.0, last_started + delay - loop.time())
+                done, _ = await asyncio.wait(pending, timeout=timeout, return_when=asyncio.FIRST_COMPLETED)
+                if not done:
+                    logger.info("translation_hedge slow_provider=%s starting=%s target=%s", last_name, queue[0][0], target)
+                    launch()
+                    continue
+                for task in done:
+                    name, started = pending.pop(task)
+                    try:
+                        result = task.result()
+                    except Exception as exc:
+                        logger.warning("translation_provider=%s status=error target=%s error=%s", name, target, exc)
+                        result = None
+                    if result:
+                        self.tracker.record(name, loop.time() - started)
+                        return result, name
+                    # a failed provider hands over straight away
+                    if queue:
+                        launch()
+            return None
+        finally:
+            for task in pending:
+                task.cancel()
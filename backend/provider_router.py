@@ -0,0 +1,105 @@
+# backend/provider_router.py
+"""Latency-aware provider ordering per target language (epsilon-greedy bandit)."""
+
+import asyncio
+import random
+import time
+from collections import Counter, defaultdict
+from typing import Awaitable, Callable, Dict, List, Tuple
+
+from circuit_breaker import BreakerOpen
+from rate_limiter import RateLimited
+
+
+class _Arm:
+    __slots__ = ("calls", "latency", "success")
+
+    def __init__(self):
+        self.calls = 0
+        self.latency = 0.0   # EWMA seconds, over all completed calls
+        self.success = 1.0   # EWMA of 1 (good answer) / 0 (error or empty)
+
+
+class ProviderRouter:
+    """Orders providers for a target language by expected time to a good answer.
+
+    Each (provider, target) arm keeps EWMAs of latency and success. The score
+    is latency / success rate, so a fast provider that fails half the time
+    ranks like one twice as slow. Arms with fewer than `min_samples` calls
+    are tried first so every provider gets measured. With probability
+    `epsilon` a random other provider is promoted to keep exploring.
+    """
+
+    def __init__(self, alpha: float = 0.2, epsilon: float = 0.1, min_samples: int = 5, enabled: bool = True):
+        self.alpha = alpha
+        self.epsilon = epsilon
+        self.min_samples = min_samples
+        self.enabled = enabled
+        self._arms: Dict[Tuple[str, str], _Arm] = defaultdict(_Arm)
+        self._first = defaultdict(Counter)   # target -> provider -> times routed first
+        self._explored = Counter()           # target -> exploration decisions
+
+    def record(self, provider: str, target: str, seconds: float, ok: bool):
+        arm = self._arms[(provider, target)]
+        if arm.calls == 0:
+            arm.latency = seconds
+            arm.success = 1.0 if ok else 0.0
+        else:
+            arm.latency += self.alpha * (seconds - arm.latency)
+            arm.success += self.alpha * ((1.0 if ok else 0.0) - arm.success)
+        arm.calls += 1
+
+    def score(self, provider: str, target: str) -> float | None:
+        arm = self._arms.get((provider, target))
+        if arm is None or arm.calls < self.min_samples:
+            return None
+        return arm.latency / max(arm.success, 0.05)
+
+    def order(self, target: str, candidates: List[str]) -> List[str]:
+        """Rank `candidates` (given in configured order) for `target`."""
+        if not self.enabled or len(candidates) < 2:
+            return list(candidates)
+        unexplored = [p for p in candidates if self.score(p, target) is None]
+        ranked = sorted((p for p in candidates if p not in unexplored), key=lambda p: self.score(p, target))
+        ordered = unexplored + ranked
+        if random.random() < self.epsilon:
+            pick = random.choice(ordered[1:])
+            ordered.remove(pick)
+            ordered.insert(0, pick)
+            self._explored[target] += 1
+        self._first[target][ordered[0]] += 1
+        return ordered
+
+    def wrap(self, provider: str, target: str, fn: Callable[[str, str], Awaitable[str | None]]):
+        """Wrap a provider call so its latency and outcome feed the router (cancellations, local rate limiting and open breakers are ignored)."""
+        async def measured(text: str, tgt: str):
+            started = time.monotonic()
+            try:
+                result = await fn(text, tgt)
+            except (asyncio.CancelledError, RateLimited, BreakerOpen):
+                raise
+            except Exception:
+                self.record(provider, target, time.monotonic() - started, False)
+                raise
+            self.record(provider, target, time.monotonic() - started, bool(result))
+            return result
+        return measured
+
+    def snapshot(self) -> dict:
+        targets: Dict[str, dict] = defaultdict(lambda: {"providers": {}})
+        for (provider, target), arm in self._arms.items():
+            score = self.score(provider, target)
+            targets[target]["providers"][provider] = {
+                "calls": arm.calls,
+                "latency_ms": round(arm.latency * 1000, 1),
+                "success_rate": round(arm.success, 3),
+                "score_ms": round(score * 1000, 1) if score is not None else None,
+            }
+        for target, firsts in self._first.items():
+            targets[target]["routed_first"] = dict(firsts)
+            targets[target]["explorations"] = self._explored[target]
+        return {
+            "policy": {"enabled": self.enabled, "epsilon": self.epsilon, "alpha": self.alpha,
+                       "min_samples": self.min_samples},
+            "targets": dict(targets),
+        }
@@ -0,0 +1,570 @@
+# backend/providers.py
+"""Translation providers behind one interface, plus the registry that builds the chain."""
+
+import asyncio
+import json
+import logging
+from typing import Dict, List, Set, Type
+
+import deadline
+import http_clients
+from openai_batcher import MicroBatcher
+from rate_limiter import RateLimited, RateLimiter, estimate_tokens, retry_after_seconds
+from segmenter import approx_tokens
+
+# async OpenAI client (openai>=1.0); the 0.x SDK exposes ChatCompletion.acreate instead
+try:
+    from openai import AsyncOpenAI
+except Exception:
+    AsyncOpenAI = None
+
+logger = logging.getLogger("healthassistant.providers")
+
+LANGUAGE_NAMES = {
+    "hi": "Hindi", "ta": "Tamil", "te": "Telugu", "bn": "Bengali",
+    "es": "Spanish", "fr": "French", "ar": "Arabic", "en": "English"
+}
+
+
+def _has_key(value: str) -> bool:
+    # docker-compose fills unset keys with the placeholder "demo"
+    return bool(value) and value != "demo"
+
+
+def translation_prompt(text: str, target: str, source: str = "auto") -> str:
+    origin = "" if source == "auto" else f"from {LANGUAGE_NAMES.get(source, source)} "
+    return (
+        f"You are a translator writing for elderly users. Translate the text below {origin}into {LANGUAGE_NAMES.get(target, target)}. "
+        "Use short, clear sentences and easy words.\n\n"
+        f"Text: {text}\n\nTranslation:"
+    )
+
+
+# max_tokens for one completion; packed calls are split so they fit under it
+COMPLETION_MAX_TOKENS = 4000
+# JSON quoting and separators per item of a packed reply
+PACKED_ITEM_TOKENS = 8
+
+
+def completion_estimate(*texts: str, overhead: int = 0) -> int:
+    """Tokens the translation of `texts` may need.
+
+    Indic and Arabic scripts take several times more tokens than the English
+    they translate, hence 4x the input.
+    """
+    return 4 * sum(approx_tokens(t) for t in texts) + overhead
+
+
+def completion_budget(*texts: str, overhead: int = 0) -> int:
+    """max_tokens for translating `texts`, so long inputs aren't cut off at a fixed 400.
+
+    The estimate, never under 400 and capped at COMPLETION_MAX_TOKENS.
+    """
+    return min(COMPLETION_MAX_TOKENS, max(400, completion_estimate(*texts, overhead=overhead)))
+
+
+def packed_tokens(text: str) -> int:
+    """What one text adds to a packed completion."""
+    return completion_estimate(text, overhead=PACKED_ITEM_TOKENS)
+
+
+def pack_groups(texts: List[str], max_tokens: int = COMPLETION_MAX_TOKENS) -> List[List[int]]:
+    """Indices of `texts` in consecutive groups whose packed reply fits in `max_tokens`.
+
+    A text too long to share a completion gets a group of its own.
+    """
+    groups: List[List[int]] = []
+    size = 0
+    for i, text in enumerate(texts):
+        cost = packed_tokens(text)
+        if not groups or size + cost > max_tokens:
+            groups.append([])
+            size = 0
+        groups[-1].append(i)
+        size += cost
+    return groups
+
+
+def packed_prompt(texts: List[str], target: str) -> str:
+    return (
+        f"You are a translator writing for elderly users. Translate each string in the JSON array below "
+        f"into {LANGUAGE_NAMES.get(target, target)}. Use short, clear sentences and easy words.\n"
+        "Reply with only a JSON array of strings: same length, same order, one translation per item.\n\n"
+        + json.dumps(texts, ensure_ascii=False)
+    )
+
+
+def parse_json_array(content: str, expected: int) -> List[str] | None:
+    content = content.strip()
+    if content.startswith("```"):
+        content = content.strip("`")
+        content = content[content.find("["):]
+    try:
+        items = json.loads(content)
+    except ValueError:
+        return None
+    if not isinstance(items, list) or len(items) != expected or not all(isinstance(i, str) for i in items):
+        return None
+    return [i.strip() for i in items]
+
+
+def _messages(prompt: str) -> list:
+    return [
+        {"role": "system", "content": "You are a helpful translator."},
+        {"role": "user", "content": prompt},
+    ]
+
+
+class TranslationProvider:
+    """One translation backend.
+
+    `translate` returns the translation, or None / raises on failure;
+    `source` is the detected source language, or "auto" when unsure.
+    `translate_many` answers in input order with None for misses; the
+    default fans out to `translate`. `languages` lists the target codes the
+    provider serves (None = any); app.py fills it from the language matrix,
+    which `list_languages` refreshes from the provider's own list. `cost_hint`
+    is a relative cost per call and `latency_hint` the typical seconds per
+    call. `startup` / `shutdown` own shared clients and `probe` is the
+    breaker's cheap health check. Upstream calls go through `limiter`; when
+    it can't admit one in time they raise RateLimited, which is not a
+    provider failure.
+    """
+
+    name = ""
+    languages: Set[str] | None = None
+    cost_hint = 1.0
+    latency_hint = 1.0
+    supports_streaming = False
+
+    def configured(self) -> bool:
+        return True
+
+    def supports(self, target: str) -> bool:
+        return self.languages is None or target in self.languages
+
+    async def startup(self):
+        pass
+
+    async def shutdown(self):
+        pass
+
+    async def probe(self) -> bool:
+        return bool(await self.translate("ok", "es"))
+
+    async def list_languages(self) -> Set[str] | None:
+        """Target codes from the provider's language-list endpoint; None if it has none."""
+        return None
+
+    async def translate(self, text: str, target: str, source: str = "auto") -> str | None:
+        raise NotImplementedError
+
+    async def translate_many(self, texts: List[str], target: str, source: str = "auto") -> List[str | None]:
+        results = await asyncio.gather(*(self.translate(t, target, source) for t in texts), return_exceptions=True)
+        return [r if isinstance(r, str) and r else None for r in results]
+
+    async def stream(self, text: str, target: str):
+        raise NotImplementedError
+        yield  # pragma: no cover
+
+    def describe(self) -> dict:
+        return {
+            "configured": self.configured(),
+            "languages": sorted(self.languages) if self.languages is not None else "any",
+            "cost_hint": self.cost_hint,
+            "latency_hint_s": self.latency_hint,
+            "streaming": self.supports_streaming,
+        }
+
+    def stats(self) -> dict | None:
+        return None
+
+
+class HTTPProvider(TranslationProvider):
+    """A provider talking to one base URL over a pooled, app-lifetime httpx client."""
+
+    def __init__(self, base_url: str, warm_up: bool = True):
+        self.base_url = base_url
+        self.warm_up = warm_up
+        self.timeout = http_clients.PROVIDER_TIMEOUT
+        self.limiter = RateLimiter(self.name)
+        http_clients.register_client(self.name, base_url)
+
+    @property
+    def client(self):
+        return http_clients.get_client(self.name)
+
+    async def _send(self, method: str, url: str, tokens: int = 0, **kwargs):
+        """One rate-limited upstream request; a 429 is retried once after its Retry-After if time allows."""
+        for attempt in range(2):
+            await self.limiter.acquire(tokens)
+            r = await self.client.request(method, url, timeout=deadline.budget(self.timeout), **kwargs)
+            if r.status_code != 429:
+                break
+            self.limiter.throttle(retry_after_seconds(r.headers.get("Retry-After")))
+        return r
+
+    async def startup(self):
+        if self.warm_up and self.configured():
+            await http_clients.warm_up([self.name])
+
+
+PROVIDER_TYPES: Dict[str, Type[TranslationProvider]] = {}
+
+
+def register_provider(cls: Type[TranslationProvider]) -> Type[TranslationProvider]:
+    PROVIDER_TYPES[cls.name] = cls
+    return cls
+
+
+def build_providers(names: List[str], settings: Dict[str, dict]) -> Dict[str, TranslationProvider]:
+    """Instantiate the providers named in `names`, in that (chain) order."""
+    unknown = [n for n in names if n not in PROVIDER_TYPES]
+    if unknown:
+        raise ValueError(f"Unknown translation provider(s): {', '.join(unknown)}. "
+                         f"Available: {', '.join(PROVIDER_TYPES)}")
+    return {name: PROVIDER_TYPES[name](**settings.get(name, {})) for name in names}
+
+
+@register_provider
+class LingoProvider(HTTPProvider):
+    name = "lingo"
+    cost_hint = 1.0
+    latency_hint = 0.8
+
+    def __init__(self, api_key: str = "", project_id: str = "", base_url: str = "https://api.lingo.dev",
+                 warm_up: bool = True):
+        super().__init__(base_url, warm_up)
+        self.api_key = api_key
+        self.project_id = project_id
+
+    def configured(self) -> bool:
+        return _has_key(self.api_key) and _has_key(self.project_id)
+
+    async def translate(self, text: str, target: str, source: str = "auto") -> str | None:
+        if not self.api_key or not self.project_id:
+            return None
+        try:
+            url = f"/v1/projects/{self.project_id}/translate"
+            payload = {"text": text, "target": target, "source": source}
+            headers = {"Authorization": f"Bearer {self.api_key}"}
+            r = await self._send("POST", url, estimate_tokens(text), json=payload, headers=headers)
+            if r.status_code == 200:
+                data = r.json()
+                translation = data.get("translation") or data.get("translatedText") or data.get("result")
+                logger.info("translation_provider=lingo status=ok target=%s", target)
+                return translation
+        except RateLimited:
+            raise
+        except Exception as exc:
+            logger.warning("translation_provider=lingo status=error target=%s error=%s", target, exc)
+            return None
+        logger.warning("translation_provider=lingo status=http_%s target=%s", r.status_code, target)
+        return None
+
+    # Lingo has no multi-text endpoint; the default fan-out keeps these on warm connections
+
+
+@register_provider
+class GroqProvider(HTTPProvider):
+    """Groq's OpenAI-compatible chat completions; low latency for short messages."""
+
+    name = "groq"
+    cost_hint = 0.2
+    latency_hint = 0.3
+
+    def __init__(self, api_key: str = "", base_url: str = "https://api.groq.com/openai/v1",
+                 model: str = "llama-3.1-8b-instant", timeout: float = 5.0, warm_up: bool = True):
+        super().__init__(base_url, warm_up)
+        self.api_key = api_key
+        self.model = model
+        self.timeout = timeout
+
+    def configured(self) -> bool:
+        return _has_key(self.api_key)
+
+    async def translate(self, text: str, target: str, source: str = "auto") -> str | None:
+        if not self.api_key:
+            return None
+        try:
+            payload = {
+                "model": self.model,
+                "messages": _messages(translation_prompt(text, target, source)),
+                "temperature": 0.2,
+                "max_tokens": completion_budget(text),
+            }
+            headers = {"Authorization": f"Bearer {self.api_key}"}
+            r = await self._send("POST", "/chat/completions", estimate_tokens(text), json=payload, headers=headers)
+            if r.status_code == 200:
+                data = r.json()
+                translation = (data["choices"][0]["message"].get("content") or "").strip()
+                logger.info("translation_provider=groq status=ok target=%s", target)
+                return translation
+        except RateLimited:
+            raise
+        except Exception as exc:
+            logger.warning("translation_provider=groq status=error target=%s error=%s", target, exc)
+            return None
+        logger.warning("translation_provider=groq status=http_%s target=%s", r.status_code, target)
+        return None
+
+    async def probe(self) -> bool:
+        r = await self.client.get("/models", headers={"Authorization": f"Bearer {self.api_key}"})
+        return r.status_code == 200
+
+
+@register_provider
+class OpenAIProvider(HTTPProvider):
+    """OpenAI chat completions through one shared async SDK client.
+
+    Single translations are micro-batched: texts for the same target that
+    arrive within `batch_window` seconds share one packed completion. Texts
+    over `batch_text_tokens` (document chunks) skip the batcher: they are a
+    full completion's worth each and are meant to run in parallel.
+    """
+
+    name = "openai"
+    cost_hint = 1.0
+    latency_hint = 1.5
+
+    def __init__(self, api_key: str = "", base_url: str = "https://api.openai.com/v1", model: str = "gpt-3.5-turbo",
+                 timeout: float = 10.0, max_retries: int = 1, batch_window: float = 0.02, batch_max: int = 20,
+                 batch_text_tokens: int = 50, streaming: bool = True, warm_up: bool = True):
+        super().__init__(base_url, warm_up)
+        self.api_key = api_key
+        self.model = model
+        self.timeout = timeout
+        self.max_retries = max_retries
+        self.supports_streaming = streaming and AsyncOpenAI is not None
+        self.batch_text_tokens = batch_text_tokens
+        self.batcher = MicroBatcher(self.translate_many, window=batch_window, max_batch=batch_max,
+                                    max_tokens=COMPLETION_MAX_TOKENS, token_cost=packed_tokens) if batch_window > 0 else None
+        self._sdk_client = None
+
+    def configured(self) -> bool:
+        return _has_key(self.api_key)
+
+    def sdk_client(self):
+        """Return the shared async OpenAI client (None on the legacy 0.x SDK)."""
+        if self._sdk_client is None and AsyncOpenAI is not None:
+            self._sdk_client = AsyncOpenAI(
+                api_key=self.api_key,
+                base_url=self.base_url,
+                timeout=self.timeout,
+                max_retries=self.max_retries,
+                http_client=self.client,
+            )
+        return self._sdk_client
+
+    async def shutdown(self):
+        # the SDK client rides on the pooled httpx client, which http_clients closes
+        self._sdk_client = None
+
+    def _throttle_on_429(self, exc: Exception):
+        # the SDK raises RateLimitError with the upstream response attached
+        response = getattr(exc, "response", None)
+        if response is not None and getattr(response, "status_code", None) == 429:
+            self.limiter.throttle(retry_after_seconds(response.headers.get("retry-after")))
+
+    async def _complete(self, prompt: str, max_tokens: int) -> str:
+        # OpenAI counts prompt tokens plus max_tokens against the TPM budget
+        await self.limiter.acquire(len(prompt) // 4 + max_tokens)
+        client = self.sdk_client()
+        if client is not None:
+            # The SDK timeout covers each attempt; wait_for bounds the whole call
+            # (retries included) and cancels the in-flight request when it fires.
+            # Both are clipped to what is left of the request deadline.
+            try:
+                response = await asyncio.wait_for(
+                    client.chat.completions.create(
+                        model=self.model,
+                        messages=_messages(prompt),
+                        temperature=0.2,
+                        max_tokens=max_tokens,
+                        timeout=deadline.budget(self.timeout),
+                    ),
+                    timeout=deadline.budget(self.timeout * (self.max_retries + 1)),
+                )
+            except Exception as exc:
+                self._throttle_on_429(exc)
+                raise
+            return (response.choices[0].message.content or "").strip()
+        # Classic `openai` package (openai==0.x) has an async variant too
+        import openai as _openai
+        _openai.api_key = self.api_key
+        resp = await asyncio.wait_for(
+            _openai.ChatCompletion.acreate(
+                model=self.model,
+                messages=_messages(prompt),
+                temperature=0.2,
+                max_tokens=max_tokens,
+                request_timeout=deadline.budget(self.timeout),
+            ),
+            timeout=deadline.budget(self.timeout),
+        )
+        return resp["choices"][0]["message"]["content"].strip()
+
+    async def translate_one(self, text: str, target: str, source: str = "auto") -> str:
+        if not self.api_key:
+            raise RuntimeError("OpenAI key not configured.")
+        try:
+            return await self._complete(translation_prompt(text, target, source), completion_budget(text))
+        except (asyncio.CancelledError, RateLimited):
+            raise
+        except asyncio.TimeoutError:
+            raise RuntimeError("OpenAI translation timed out.")
+        except Exception as exc:
+            raise RuntimeError(f"OpenAI translation failed: {str(exc)}")
+
+    async def translate(self, text: str, target: str, source: str = "auto") -> str | None:
+        # batched prompts mix requests, so the model works out each source itself
+        if self.batcher is not None and approx_tokens(text) <= self.batch_text_tokens:
+            translation = await self.batcher.submit(text, target)
+        else:
+            translation = await self.translate_one(text, target, source)
+        logger.info("translation_provider=openai status=ok target=%s", target)
+        return translation
+
+    async def translate_many(self, texts: List[str], target: str, source: str = "auto") -> List[str | None]:
+        """Translate several texts in one completion using a JSON-array contract.
+
+        Texts whose replies wouldn't fit one completion are split into
+        several packed calls (made concurrently); max_tokens always covers
+        the estimate rather than cutting a packed reply short. Falls back to
+        one call per text if a reply can't be split back up.
+        """
+        if len(texts) == 1:
+            return [await self.translate_one(texts[0], target, source)]
+        groups = pack_groups(texts)
+        if len(groups) > 1:
+            parts = await asyncio.gather(
+                *(self.translate_many([texts[i] for i in group], target, source) for group in groups),
+                return_exceptions=True)
+            errors = [p for p in parts if isinstance(p, BaseException)]
+            if len(errors) == len(parts):
+                raise errors[0]
+            results: List[str | None] = [None] * len(texts)
+            for group, part in zip(groups, parts):
+                if not isinstance(part, BaseException):
+                    for i, translation in zip(group, part):
+                        results[i] = translation
+            return results
+        try:
+            budget = max(400, sum(packed_tokens(t) for t in texts))
+            content = await self._complete(packed_prompt(texts, target), budget)
+        except (asyncio.CancelledError, RateLimited):
+            raise
+        except asyncio.TimeoutError:
+            raise RuntimeError("OpenAI translation timed out.")
+        except Exception as exc:
+            raise RuntimeError(f"OpenAI translation failed: {str(exc)}")
+        parsed = parse_json_array(content, len(texts))
+        if parsed is not None:
+            logger.info("translation_provider=openai status=ok target=%s batch=%d", target, len(texts))
+            return parsed
+        logger.warning("translation_provider=openai status=unparseable_batch target=%s batch=%d", target, len(texts))
+        results = await asyncio.gather(*(self.translate_one(t, target, source) for t in texts), return_exceptions=True)
+        return [r if isinstance(r, str) and r else None for r in results]
+
+    async def stream(self, text: str, target: str):
+        """Yield translation deltas as OpenAI streams them (needs the async SDK client).
+
+        Raises once the deltas are out if the stream didn't finish normally
+        (finish_reason "stop"), so callers discard the partial text.
+        """
+        prompt = translation_prompt(text, target)
+        max_tokens = completion_budget(text)
+        await self.limiter.acquire(len(prompt) // 4 + max_tokens)
+        try:
+            stream = await asyncio.wait_for(
+                self.sdk_client().chat.completions.create(
+                    model=self.model,
+                    messages=_messages(prompt),
+                    temperature=0.2,
+                    max_tokens=max_tokens,
+                    stream=True,
+                    timeout=deadline.budget(self.timeout),
+                ),
+                timeout=deadline.budget(self.timeout),
+            )
+        except Exception as exc:
+            self._throttle_on_429(exc)
+            raise
+        finish_reason = None
+        try:
+            async for chunk in stream:
+                if not chunk.choices:
+                    continue
+                if chunk.choices[0].delta.content:
+                    yield chunk.choices[0].delta.content
+                finish_reason = chunk.choices[0].finish_reason or finish_reason
+        finally:
+            await stream.response.aclose()
+        # cut off at max_tokens, filtered, or the connection just ended: what came so far is not a translation
+        if finish_reason != "stop":
+            raise RuntimeError(f"OpenAI stream ended with finish_reason={finish_reason}")
+
+    async def probe(self) -> bool:
+        client = self.sdk_client()
+        if client is None:
+            return bool(await self.translate_one("ok", "es"))
+        await asyncio.wait_for(client.models.list(), timeout=self.timeout)
+        return True
+
+    def stats(self) -> dict | None:
+        return {"batching": self.batcher.stats() if self.batcher is not None else None}
+
+
+@register_provider
+class LibreTranslateProvider(HTTPProvider):
+    """Fallback translation using LibreTranslate public instance for demo purposes."""
+
+    name = "libretranslate"
+    cost_hint = 0.0
+    latency_hint = 1.0
+
+    def __init__(self, base_url: str = "https://libretranslate.de", warm_up: bool = True):
+        super().__init__(base_url, warm_up)
+
+    async def translate(self, text: str, target: str, source: str = "auto") -> str | None:
+        try:
+            payload = {"q": text, "source": source, "target": target, "format": "text"}
+            r = await self._send("POST", "/translate", estimate_tokens(text), data=payload)
+            if r.status_code == 200:
+                data = r.json()
+                translation = data.get("translatedText") or data.get("translation")
+                logger.info("translation_provider=libretranslate status=ok target=%s", target)
+                return translation
+        except RateLimited:
+            raise
+        except Exception as exc:
+            logger.warning("translation_provider=libretranslate status=error target=%s error=%s", target, exc)
+            return None
+        logger.warning("translation_provider=libretranslate status=http_%s target=%s", r.status_code, target)
+        return None
+
+    async def translate_many(self, texts: List[str], target: str, source: str = "auto") -> List[str | None]:
+        """LibreTranslate accepts a list for `q` and answers with a list in the same order."""
+        try:
+            payload = {"q": texts, "source": source, "target": target, "format": "text"}
+            r = await self._send("POST", "/translate", estimate_tokens(*texts), json=payload)
+            if r.status_code == 200:
+                translated = r.json().get("translatedText")
+                if isinstance(translated, list) and len(translated) == len(texts):
+                    logger.info("translation_provider=libretranslate status=ok target=%s batch=%d", target, len(texts))
+                    return translated
+            logger.warning("translation_provider=libretranslate status=http_%s target=%s batch=%d", r.status_code, target, len(texts))
+        except RateLimited:
+            raise
+        except Exception as exc:
+            logger.warning("translation_provider=libretranslate status=error target=%s batch=%d error=%s", target, len(texts), exc)
+        return [None] * len(texts)
+
+    async def probe(self) -> bool:
+        r = await self.client.get("/languages")
+        return r.status_code == 200
+
+    async def list_languages(self) -> Set[str] | None:
+        r = await self.client.get("/languages")
+        r.raise_for_status()
+        return {lang["code"] for lang in r.json() if lang.get("code")}
@@ -0,0 +1,156 @@
+# backend/rate_limiter.py
+"""Client-side rate limiting toward each upstream provider (token buckets + bounded wait queue)."""
+
+import asyncio
+import logging
+import time
+from collections import deque
+from email.utils import parsedate_to_datetime
+from typing import List
+
+import deadline
+
+logger = logging.getLogger("healthassistant.ratelimit")
+
+
+class RateLimited(Exception):
+    """The provider can't take this call in time (queue full, or the wait exceeds the budget)."""
+
+
+class TokenBucket:
+    """Refills at `rate` per second up to `capacity`.
+
+    Callers reserve up front: the level may go negative, and the deficit
+    divided by the rate is how long the reservation has to wait. That makes
+    the queue FIFO without a lock.
+    """
+
+    def __init__(self, rate: float, capacity: float):
+        self.rate = rate
+        self.capacity = capacity
+        self.level = capacity
+        self.updated = time.monotonic()
+
+    def reserve(self, amount: float, now: float) -> float:
+        self.level = min(self.capacity, self.level + (now - self.updated) * self.rate)
+        self.updated = now
+        self.level -= min(amount, self.capacity)
+        return max(0.0, -self.level / self.rate)
+
+    def refund(self, amount: float):
+        self.level += min(amount, self.capacity)
+
+
+def estimate_tokens(*texts: str) -> int:
+    # ~4 characters per token, the answer about as long again, plus the instructions
+    return sum(len(t) for t in texts) // 2 + 60
+
+
+def retry_after_seconds(value: str | None, default: float = 1.0) -> float:
+    """Parse a Retry-After header (delta-seconds or HTTP date)."""
+    if not value:
+        return default
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return default
+
+
+class RateLimiter:
+    """Requests-per-second and tokens-per-minute budgets for one provider.
+
+    `acquire` returns once the call fits both budgets, sleeping in a bounded
+    queue to smooth bursts. A call that would wait longer than `max_wait`
+    (or than the request deadline has left), or that finds `max_queue`
+    callers already waiting, raises RateLimited so the chain moves on at once.
+    `throttle` honours an upstream Retry-After by holding every call until then.
+    A rate of 0 disables that budget.
+    """
+
+    def __init__(self, name: str, rps: float = 0.0, burst: float = 0.0, tpm: float = 0.0,
+                 max_queue: int = 100, max_wait: float = 2.0):
+        self.name = name
+        self.requests = TokenBucket(rps, burst or max(1.0, rps)) if rps > 0 else None
+        self.tokens = TokenBucket(tpm / 60.0, tpm) if tpm > 0 else None
+        self.max_queue = max_queue
+        self.max_wait = max_wait
+        self.blocked_until = 0.0
+        self.waiting = 0
+        self.peak_waiting = 0
+        self.admitted = 0
+        self.queued = 0
+        self.rejected = 0
+        self.throttled = 0
+        self._waits = deque(maxlen=500)
+
+    async def acquire(self, tokens: int = 0) -> float:
+        """Wait for room to make one call of about `tokens` tokens; returns seconds waited."""
+        now = time.monotonic()
+        if self.requests is None and self.tokens is None and self.blocked_until <= now:
+            self.admitted += 1
+            return 0.0
+        if self.waiting >= self.max_queue:
+            self.rejected += 1
+            raise RateLimited(f"{self.name}: {self.waiting} calls already queued")
+
+        wait = max(0.0, self.blocked_until - now)
+        reserved: List[tuple] = []
+        for bucket, amount in ((self.requests, 1), (self.tokens, tokens)):
+            if bucket is not None and amount:
+                wait = max(wait, bucket.reserve(amount, now))
+                reserved.append((bucket, amount))
+
+        limit = self.max_wait
+        left = deadline.remaining()
+        if left is not None:
+            limit = min(limit, left)
+        if wait > limit:
+            for bucket, amount in reserved:
+                bucket.refund(amount)
+            self.rejected += 1
+            raise RateLimited(f"{self.name}: would wait {wait:.2f}s")
+
+        if wait > 0:
+            self.queued += 1
+            self.waiting += 1
+            self.peak_waiting = max(self.peak_waiting, self.waiting)
+            try:
+                await asyncio.sleep(wait)
+            except asyncio.CancelledError:
+                for bucket, amount in reserved:
+                    bucket.refund(amount)
+                raise
+            finally:
+                self.waiting -= 1
+        self.admitted += 1
+        self._waits.append(wait)
+        return wait
+
+    def throttle(self, retry_after: float):
+        """The provider answered 429: hold every call for `retry_after` seconds."""
+        self.throttled += 1
+        self.blocked_until = max(self.blocked_until, time.monotonic() + retry_after)
+        logger.warning("rate_limit provider=%s status=throttled retry_after=%.2f", self.name, retry_after)
+
+    def stats(self) -> dict:
+        waits = sorted(self._waits)
+
+        def pct(p: float) -> float:
+            return round(waits[min(len(waits) - 1, int(len(waits) * p))] * 1000, 1) if waits else 0.0
+
+        return {
+            "rps": self.requests.rate if self.requests else None,
+            "tpm": self.tokens.capacity if self.tokens else None,
+            "queue_depth": self.waiting,
+            "peak_queue_depth": self.peak_waiting,
+            "admitted": self.admitted,
+            "queued": self.queued,
+            "rejected": self.rejected,
+            "throttled_429": self.throttled,
+            "blocked_for_s": round(max(0.0, self.blocked_until - time.monotonic()), 2),
+            "wait_ms": {"p50": pct(0.5), "p95": pct(0.95), "max": pct(1.0)},
+        }
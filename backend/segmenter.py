@@ -0,0 +1,105 @@
+# backend/segmenter.py
+"""Script-aware sentence segmentation for health messages."""
+
+import re
+from typing import List, Tuple
+
+# Sentence-final punctuation: Latin, Devanagari/Bengali danda and double danda
+# (Hindi, Bengali), Arabic question mark and full stop. Tamil and Telugu use
+# the Latin full stop.
+SENTENCE_END = ".!?।॥؟۔"
+
+# A terminator (plus closing quotes/brackets) followed by whitespace ends a sentence
+_BOUNDARY = re.compile(r"[%s]+[\"'”’)\]]*(\s+)" % re.escape(SENTENCE_END))
+
+# Abbreviations common in care instructions that end in a dot mid-sentence
+ABBREVIATIONS = {
+    "dr", "mr", "mrs", "ms", "st", "vs", "etc", "e.g", "i.e", "approx", "no", "tab", "tabs", "cap",
+    "caps", "inj", "hrs", "min", "max", "sr", "jr", "a.m", "p.m",
+}
+
+
+def _is_abbreviation(line: str, dot_index: int) -> bool:
+    start = dot_index
+    while start > 0 and (line[start - 1].isalpha() or line[start - 1] == "."):
+        start -= 1
+    word = line[start:dot_index].lower()
+    # single letters ("A. Kumar") and known abbreviations don't end a sentence
+    return len(word) == 1 or word in ABBREVIATIONS
+
+
+def split_sentences(text: str) -> List[Tuple[str, str]]:
+    """Split `text` into (sentence, trailing_whitespace) pairs.
+
+    Joining every sentence with its trailing whitespace gives back `text`
+    exactly, so translations can be reassembled with the original spacing
+    and line breaks. Newlines always end a segment.
+    """
+    segments: List[Tuple[str, str]] = []
+    for line in re.split(r"(?<=\n)", text):
+        if not line:
+            continue
+        start = 0
+        for m in _BOUNDARY.finditer(line):
+            end = m.start(1)
+            if line[m.start()] == "." and _is_abbreviation(line, m.start()):
+                continue
+            segments.append((line[start:end], m.group(1)))
+            start = m.end()
+        rest = line[start:]
+        stripped = rest.rstrip()
+        if stripped:
+            segments.append((stripped, rest[len(stripped):]))
+        elif segments:
+            sentence, trailing = segments[-1]
+            segments[-1] = (sentence, trailing + rest)
+        elif rest:
+            segments.append(("", rest))
+    # leading whitespace (indentation) belongs to the previous segment's tail
+    out: List[Tuple[str, str]] = []
+    for sentence, trailing in segments:
+        body = sentence.lstrip()
+        lead = sentence[:len(sentence) - len(body)]
+        if lead:
+            if out:
+                out[-1] = (out[-1][0], out[-1][1] + lead)
+            else:
+                out.append(("", lead))
+        out.append((body, trailing))
+    return [seg for seg in out if seg != ("", "")]
+
+
+def join_sentences(segments: List[Tuple[str, str]]) -> str:
+    return "".join(sentence + trailing for sentence, trailing in segments)
+
+
+def approx_tokens(text: str) -> int:
+    """Rough model-token count: ~4 ASCII characters per token, ~2 for other scripts."""
+    ascii_chars = sum(1 for c in text if c < "\x80")
+    return ascii_chars // 4 + (len(text) - ascii_chars) // 2 + 1
+
+
+def chunk_text(text: str, max_tokens: int) -> List[Tuple[str, str]]:
+    """Group sentences into (chunk, trailing_whitespace) pieces of about `max_tokens` each.
+
+    Chunks end at sentence boundaries, and at a paragraph break once they
+    are half full, so each one reads on its own. A single sentence longer
+    than the budget becomes its own chunk. Like split_sentences, joining
+    the pieces gives back `text` exactly.
+    """
+    chunks: List[List[Tuple[str, str]]] = []
+    current: List[Tuple[str, str]] = []
+    size = 0
+    for sentence, trailing in split_sentences(text):
+        cost = approx_tokens(sentence) if sentence else 0
+        if current and size + cost > max_tokens:
+            chunks.append(current)
+            current, size = [], 0
+        current.append((sentence, trailing))
+        size += cost
+        if "\n\n" in trailing and size >= max_tokens // 2:
+            chunks.append(current)
+            current, size = [], 0
+    if current:
+        chunks.append(current)
+    return [(join_sentences(c[:-1]) + c[-1][0], c[-1][1]) for c in chunks]
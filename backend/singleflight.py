@@ -0,0 +1,62 @@
+# backend/singleflight.py
+"""Coalesce identical concurrent upstream calls into one in-flight task."""
+
+import asyncio
+from typing import Any, Awaitable, Callable, Dict, Hashable
+
+import deadline
+
+
+class _Call:
+    __slots__ = ("task", "waiters")
+
+    def __init__(self, task: asyncio.Task):
+        self.task = task
+        self.waiters = 0
+
+
+def _consume_result(task: asyncio.Task):
+    if not task.cancelled():
+        task.exception()
+
+
+class SingleFlight:
+    """While a call for `key` is in flight, later callers await the same task.
+
+    Errors reach every waiter. A waiter that is cancelled only detaches
+    itself; the shared task is cancelled once nobody is waiting on it.
+    The task runs without a request deadline, so callers bound their own
+    wait (`deadline.bounded`) rather than the first caller's budget
+    deciding for everyone.
+    """
+
+    def __init__(self):
+        self._calls: Dict[Hashable, _Call] = {}
+        self.executed = 0
+        self.coalesced = 0
+
+    async def do(self, key: Hashable, fn: Callable[[], Awaitable[Any]]) -> Any:
+        call = self._calls.get(key)
+        if call is None:
+            task = deadline.detached(fn())
+            task.add_done_callback(_consume_result)
+            call = self._calls[key] = _Call(task)
+            task.add_done_callback(lambda _t: self._forget(key, call))
+            self.executed += 1
+        else:
+            self.coalesced += 1
+        call.waiters += 1
+        try:
+            return await asyncio.shield(call.task)
+        finally:
+            call.waiters -= 1
+            if call.waiters == 0 and not call.task.done():
+                call.task.cancel()
+                self._forget(key, call)
+
+    def _forget(self, key: Hashable, call: _Call):
+        if self._calls.get(key) is call:
+            del self._calls[key]
+
+    def stats(self) -> dict:
+        return {"in_flight": len(self._calls), "executed": self.executed, "calls_saved": self.coalesced}
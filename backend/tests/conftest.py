@@ -0,0 +1,79 @@
+# backend/tests/conftest.py
+"""Shared fixtures: the provider stub and a live app server talking to it.
+
+The environment is set before anything imports app, so every test run
+uses scratch databases and only the stubbed OpenAI provider.
+"""
+
+import os
+import shutil
+import socket
+import sys
+import tempfile
+import threading
+import time
+
+import pytest
+
+BACKEND = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND)
+
+
+def _free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+STUB_PORT = _free_port()
+SCRATCH = tempfile.mkdtemp(prefix="healthassistant-tests-")
+os.environ.update({
+    "DB_PATH": os.path.join(SCRATCH, "reminders.db"),
+    "TTS_CACHE_DIR": os.path.join(SCRATCH, "tts_cache"),
+    "PHRASEBOOK_PATH": os.path.join(SCRATCH, "phrasebook.pack"),
+    "PROVIDER_CHAIN": "openai",
+    "OPENAI_API_KEY": "test",
+    "OPENAI_BASE_URL": f"http://127.0.0.1:{STUB_PORT}/v1",
+    "OPENAI_STREAMING": "0",
+    "HTTP_WARMUP": "0",
+    "LANGUAGE_REFRESH_SECONDS": "0",
+    "PHRASEBOOK_CHECK_SECONDS": "0",
+    "BREAKER_PROBE_INTERVAL": "3600",
+})
+
+
+def pytest_sessionfinish(session, exitstatus):
+    shutil.rmtree(SCRATCH, ignore_errors=True)
+
+
+@pytest.fixture(scope="session")
+def stub():
+    from benchmarks.stub_server import STUB_LATENCY, start_stub
+
+    server = start_stub(STUB_PORT)
+    yield STUB_LATENCY
+    server.should_exit = True
+
+
+@pytest.fixture
+def stub_latency(stub):
+    """STUB_LATENCY, put back to zero after the test."""
+    yield stub
+    stub["seconds"] = 0.0
+    stub["per_char"] = 0.0
+
+
+@pytest.fixture(scope="session")
+def app_url(stub):
+    """Base URL of the app served by uvicorn on its own thread and event loop."""
+    import uvicorn
+
+    import app
+
+    port = _free_port()
+    server = uvicorn.Server(uvicorn.Config(app.app, host="127.0.0.1", port=port, log_level="warning"))
+    threading.Thread(target=server.run, daemon=True).start()
+    while not server.started:
+        time.sleep(0.01)
+    yield f"http://127.0.0.1:{port}"
+    server.should_exit = True
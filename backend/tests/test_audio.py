@@ -0,0 +1,110 @@
+# backend/tests/test_audio.py
+import asyncio
+import os
+import time
+import wave
+
+import pytest
+
+import app
+from audio_cache import AudioCache
+from tts_service import TTSService
+
+
+class WavEngine:
+    """pyttsx3-shaped engine that takes `seconds` to write a short WAV."""
+
+    seconds = 0.1
+
+    def __init__(self):
+        self._pending = []
+
+    def setProperty(self, name, value):
+        pass
+
+    def say(self, text):
+        self._pending.append((text, None))
+
+    def save_to_file(self, text, path):
+        self._pending.append((text, path))
+
+    def runAndWait(self):
+        pending, self._pending = self._pending, []
+        for text, path in pending:
+            time.sleep(self.seconds)
+            if path:
+                with wave.open(path, "wb") as w:
+                    w.setnchannels(1)
+                    w.setsampwidth(2)
+                    w.setframerate(16000)
+                    w.writeframes(b"\0\0" * 1600)
+
+
+def _temp_files(directory):
+    return [name for name in os.listdir(directory) if name.startswith(".")]
+
+
+@pytest.fixture
+def tts(monkeypatch, tmp_path):
+    service = TTSService(WavEngine, workers=1)
+    service.start()
+    cache = AudioCache(str(tmp_path))
+    monkeypatch.setattr(app, "tts_service", service)
+    monkeypatch.setattr(app, "audio_cache", cache)
+    yield service, cache
+    service.stop()
+
+
+def test_temp_paths_are_unique_and_stale_ones_are_swept(tmp_path):
+    cache = AudioCache(str(tmp_path))
+    assert cache.temp_path("k") != cache.temp_path("k")
+    stale, fresh = cache.temp_path("a"), cache.temp_path("b")
+    for path in (stale, fresh):
+        with open(path, "wb") as fh:
+            fh.write(b"RIFF")
+    os.utime(stale, (time.time() - 7200, time.time() - 7200))
+
+    AudioCache(str(tmp_path))
+    assert _temp_files(tmp_path) == [os.path.basename(fresh)]
+
+
+def test_cancelled_render_still_lands_in_the_cache(tts):
+    service, cache = tts
+
+    async def scenario():
+        render = asyncio.ensure_future(app._render_to_cache("k1", "take your tablet", "en", "normal"))
+        await asyncio.sleep(0.02)
+        render.cancel()  # the only listener hung up while the engine was busy
+        for _ in range(100):
+            if cache.get("k1"):
+                break
+            await asyncio.sleep(0.02)
+        return render.cancelled()
+
+    assert asyncio.run(scenario())
+    assert cache.get("k1") is not None
+    assert _temp_files(cache.directory) == []
+
+
+def test_disconnected_stream_withdraws_its_queued_renders(tts, monkeypatch):
+    service, cache = tts
+    monkeypatch.setattr(app, "TTS_AVAILABLE", True)
+    monkeypatch.setattr(app, "TTS_STREAM_AHEAD", 4)
+    text = "First sentence here. Second one follows. Third is queued. Fourth is queued too."
+
+    async def scenario():
+        response = await app.speak_stream(app.SpeakRequest(text=text, target_lang="en"))
+        chunks = response.body_iterator
+        first = await chunks.__anext__()
+        await chunks.aclose()  # the listener hangs up after the first sentence
+        while service.busy or service.queue_depth():
+            await asyncio.sleep(0.02)
+        await asyncio.sleep(0.05)
+        return first
+
+    assert asyncio.run(scenario()).startswith(b"RIFF")
+    stats = service.stats()
+    # sentence 1 was played, sentence 2 was already rendering; 3 and 4 never reach the engine
+    assert stats["cancelled"] == 2
+    assert stats["done"] == 2
+    assert _temp_files(cache.directory) == []
@@ -0,0 +1,119 @@
+# backend/tests/test_circuit_breaker.py
+import asyncio
+
+import pytest
+
+import circuit_breaker
+from circuit_breaker import CLOSED, HALF_OPEN, OPEN, BreakerOpen, CircuitBreaker
+from rate_limiter import RateLimited
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def monotonic(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(circuit_breaker.time, "monotonic", clock.monotonic)
+    return clock
+
+
+def test_opens_at_the_failure_rate_then_half_opens_and_closes(clock):
+    breaker = CircuitBreaker("openai", window=10, min_calls=4, failure_rate=0.5, open_seconds=30)
+    breaker.record_success()
+    breaker.record_failure()
+    breaker.record_failure()
+    assert breaker.state == CLOSED  # only 3 calls so far
+    breaker.record_failure()
+    assert breaker.state == OPEN
+    assert not breaker.allow()
+
+    clock.now += 30
+    assert breaker.allow()
+    assert breaker.state == HALF_OPEN
+    assert not breaker.allow()  # one trial at a time
+    breaker.record_success()
+    assert breaker.state == CLOSED
+    assert breaker.snapshot() == {"state": CLOSED, "failure_rate": 0.0, "calls": 0}
+
+
+def test_failed_trial_reopens(clock):
+    breaker = CircuitBreaker("groq", min_calls=1, failure_rate=0.5, open_seconds=10)
+    breaker.record_failure()
+    assert breaker.state == OPEN
+    clock.now += 10
+    assert breaker.allow()
+    breaker.record_failure()
+    assert breaker.state == OPEN
+    assert not breaker.allow()
+    assert breaker.snapshot()["retry_in_s"] == 10.0
+
+
+def test_unreported_trial_expires(clock):
+    breaker = CircuitBreaker("lingo", min_calls=1, open_seconds=5)
+    breaker.record_failure()
+    clock.now += 5
+    assert breaker.allow()
+    clock.now += 5
+    assert breaker.allow()
+
+
+def test_wrap_counts_errors_and_empty_answers_but_not_cancellation_or_rate_limits():
+    breaker = CircuitBreaker("libretranslate", window=10, min_calls=100)
+
+    def returning(value=None, exc=None):
+        async def call(text, target):
+            if exc is not None:
+                raise exc
+            return value
+        return breaker.wrap(call)
+
+    async def scenario():
+        assert await returning("hola")("hello", "es") == "hola"
+        assert await returning(None)("hello", "es") is None
+        for exc in (RuntimeError("500"), RateLimited("busy"), asyncio.CancelledError()):
+            with pytest.raises(type(exc)):
+                await returning(exc=exc)("hello", "es")
+
+    asyncio.run(scenario())
+    assert breaker.snapshot()["calls"] == 3
+    assert breaker.current_failure_rate() == pytest.approx(2 / 3)
+
+
+def test_half_open_trial_is_only_taken_by_a_call_that_is_made(clock):
+    breaker = CircuitBreaker("openai", min_calls=1, open_seconds=30)
+    calls = []
+
+    async def answer(text, target):
+        calls.append(text)
+        return "hola"
+
+    guarded = breaker.wrap(answer)
+    breaker.record_failure()
+    assert breaker.state == OPEN
+    assert not breaker.available()
+    clock.now += 30
+    # building a chain only looks; it doesn't use up the trial
+    assert breaker.available() and breaker.available()
+    assert breaker.state == OPEN
+
+    assert asyncio.run(guarded("hello", "es")) == "hola"
+    assert breaker.state == CLOSED
+    assert calls == ["hello"]
+
+
+def test_wrapped_call_is_refused_while_open(clock):
+    breaker = CircuitBreaker("groq", min_calls=1, open_seconds=30)
+    breaker.record_failure()
+
+    async def answer(text, target):
+        raise AssertionError("must not be called")
+
+    with pytest.raises(BreakerOpen):
+        asyncio.run(breaker.wrap(answer)("hello", "es"))
+    assert breaker.state == OPEN
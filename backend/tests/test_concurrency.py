@@ -0,0 +1,36 @@
+# backend/tests/test_concurrency.py
+"""Slow upstream calls must not hold up the rest of the API."""
+
+import asyncio
+import time
+import uuid
+
+import httpx
+
+
+def test_health_and_emergency_answer_while_openai_calls_are_in_flight(app_url, stub_latency):
+    stub_latency["seconds"] = 2.0
+
+    async def scenario():
+        async with httpx.AsyncClient(base_url=app_url, timeout=30.0) as client:
+            translations = [
+                asyncio.ensure_future(client.post("/translate", json={
+                    "text": f"Take your tablet after food {uuid.uuid4().hex}", "target_lang": "es"}))
+                for _ in range(5)
+            ]
+            await asyncio.sleep(0.3)  # the OpenAI calls are now waiting on the stub
+
+            t0 = time.perf_counter()
+            health = await client.get("/health")
+            alert = await client.post("/emergency-alert", json={"message": "help", "caregiver_contact": "x"})
+            elapsed = time.perf_counter() - t0
+            pending = sum(not t.done() for t in translations)
+
+            results = await asyncio.gather(*translations)
+            return health, alert, elapsed, pending, results
+
+    health, alert, elapsed, pending, results = asyncio.run(scenario())
+    assert health.status_code == 200 and alert.status_code == 200
+    assert pending == 5
+    assert elapsed < 0.5
+    assert all(r.json()["provider"] == "openai" for r in results)
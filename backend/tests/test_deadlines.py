@@ -0,0 +1,77 @@
+# backend/tests/test_deadlines.py
+"""Work shared between requests must not run on one request's deadline."""
+
+import asyncio
+import uuid
+
+import httpx
+
+import deadline
+from openai_batcher import MicroBatcher
+from singleflight import SingleFlight
+
+
+async def _caller(seconds, call):
+    deadline.start(seconds)
+    try:
+        return await deadline.bounded(call())
+    except deadline.DeadlineExceeded:
+        return "timed out"
+
+
+def test_singleflight_task_outlives_the_caller_that_started_it():
+    seen = []
+
+    async def fetch():
+        seen.append(deadline.remaining())
+        await asyncio.sleep(0.2)
+        return "hola"
+
+    async def scenario():
+        flight = SingleFlight()
+        short = asyncio.ensure_future(_caller(0.05, lambda: flight.do("k", fetch)))
+        await asyncio.sleep(0)
+        long = asyncio.ensure_future(_caller(10, lambda: flight.do("k", fetch)))
+        return await asyncio.gather(short, long)
+
+    assert asyncio.run(scenario()) == ["timed out", "hola"]
+    assert seen == [None]
+
+
+def test_micro_batch_outlives_the_caller_that_started_it():
+    seen = []
+
+    async def translate_many(texts, target):
+        seen.append(deadline.remaining())
+        await asyncio.sleep(0.2)
+        return [f"[{target}] {t}" for t in texts]
+
+    async def scenario():
+        batcher = MicroBatcher(translate_many, window=0.02)
+        short = asyncio.ensure_future(_caller(0.05, lambda: batcher.submit("one", "es")))
+        long = asyncio.ensure_future(_caller(10, lambda: batcher.submit("two", "es")))
+        return await asyncio.gather(short, long), batcher.stats()
+
+    results, stats = asyncio.run(scenario())
+    assert results == ["timed out", "[es] two"]
+    assert seen == [None]
+    assert stats["batches"] == 1
+
+
+def test_short_and_long_requests_coalesced_upstream(app_url, stub_latency):
+    stub_latency["seconds"] = 1.0
+    same = f"Take the blue tablet {uuid.uuid4().hex}"
+
+    async def scenario():
+        async with httpx.AsyncClient(base_url=app_url, timeout=30.0) as client:
+            def post(text, seconds):
+                return client.post("/translate", json={"text": text, "target_lang": "es"},
+                                   headers={"X-Request-Timeout": str(seconds)})
+            # same text (single-flight) and a different text in the same micro-batch
+            return await asyncio.gather(post(same, 0.5), post(same, 10),
+                                        post(f"Drink water {uuid.uuid4().hex}", 10))
+
+    short, coalesced, batched = (r.json() for r in asyncio.run(scenario()))
+    assert short["provider"] == "demo"
+    assert coalesced["provider"] == "openai"
+    assert batched["provider"] == "openai"
@@ -0,0 +1,31 @@
+# backend/tests/test_langid.py
+import pytest
+
+from langid import detect
+
+
+@pytest.mark.parametrize("text, lang", [
+    ("अपनी दवा खाना खाने के बाद लें। रोज़ खूब पानी पिएं।", "hi"),
+    ("तुम्ही कसे आहात? औषध घ्या.", "mr"),
+    ("तपाईं कस्तो हुनुहुन्छ? औषधि खानुहोस्।", "ne"),
+    ("আমার দাদীর মাথাব্যথা আর জ্বর হয়েছে।", "bn"),
+    ("মোৰ আইতাৰ মূৰৰ বিষ আৰু জ্বৰ হৈছে।", "as"),
+    ("تناول دوائك بعد الأكل", "ar"),
+    ("Please remember to take your pills tonight.", "en"),
+    ("Mi abuela tiene dolor de cabeza y fiebre.", "es"),
+    ("N'oubliez pas de prendre vos pilules ce soir.", "fr"),
+    ("Ich muss meine Medikamente nach dem Essen nehmen", "de"),
+])
+def test_detects_language(text, lang):
+    assert detect(text).lang == lang
+
+
+@pytest.mark.parametrize("text", [
+    "Ik moet mijn medicijnen innemen na het eten",  # Dutch: not one of ours
+    "Bunica mea are dureri de cap și febră.",
+    "Nenek saya sakit kepala dan demam.",
+    "अपनी दवा लें",  # too short to tell Hindi from Marathi or Nepali
+    "Take 2 tabs",
+])
+def test_unknown_or_out_of_set_text_is_not_guessed(text):
+    assert detect(text).lang is None
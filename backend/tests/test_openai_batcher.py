@@ -0,0 +1,84 @@
+# backend/tests/test_openai_batcher.py
+import asyncio
+import json
+
+from openai_batcher import MicroBatcher
+from providers import COMPLETION_MAX_TOKENS, OpenAIProvider, pack_groups, packed_tokens
+
+
+def _echo_batches(batches):
+    async def translate_many(texts, target):
+        batches.append(list(texts))
+        return [f"[{target}] {t}" for t in texts]
+    return translate_many
+
+
+def test_group_is_flushed_by_count():
+    batches = []
+
+    async def scenario():
+        batcher = MicroBatcher(_echo_batches(batches), window=0.5, max_batch=3)
+        return await asyncio.gather(*(batcher.submit(f"text {i}", "es") for i in range(3)))
+
+    assert asyncio.run(scenario()) == ["[es] text 0", "[es] text 1", "[es] text 2"]
+    assert batches == [["text 0", "text 1", "text 2"]]
+
+
+def test_group_is_flushed_before_its_tokens_overflow():
+    batches = []
+
+    async def scenario():
+        batcher = MicroBatcher(_echo_batches(batches), window=0.5, max_batch=20, max_tokens=100,
+                               token_cost=len)
+        texts = ["a" * 40, "b" * 40, "c" * 40, "d" * 60, "e" * 10]
+        results = await asyncio.wait_for(asyncio.gather(*(batcher.submit(t, "es") for t in texts)), 2.0)
+        return texts, results
+
+    texts, results = asyncio.run(scenario())
+    assert results == [f"[es] {t}" for t in texts]
+    # 40+40 fits, +40 would not; 40+60 reaches the limit and goes at once; 10 waits for the window
+    assert [[t[0] for t in batch] for batch in batches] == [["a", "b"], ["c", "d"], ["e"]]
+
+
+def test_pack_groups_fit_the_completion_budget():
+    texts = ["Take one tablet after breakfast with water. " * 20] * 12
+    groups = pack_groups(texts)
+    assert len(groups) > 1
+    assert sorted(i for g in groups for i in g) == list(range(len(texts)))
+    assert all(sum(packed_tokens(texts[i]) for i in g) <= COMPLETION_MAX_TOKENS for g in groups)
+
+
+def test_packed_call_budget_covers_the_estimate():
+    provider = OpenAIProvider(api_key="test", batch_window=0, warm_up=False)
+    calls = []
+
+    async def complete(prompt, max_tokens):
+        texts = json.loads(prompt[prompt.index("["):])
+        calls.append((len(texts), max_tokens, sum(packed_tokens(t) for t in texts)))
+        return json.dumps([f"[hi] {t}" for t in texts])
+
+    provider._complete = complete
+    texts = [(f"Sentence {i} about the evening dose, taken with food. " * 12).strip() for i in range(10)]
+    results = asyncio.run(provider.translate_many(texts, "hi"))
+    assert results == [f"[hi] {t}" for t in texts]
+    assert len(calls) > 1
+    assert all(max_tokens >= estimate and max_tokens <= COMPLETION_MAX_TOKENS for _, max_tokens, estimate in calls)
+
+
+def test_document_chunks_skip_the_batcher():
+    provider = OpenAIProvider(api_key="test", batch_window=0.02, batch_text_tokens=50, warm_up=False)
+    prompts = []
+
+    async def complete(prompt, max_tokens):
+        prompts.append(prompt)
+        return "[hi] translated"
+
+    provider._complete = complete
+    chunks = [f"Chunk {i}: " + "Take one tablet after breakfast with water. " * 10 for i in range(4)]
+
+    async def scenario():
+        return await asyncio.gather(*(provider.translate(c, "hi") for c in chunks))
+
+    assert asyncio.run(scenario()) == ["[hi] translated"] * 4
+    assert len(prompts) == 4  # one completion per chunk, not one packed call
+    assert provider.batcher.stats()["batches"] == 0
@@ -0,0 +1,71 @@
+# backend/tests/test_provider_chain.py
+import asyncio
+
+from provider_chain import HedgedChain, LatencyTracker
+
+
+def _provider(name, seconds, result, log):
+    async def call(text, target):
+        log.append(("start", name))
+        try:
+            await asyncio.sleep(seconds)
+        except asyncio.CancelledError:
+            log.append(("cancelled", name))
+            raise
+        return result
+    return name, call
+
+
+def test_slow_provider_is_hedged_and_the_loser_cancelled():
+    log = []
+    chain = HedgedChain(LatencyTracker(), default_delay=0.05)
+    providers = [_provider("slow", 1.0, "lento", log), _provider("fast", 0.01, "rapido", log)]
+
+    async def scenario():
+        result = await chain.run(providers, "slow", "es")
+        await asyncio.sleep(0)
+        return result
+
+    assert asyncio.run(scenario()) == ("rapido", "fast")
+    assert log == [("start", "slow"), ("start", "fast"), ("cancelled", "slow")]
+
+
+def test_failed_provider_hands_over_without_waiting_for_the_hedge():
+    log = []
+
+    async def broken(text, target):
+        raise RuntimeError("500")
+
+    chain = HedgedChain(LatencyTracker(), default_delay=5.0)
+    providers = [("broken", broken), _provider("backup", 0.0, "hola", log)]
+
+    async def scenario():
+        loop = asyncio.get_running_loop()
+        t0 = loop.time()
+        result = await chain.run(providers, "hello", "es")
+        return result, loop.time() - t0
+
+    result, elapsed = asyncio.run(scenario())
+    assert result == ("hola", "backup")
+    assert elapsed < 1.0
+
+
+def test_no_answer_from_any_provider_returns_none():
+    log = []
+    chain = HedgedChain(LatencyTracker(), enabled=False)
+    providers = [_provider("a", 0.0, None, log), _provider("b", 0.0, "", log)]
+    assert asyncio.run(chain.run(providers, "hello", "es")) is None
+    assert [name for _, name in log] == ["a", "b"]
+
+
+def test_hedge_delay_follows_observed_latency_within_bounds():
+    tracker = LatencyTracker(min_samples=3)
+    chain = HedgedChain(tracker, default_delay=1.5, percentile=95, min_delay=0.2, max_delay=5.0)
+    assert chain.hedge_delay("openai") == 1.5
+    for seconds in (0.4, 0.5, 0.6):
+        tracker.record("openai", seconds)
+    assert chain.hedge_delay("openai") == 0.6
+    for _ in range(3):
+        tracker.record("groq", 0.01)
+    assert chain.hedge_delay("groq") == 0.2
+    assert HedgedChain(tracker, enabled=False).hedge_delay("openai") is None
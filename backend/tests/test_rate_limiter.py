@@ -0,0 +1,85 @@
+# backend/tests/test_rate_limiter.py
+import asyncio
+import time
+
+import pytest
+
+import deadline
+from rate_limiter import RateLimited, RateLimiter, TokenBucket, retry_after_seconds
+
+
+def test_burst_is_admitted_then_calls_queue_at_the_rate():
+    limiter = RateLimiter("openai", rps=20, burst=2, max_wait=1.0)
+
+    async def scenario():
+        return [await limiter.acquire() for _ in range(4)]
+
+    t0 = time.monotonic()
+    waits = asyncio.run(scenario())
+    elapsed = time.monotonic() - t0
+    assert waits[:2] == [0.0, 0.0]
+    assert all(w > 0 for w in waits[2:])
+    assert 0.08 <= elapsed < 0.5
+    assert limiter.stats()["admitted"] == 4
+    assert limiter.stats()["queued"] == 2
+
+
+def test_wait_beyond_max_wait_or_the_deadline_is_rejected_and_refunded():
+    limiter = RateLimiter("groq", rps=1, burst=1, max_wait=0.5)
+
+    async def scenario():
+        await limiter.acquire()
+        with pytest.raises(RateLimited):
+            await limiter.acquire()
+        level = limiter.requests.level
+        deadline.start(0.1)
+        with pytest.raises(RateLimited):
+            await limiter.acquire()
+        return level
+
+    level = asyncio.run(scenario())
+    assert limiter.requests.level == pytest.approx(level, abs=0.05)
+    assert limiter.stats()["rejected"] == 2
+
+
+def test_full_queue_is_rejected():
+    limiter = RateLimiter("lingo", rps=10, burst=1, max_queue=1, max_wait=1.0)
+
+    async def scenario():
+        await limiter.acquire()
+        waiting = asyncio.ensure_future(limiter.acquire())
+        await asyncio.sleep(0)
+        with pytest.raises(RateLimited):
+            await limiter.acquire()
+        await waiting
+
+    asyncio.run(scenario())
+    assert limiter.stats()["peak_queue_depth"] == 1
+
+
+def test_throttle_holds_calls_until_retry_after():
+    limiter = RateLimiter("openai", max_wait=1.0)
+
+    async def scenario():
+        assert await limiter.acquire() == 0.0
+        limiter.throttle(0.1)
+        return await limiter.acquire()
+
+    assert asyncio.run(scenario()) == pytest.approx(0.1, abs=0.02)
+    assert limiter.stats()["throttled_429"] == 1
+
+
+def test_token_bucket_reserves_ahead_and_refunds():
+    bucket = TokenBucket(rate=10, capacity=5)
+    now = bucket.updated
+    assert bucket.reserve(5, now) == 0.0
+    assert bucket.reserve(2, now) == pytest.approx(0.2)
+    bucket.refund(2)
+    assert bucket.reserve(1, now + 0.2) == 0.0
+
+
+def test_retry_after_parsing():
+    assert retry_after_seconds("2.5") == 2.5
+    assert retry_after_seconds(None, default=3.0) == 3.0
+    assert retry_after_seconds("soon", default=1.0) == 1.0
+    assert retry_after_seconds("Wed, 21 Oct 2015 07:28:00 GMT") == 0.0
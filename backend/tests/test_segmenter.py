@@ -0,0 +1,40 @@
+# backend/tests/test_segmenter.py
+import pytest
+
+from segmenter import approx_tokens, chunk_text, join_sentences, split_sentences
+
+SAMPLES = [
+    "Take one tablet after breakfast. Drink water! Any pain?",
+    "Dr. Rao said take 2 tabs. daily, e.g. after food.  Call at 9 a.m. tomorrow.",
+    "  Indented first line.\nSecond line without a stop\n\n\nThird paragraph.   ",
+    "दवा खाना खाने के बाद लें। पानी पिएं॥ ठीक है?",
+    "ওষুধ খাবার পরে খান। জল পান করুন।",
+    "هل تناولت الدواء؟ اشرب الماء.",
+    "He said \"stop now.\" Then (after lunch.) rest.",
+    "",
+    "   ",
+    "No terminator at all",
+]
+
+
+@pytest.mark.parametrize("text", SAMPLES)
+def test_split_sentences_round_trips(text):
+    segments = split_sentences(text)
+    assert "".join(s + t for s, t in segments) == text
+    assert join_sentences(segments) == text
+
+
+def test_split_sentences_boundaries():
+    assert [s for s, _ in split_sentences(SAMPLES[0])] == ["Take one tablet after breakfast.", "Drink water!", "Any pain?"]
+    assert [s for s, _ in split_sentences(SAMPLES[1])] == [
+        "Dr. Rao said take 2 tabs. daily, e.g. after food.", "Call at 9 a.m. tomorrow."]
+    assert [s for s, _ in split_sentences(SAMPLES[3])] == ["दवा खाना खाने के बाद लें।", "पानी पिएं॥", "ठीक है?"]
+    assert [s for s, _ in split_sentences(SAMPLES[5])] == ["هل تناولت الدواء؟", "اشرب الماء."]
+
+
+def test_chunk_text_respects_the_budget_and_round_trips():
+    text = " ".join(f"Sentence number {i} about the evening dose." for i in range(40))
+    chunks = chunk_text(text, max_tokens=60)
+    assert len(chunks) > 1
+    assert "".join(c + t for c, t in chunks) == text
+    assert all(approx_tokens(c) <= 60 for c, _ in chunks)
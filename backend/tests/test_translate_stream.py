@@ -0,0 +1,93 @@
+# backend/tests/test_translate_stream.py
+import asyncio
+import json
+import uuid
+from types import SimpleNamespace
+
+import httpx
+import pytest
+
+import app
+from providers import OpenAIProvider
+
+
+def _events(body: str):
+    for block in body.strip().split("\n\n"):
+        lines = dict(line.split(": ", 1) for line in block.splitlines())
+        yield lines["event"], json.loads(lines["data"])
+
+
+@pytest.fixture
+def streaming_openai(monkeypatch):
+    monkeypatch.setattr(app.providers["openai"], "supports_streaming", True)
+    return app.providers["openai"]
+
+
+def test_streamed_sentence_is_translated_and_cached(app_url, stub, streaming_openai):
+    text = f"Take your tablet {uuid.uuid4().hex}."
+    r = httpx.post(f"{app_url}/translate/stream", json={"text": text, "target_lang": "es"}, timeout=10.0)
+    events = list(_events(r.text))
+    assert [e for e, _ in events].count("delta") > 1
+    done = events[-1][1]
+    assert done["success"] and done["provider"] == "openai"
+    assert app.translation_cache.get(text, "es", app.PROVIDER_CHAIN)[0] == done["translated_text"]
+
+
+def test_stream_that_breaks_off_falls_back_and_is_not_cached(app_url, stub, streaming_openai, monkeypatch):
+    async def broken_stream(text, target):
+        yield "Tome su"
+        raise RuntimeError("connection reset")
+
+    monkeypatch.setattr(streaming_openai, "stream", broken_stream)
+    text = f"Take your tablet {uuid.uuid4().hex}."
+    failures = app.breakers["openai"].snapshot()["failure_rate"]
+
+    r = httpx.post(f"{app_url}/translate/stream", json={"text": text, "target_lang": "es"}, timeout=10.0)
+    events = dict((e, d) for e, d in _events(r.text))
+    assert events["segment"]["translated_text"] != "Tome su"
+    assert events["done"]["translated_text"].startswith("[stub]")
+    assert app.breakers["openai"].snapshot()["failure_rate"] > failures
+
+    again = httpx.post(f"{app_url}/translate", json={"text": text, "target_lang": "es"}, timeout=10.0).json()
+    assert again["translated_text"] != "Tome su"
+
+
+def _chunk(content, finish_reason=None):
+    return SimpleNamespace(choices=[SimpleNamespace(delta=SimpleNamespace(content=content),
+                                                    finish_reason=finish_reason)])
+
+
+class _FakeStream:
+    def __init__(self, chunks):
+        self._chunks = chunks
+        self.response = SimpleNamespace(aclose=self._aclose)
+
+    async def _aclose(self):
+        pass
+
+    def __aiter__(self):
+        return self._gen()
+
+    async def _gen(self):
+        for chunk in self._chunks:
+            yield chunk
+
+
+@pytest.mark.parametrize("finish_reason", ["length", None])
+def test_openai_stream_that_did_not_stop_raises(finish_reason):
+    provider = OpenAIProvider(api_key="test", batch_window=0, warm_up=False)
+    chunks = [_chunk("Tome"), _chunk(" su", finish_reason)]
+
+    async def create(**kwargs):
+        return _FakeStream(chunks)
+
+    provider._sdk_client = SimpleNamespace(chat=SimpleNamespace(completions=SimpleNamespace(create=create)))
+
+    async def scenario():
+        received = []
+        with pytest.raises(RuntimeError):
+            async for delta in provider.stream("Take your", "es"):
+                received.append(delta)
+        return received
+
+    assert asyncio.run(scenario()) == ["Tome", " su"]
@@ -0,0 +1,103 @@
+# backend/tests/test_translation_jobs.py
+import asyncio
+import threading
+import time
+
+import httpx
+
+from translation_jobs import JobRunner
+
+
+def test_submitted_job_wakes_a_worker_straight_away(app_url, stub):
+    text = " ".join(f"Sentence {i} about the evening dose." for i in range(30))
+    with httpx.Client(base_url=app_url, timeout=10.0) as client:
+        # let the idle workers settle into their poll wait first
+        time.sleep(0.2)
+        t0 = time.perf_counter()
+        created = client.post("/translate/jobs", json={"text": text, "target_lang": "es"})
+        assert created.status_code == 202
+        while True:
+            job = client.get(created.json()["result_url"]).json()
+            if job["status"] in ("completed", "failed") or time.perf_counter() - t0 > 5:
+                break
+            time.sleep(0.02)
+    assert job["status"] == "completed"
+    assert job["provider"] == "openai"
+    # the workers poll every second; being woken by submit() is much faster
+    assert time.perf_counter() - t0 < 0.8
+
+
+
+class _EmptyStore:
+    def __init__(self):
+        self.claimed = threading.Event()
+
+    def unassembled(self):
+        return []
+
+    def claim(self, lease_seconds):
+        self.claimed.set()
+        return None
+
+
+def test_submit_from_another_thread_wakes_the_worker():
+    async def scenario():
+        loop = asyncio.get_running_loop()
+        store = _EmptyStore()
+        runner = JobRunner(store, None, None, workers=1, poll_seconds=5.0)
+        runner.start()
+        await asyncio.sleep(0.05)  # the worker is now waiting for a wakeup
+        store.claimed.clear()
+        t0 = loop.time()
+        # by the time the timer fires the loop is idle in select(), so only a
+        # thread-safe wakeup gets the worker going
+        threading.Timer(0.1, runner.submit).start()
+        woken = await loop.run_in_executor(None, store.claimed.wait, 2.0)
+        elapsed = loop.time() - t0
+        await runner.stop()
+        return woken, elapsed
+
+    woken, elapsed = asyncio.run(scenario())
+    assert woken
+    assert elapsed < 0.5
+
+
+class _LockedStore:
+    """A store whose database is locked by another process for `seconds` on every claim."""
+
+    def __init__(self, seconds):
+        self.seconds = seconds
+        self.released = []
+
+    def unassembled(self):
+        return []
+
+    def claim(self, lease_seconds):
+        time.sleep(self.seconds)
+        return {"job_id": "j", "idx": 0, "text": "hello", "attempts": 1}
+
+    def release(self, job_id, idx, retry_in):
+        self.released.append((job_id, idx, retry_in))
+
+    def get(self, job_id):
+        time.sleep(self.seconds)
+        return None
+
+
+def test_a_locked_database_does_not_stall_the_event_loop():
+    async def scenario():
+        loop = asyncio.get_running_loop()
+        store = _LockedStore(0.3)
+        runner = JobRunner(store, None, None, workers=2)
+        runner.start()
+        worst, last = 0.0, loop.time()
+        for _ in range(40):
+            await asyncio.sleep(0.01)
+            worst, last = max(worst, loop.time() - last), loop.time()
+        await runner.stop()
+        return worst, store.released
+
+    worst, released = asyncio.run(scenario())
+    assert worst < 0.1
+    # stop() cancelled the workers mid-claim; what they had leased was handed back
+    assert released and all(retry_in == 0.0 for _, _, retry_in in released)
@@ -0,0 +1,28 @@
+# backend/tests/test_tts_service.py
+from types import SimpleNamespace
+
+import pytest
+
+from tts_service import TTSQueueFull, TTSService
+
+
+class VoicedEngine:
+    voices = [SimpleNamespace(id="hi-voice", name="hindi", languages=["hi"]),
+              SimpleNamespace(id="es-voice", name="spanish", languages=["es"])]
+
+    def getProperty(self, name):
+        return self.voices if name == "voices" else None
+
+
+def test_queue_bound_covers_every_lane():
+    service = TTSService(VoicedEngine, max_queue=4, lane_workers=1)
+    service.load_voices(["hi", "es"])
+    # workers are not started, so everything submitted stays queued
+    for lang in ("hi", "es", "en", "hi"):
+        service.submit("hello", lang)
+    with pytest.raises(TTSQueueFull):
+        service.submit("hello", "es")
+    stats = service.stats()
+    assert stats["queue_depth"] == 4
+    assert stats["rejected"] == 1
+    assert {name: lane["queue_depth"] for name, lane in stats["lanes"].items()} == {"default": 1, "hi": 2, "es": 1}
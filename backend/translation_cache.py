@@ -0,0 +1,128 @@
+# backend/translation_cache.py
+"""Two-tier translation cache: bounded in-process LRU over a persistent SQLite table."""
+
+import sqlite3
+import threading
+import time
+import unicodedata
+from collections import OrderedDict
+from typing import Iterable, Tuple
+
+
+def normalize_text(text: str) -> str:
+    """Cache key form of `text`: Unicode NFC with whitespace runs collapsed."""
+    return " ".join(unicodedata.normalize("NFC", text).split())
+
+
+class TranslationCache:
+    def __init__(self, db_path: str, memory_size: int = 2048, ttl_seconds: float = 30 * 24 * 3600,
+                 max_rows: int = 100_000):
+        self.db_path = db_path
+        self.memory_size = memory_size
+        self.ttl_seconds = ttl_seconds
+        self.max_rows = max_rows
+        # (text_key, target, provider) -> (translation, expires_at)
+        self._memory: "OrderedDict[Tuple[str, str, str], Tuple[str, float]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._writes_since_trim = 0
+        self.hits = {"memory": 0, "sqlite": 0}
+        self.misses = 0
+        self._conn = sqlite3.connect(db_path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS translation_cache (
+                text_key TEXT NOT NULL,
+                target TEXT NOT NULL,
+                provider TEXT NOT NULL,
+                translation TEXT NOT NULL,
+                expires_at REAL NOT NULL,
+                last_used REAL NOT NULL,
+                PRIMARY KEY (text_key, target, provider)
+            )
+            """
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_translation_cache_last_used ON translation_cache (last_used)")
+        self._conn.commit()
+
+    def get(self, text: str, target: str, providers: Iterable[str]) -> Tuple[str, str, str] | None:
+        """Return (translation, provider, tier) for the first provider in `providers` with a live entry."""
+        key = normalize_text(text)
+        providers = list(providers)
+        now = time.time()
+        with self._lock:
+            for provider in providers:
+                entry = self._memory.get((key, target, provider))
+                if entry is None:
+                    continue
+                if entry[1] <= now:
+                    del self._memory[(key, target, provider)]
+                    continue
+                self._memory.move_to_end((key, target, provider))
+                self.hits["memory"] += 1
+                return entry[0], provider, "memory"
+            rows = self._conn.execute(
+                "SELECT provider, translation, expires_at FROM translation_cache WHERE text_key = ? AND target = ?",
+                (key, target),
+            ).fetchall()
+            found = {p: (t, exp) for p, t, exp in rows if exp > now}
+            for provider in providers:
+                if provider in found:
+                    translation, expires_at = found[provider]
+                    self._remember((key, target, provider), translation, expires_at)
+                    self._conn.execute(
+                        "UPDATE translation_cache SET last_used = ? WHERE text_key = ? AND target = ? AND provider = ?",
+                        (now, key, target, provider),
+                    )
+                    self._conn.commit()
+                    self.hits["sqlite"] += 1
+                    return translation, provider, "sqlite"
+            self.misses += 1
+        return None
+
+    def put(self, text: str, target: str, provider: str, translation: str):
+        key = normalize_text(text)
+        now = time.time()
+        expires_at = now + self.ttl_seconds
+        with self._lock:
+            self._remember((key, target, provider), translation, expires_at)
+            self._conn.execute(
+                "INSERT OR REPLACE INTO translation_cache (text_key, target, provider, translation, expires_at, last_used) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (key, target, provider, translation, expires_at, now),
+            )
+            self._writes_since_trim += 1
+            if self._writes_since_trim >= 100:
+                self._trim(now)
+            self._conn.commit()
+
+    def _remember(self, mkey, translation: str, expires_at: float):
+        self._memory[mkey] = (translation, expires_at)
+        self._memory.move_to_end(mkey)
+        while len(self._memory) > self.memory_size:
+            self._memory.popitem(last=False)
+
+    def _trim(self, now: float):
+        # Drop expired rows, then the least recently used ones above max_rows
+        self._writes_since_trim = 0
+        self._conn.execute("DELETE FROM translation_cache WHERE expires_at <= ?", (now,))
+        self._conn.execute(
+            "DELETE FROM translation_cache WHERE rowid IN ("
+            "SELECT rowid FROM translation_cache ORDER BY last_used DESC LIMIT -1 OFFSET ?)",
+            (self.max_rows,),
+        )
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.hits["memory"] + self.hits["sqlite"] + self.misses
+            return {
+                "memory_entries": len(self._memory),
+                "hits": dict(self.hits),
+                "misses": self.misses,
+                "hit_rate": round((lookups - self.misses) / lookups, 4) if lookups else 0.0,
+            }
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
@@ -0,0 +1,325 @@
+# backend/translation_jobs.py
+"""Asynchronous translation jobs for long documents, persisted in SQLite.
+
+A job is split into chunks up front; every chunk is a row that workers
+claim with a lease, translate and write back. Progress is therefore on
+disk as it happens: after a restart (or a crashed worker) the unfinished
+chunks are claimed again once their lease runs out, and finished ones are
+never redone. Several server processes can share one database.
+"""
+
+import asyncio
+import logging
+import sqlite3
+import threading
+import time
+import uuid
+from typing import Awaitable, Callable, List, Tuple
+
+import deadline
+
+logger = logging.getLogger("healthassistant.jobs")
+
+# (chunk text, target, source) -> (translation, provider, cache tier)
+TranslateFn = Callable[[str, str, str], Awaitable[Tuple[str, str, str | None]]]
+# (job text, target) -> text returned when chunks could not be translated
+FallbackFn = Callable[[str, str], str]
+
+
+class JobStore:
+    def __init__(self, db_path: str):
+        self.db_path = db_path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(db_path, check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute("PRAGMA busy_timeout=5000")
+        self._conn.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS translation_jobs (
+                id TEXT PRIMARY KEY,
+                text TEXT NOT NULL,
+                target TEXT NOT NULL,
+                source TEXT NOT NULL,
+                status TEXT NOT NULL,
+                total INTEGER NOT NULL,
+                done INTEGER NOT NULL DEFAULT 0,
+                translated_text TEXT,
+                provider TEXT,
+                error TEXT,
+                created_at REAL NOT NULL,
+                updated_at REAL NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS translation_job_chunks (
+                job_id TEXT NOT NULL,
+                idx INTEGER NOT NULL,
+                text TEXT NOT NULL,
+                trailing TEXT NOT NULL,
+                translation TEXT,
+                provider TEXT,
+                attempts INTEGER NOT NULL DEFAULT 0,
+                lease_until REAL NOT NULL DEFAULT 0,
+                PRIMARY KEY (job_id, idx)
+            );
+            CREATE INDEX IF NOT EXISTS idx_translation_jobs_status ON translation_jobs (status, created_at);
+            """
+        )
+        self._conn.commit()
+
+    def create(self, text: str, target: str, source: str, chunks: List[Tuple[str, str]]) -> str:
+        job_id = uuid.uuid4().hex
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "INSERT INTO translation_jobs (id, text, target, source, status, total, created_at, updated_at)"
+                " VALUES (?, ?, ?, ?, 'queued', ?, ?, ?)",
+                (job_id, text, target, source, len(chunks), now, now),
+            )
+            self._conn.executemany(
+                "INSERT INTO translation_job_chunks (job_id, idx, text, trailing) VALUES (?, ?, ?, ?)",
+                [(job_id, i, chunk, trailing) for i, (chunk, trailing) in enumerate(chunks)],
+            )
+            self._conn.commit()
+        return job_id
+
+    def claim(self, lease_seconds: float) -> sqlite3.Row | None:
+        """Lease the oldest untranslated chunk of any unfinished job."""
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                """
+                UPDATE translation_job_chunks
+                   SET lease_until = ?, attempts = attempts + 1
+                 WHERE rowid = (
+                       SELECT c.rowid FROM translation_job_chunks c
+                         JOIN translation_jobs j ON j.id = c.job_id
+                        WHERE j.status IN ('queued', 'running')
+                          AND c.translation IS NULL AND c.lease_until < ?
+                        ORDER BY j.created_at, c.idx
+                        LIMIT 1)
+                RETURNING job_id, idx, text, attempts
+                """,
+                (now + lease_seconds, now),
+            ).fetchone()
+            if row is not None:
+                self._conn.execute(
+                    "UPDATE translation_jobs SET status = 'running', updated_at = ? WHERE id = ? AND status = 'queued'",
+                    (now, row["job_id"]),
+                )
+            self._conn.commit()
+        return row
+
+    def release(self, job_id: str, idx: int, retry_in: float):
+        """Give a chunk back to the pool after a failed attempt."""
+        with self._lock:
+            self._conn.execute(
+                "UPDATE translation_job_chunks SET lease_until = ? WHERE job_id = ? AND idx = ?",
+                (time.time() + retry_in, job_id, idx),
+            )
+            self._conn.commit()
+
+    def complete_chunk(self, job_id: str, idx: int, translation: str, provider: str) -> bool:
+        """Store a chunk's translation; True when it was the job's last one."""
+        now = time.time()
+        with self._lock:
+            updated = self._conn.execute(
+                "UPDATE translation_job_chunks SET translation = ?, provider = ?"
+                " WHERE job_id = ? AND idx = ? AND translation IS NULL",
+                (translation, provider, job_id, idx),
+            ).rowcount
+            if updated:
+                self._conn.execute(
+                    "UPDATE translation_jobs SET done = done + 1, updated_at = ? WHERE id = ?", (now, job_id))
+            row = self._conn.execute("SELECT done, total FROM translation_jobs WHERE id = ?", (job_id,)).fetchone()
+            self._conn.commit()
+        return bool(updated) and row["done"] == row["total"]
+
+    def chunks(self, job_id: str) -> List[sqlite3.Row]:
+        with self._lock:
+            return self._conn.execute(
+                "SELECT idx, text, trailing, translation, provider FROM translation_job_chunks"
+                " WHERE job_id = ? ORDER BY idx",
+                (job_id,),
+            ).fetchall()
+
+    def finish(self, job_id: str, status: str, translated_text: str, provider: str, error: str | None = None):
+        with self._lock:
+            self._conn.execute(
+                "UPDATE translation_jobs SET status = ?, translated_text = ?, provider = ?, error = ?, updated_at = ?"
+                " WHERE id = ?",
+                (status, translated_text, provider, error, time.time(), job_id),
+            )
+            self._conn.commit()
+
+    def unassembled(self) -> List[sqlite3.Row]:
+        """Jobs whose chunks are all done but that were never finished (process died in between)."""
+        with self._lock:
+            return self._conn.execute(
+                "SELECT * FROM translation_jobs WHERE status IN ('queued', 'running') AND done = total").fetchall()
+
+    def get(self, job_id: str) -> sqlite3.Row | None:
+        with self._lock:
+            return self._conn.execute("SELECT * FROM translation_jobs WHERE id = ?", (job_id,)).fetchone()
+
+    def purge(self, older_than: float) -> int:
+        """Drop finished jobs last updated before `older_than` (epoch seconds)."""
+        with self._lock:
+            ids = [r[0] for r in self._conn.execute(
+                "SELECT id FROM translation_jobs WHERE status IN ('completed', 'failed') AND updated_at < ?",
+                (older_than,),
+            )]
+            self._conn.executemany("DELETE FROM translation_job_chunks WHERE job_id = ?", [(i,) for i in ids])
+            self._conn.executemany("DELETE FROM translation_jobs WHERE id = ?", [(i,) for i in ids])
+            self._conn.commit()
+        return len(ids)
+
+    def stats(self) -> dict:
+        with self._lock:
+            rows = self._conn.execute("SELECT status, COUNT(*) FROM translation_jobs GROUP BY status").fetchall()
+        return {status: count for status, count in rows}
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+class JobRunner:
+    """A fixed pool of worker tasks translating job chunks from a JobStore.
+
+    Workers wake when a job is submitted and otherwise poll every
+    `poll_seconds` (which also picks up expired leases and jobs created by
+    other processes). Store calls run in threads: another process holding
+    the database lock stalls one worker, not the event loop. A chunk gets `chunk_timeout` seconds per attempt; one
+    that comes back from the demo fallback is retried with backoff up to
+    `max_attempts` times, after which the job is marked failed.
+    """
+
+    def __init__(self, store: JobStore, translate: TranslateFn, fallback: FallbackFn, workers: int = 4,
+                 chunk_timeout: float = 60.0, max_attempts: int = 3, poll_seconds: float = 1.0):
+        self.store = store
+        self.translate = translate
+        self.fallback = fallback
+        self.workers = workers
+        self.chunk_timeout = chunk_timeout
+        self.max_attempts = max_attempts
+        self.poll_seconds = poll_seconds
+        # leases outlive an attempt, so a live worker never loses its chunk
+        self.lease_seconds = chunk_timeout + 30.0
+        self._wakeup = asyncio.Event()
+        self._progress = asyncio.Condition()
+        self._tasks: List[asyncio.Task] = []
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self.busy = 0
+        self.chunks_done = 0
+        self.chunk_retries = 0
+
+    def start(self):
+        for job in self.store.unassembled():
+            self._assemble(job)
+        self._loop = asyncio.get_running_loop()
+        self._tasks = [asyncio.create_task(self._worker(i)) for i in range(self.workers)]
+
+    async def stop(self):
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+    def submit(self):
+        """Wake an idle worker; safe to call from any thread (sync endpoints run in the threadpool)."""
+        if self._loop is None:
+            self._wakeup.set()
+        else:
+            self._loop.call_soon_threadsafe(self._wakeup.set)
+
+    async def wait_for_progress(self, timeout: float):
+        """Return after the next chunk finishes anywhere in this process, or after `timeout`."""
+        async with self._progress:
+            try:
+                await asyncio.wait_for(self._progress.wait(), timeout)
+            except asyncio.TimeoutError:
+                pass
+
+    async def _claim(self) -> sqlite3.Row | None:
+        claim = asyncio.ensure_future(asyncio.to_thread(self.store.claim, self.lease_seconds))
+        try:
+            return await asyncio.shield(claim)
+        except asyncio.CancelledError:
+            # the UPDATE runs on regardless; hand back whatever it leased
+            try:
+                row = await claim
+            except sqlite3.Error:
+                row = None
+            if row is not None:
+                await asyncio.to_thread(self.store.release, row["job_id"], row["idx"], 0.0)
+            raise
+
+    async def _worker(self, number: int):
+        while True:
+            try:
+                row = await self._claim()
+            except sqlite3.Error as exc:
+                logger.warning("job_worker=%d status=claim_error error=%s", number, exc)
+                row = None
+            if row is None:
+                self._wakeup.clear()
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), self.poll_seconds)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+            self.busy += 1
+            try:
+                await self._run_chunk(row)
+            except asyncio.CancelledError:
+                # shutting down: hand the chunk straight back instead of waiting out the lease
+                await asyncio.to_thread(self.store.release, row["job_id"], row["idx"], 0.0)
+                raise
+            except Exception as exc:
+                logger.exception("job=%s chunk=%d status=worker_error error=%s", row["job_id"], row["idx"], exc)
+                await asyncio.to_thread(self.store.release, row["job_id"], row["idx"], self.poll_seconds)
+            finally:
+                self.busy -= 1
+            async with self._progress:
+                self._progress.notify_all()
+
+    async def _run_chunk(self, row: sqlite3.Row):
+        job_id, idx, attempts = row["job_id"], row["idx"], row["attempts"]
+        job = await asyncio.to_thread(self.store.get, job_id)
+        if job is None or job["status"] not in ("queued", "running"):
+            return
+        # each attempt gets its own budget; deadline.* works the same as in a request
+        deadline.start(self.chunk_timeout)
+        translation, provider, _ = await self.translate(row["text"], job["target"], job["source"])
+        if provider == "demo" and attempts < self.max_attempts:
+            self.chunk_retries += 1
+            logger.warning("job=%s chunk=%d status=retry attempt=%d", job_id, idx, attempts)
+            await asyncio.to_thread(self.store.release, job_id, idx, min(30.0, 2.0 ** attempts))
+            return
+        self.chunks_done += 1
+        if await asyncio.to_thread(self.store.complete_chunk, job_id, idx, translation, provider):
+            await asyncio.to_thread(self._assemble, job)
+
+    def _assemble(self, job: sqlite3.Row):
+        chunks = self.store.chunks(job["id"])
+        used = {c["provider"] for c in chunks}
+        if "demo" in used:
+            failed = sum(1 for c in chunks if c["provider"] == "demo")
+            self.store.finish(job["id"], "failed", self.fallback(job["text"], job["target"]), "demo",
+                              f"{failed} of {len(chunks)} chunks could not be translated.")
+            logger.warning("job=%s status=failed chunks=%d failed=%d", job["id"], len(chunks), failed)
+            return
+        text = "".join(c["translation"] + c["trailing"] for c in chunks)
+        provider = used.pop() if len(used) == 1 else "mixed"
+        self.store.finish(job["id"], "completed", text, provider)
+        logger.info("job=%s status=completed chunks=%d provider=%s", job["id"], len(chunks), provider)
+
+    def stats(self) -> dict:
+        return {
+            "workers": self.workers,
+            "busy": self.busy,
+            "chunks_done": self.chunks_done,
+            "chunk_retries": self.chunk_retries,
+            "jobs": self.store.stats(),
+        }
@@ -0,0 +1,486 @@
+# backend/tts_service.py
+"""Text-to-speech off the request path: a fixed pool of engine threads behind a bounded priority queue."""
+
+import functools
+import itertools
+import logging
+import multiprocessing
+import os
+import queue
+import subprocess
+import threading
+import time
+import uuid
+from collections import OrderedDict, deque
+from typing import Any, Callable, Dict, Iterable, List, NamedTuple, Tuple
+
+logger = logging.getLogger("healthassistant.tts")
+
+PRIORITIES = {"high": 0, "normal": 1, "low": 2}
+
+
+# English names, for engines (SAPI5) whose voices carry no language codes
+LANGUAGE_NAMES = {
+    "en": "english", "hi": "hindi", "ta": "tamil", "te": "telugu", "bn": "bengali", "es": "spanish",
+    "fr": "french", "ar": "arabic", "de": "german", "it": "italian", "pt": "portuguese", "ur": "urdu",
+    "mr": "marathi", "gu": "gujarati", "kn": "kannada", "ml": "malayalam", "pa": "punjabi", "zh": "chinese",
+}
+
+
+class TTSQueueFull(Exception):
+    """Every worker is busy and the queue is at its limit."""
+
+
+class Voice(NamedTuple):
+    id: str
+    name: str
+    languages: Tuple[str, ...]  # lower-case codes such as "hi" or "en-us"
+
+
+def primary_language(code: str) -> str:
+    return code.strip().lower().replace("_", "-").split("-")[0]
+
+
+def _language_codes(voice) -> Tuple[str, ...]:
+    codes = []
+    for lang in getattr(voice, "languages", None) or ():
+        if isinstance(lang, bytes):
+            # the espeak driver prefixes a priority byte: b"\x05hi"
+            lang = lang[1:] if lang[:1] < b" " else lang
+            lang = lang.decode("utf-8", "ignore")
+        codes.append(str(lang).strip().lower().replace("_", "-"))
+    return tuple(c for c in codes if c)
+
+
+def installed_voices(engine) -> List[Voice]:
+    """engine.getProperty("voices") as plain Voice tuples."""
+    return [Voice(str(v.id), str(getattr(v, "name", "") or v.id), _language_codes(v))
+            for v in engine.getProperty("voices") or ()]
+
+
+def voice_map(voices: Iterable[Voice], languages: Iterable[str]) -> Dict[str, str]:
+    """language -> voice id for each of `languages` that has an installed voice.
+
+    An exact code ("hi") beats a regional one ("en-gb"), which beats a
+    match on the language's English name in the voice name.
+    """
+    wanted = {primary_language(lang) for lang in languages}
+    best: Dict[str, Tuple[int, str]] = {}
+    for voice in voices:
+        candidates = [(0 if code == primary_language(code) else 1, primary_language(code)) for code in voice.languages]
+        if not voice.languages:
+            name = voice.name.lower()
+            candidates = [(2, lang) for lang in wanted if LANGUAGE_NAMES.get(lang, "\0") in name]
+        for rank, lang in candidates:
+            if lang in wanted and (lang not in best or rank < best[lang][0]):
+                best[lang] = (rank, voice.id)
+    return {lang: voice_id for lang, (_, voice_id) in best.items()}
+
+
+class EspeakEngine:
+    """pyttsx3-shaped wrapper around the espeak-ng command line.
+
+    Needs no audio device or driver bindings, which suits containers that
+    only render to files.
+    """
+
+    def __init__(self, command: str = "espeak-ng"):
+        self.command = command
+        self._props: Dict[str, Any] = {"rate": 120, "volume": 0.9, "voice": None}
+        self._pending = []
+
+    def setProperty(self, name: str, value):
+        self._props[name] = value
+
+    def getProperty(self, name: str):
+        if name == "voices":
+            return self._voices()
+        return self._props.get(name)
+
+    def _voices(self) -> List[Voice]:
+        # "Pty Language Age/Gender VoiceName File Other Languages"; -v takes the language code
+        out = subprocess.run([self.command, "--voices"], capture_output=True, check=True, timeout=30)
+        voices = []
+        for line in out.stdout.decode("utf-8", "replace").splitlines()[1:]:
+            parts = line.split()
+            if len(parts) >= 4:
+                voices.append(Voice(parts[1], parts[3], (parts[1].lower(),)))
+        return voices
+
+    def say(self, text: str):
+        self._pending.append((text, None))
+
+    def save_to_file(self, text: str, path: str):
+        self._pending.append((text, path))
+
+    def runAndWait(self):
+        pending, self._pending = self._pending, []
+        for text, path in pending:
+            args = [self.command, "--stdin", "-s", str(int(self._props["rate"])),
+                    "-a", str(int(self._props["volume"] * 200))]
+            if self._props["voice"]:
+                args += ["-v", str(self._props["voice"])]
+            if path:
+                args += ["-w", path]
+            subprocess.run(args, input=text.encode("utf-8"), capture_output=True, check=True, timeout=120)
+
+
+def make_engine(kind: str = "pyttsx3", rate: int = 120, volume: float = 0.9, voice: str = "",
+                command: str = "espeak-ng"):
+    """A configured engine; module-level so a process pool can pickle it (via functools.partial)."""
+    if kind == "espeak":
+        engine = EspeakEngine(command)
+    else:
+        import pyttsx3
+        engine = pyttsx3.init()
+    engine.setProperty("rate", rate)
+    engine.setProperty("volume", volume)
+    if voice:
+        engine.setProperty("voice", voice)
+    return engine
+
+
+def _engine_process(factory: Callable[[], Any], conn):
+    """Child side of ProcessEngine: apply each batch of calls, then runAndWait."""
+    engine = factory()
+    while True:
+        try:
+            calls = conn.recv()
+        except EOFError:
+            return
+        if calls is None:
+            return
+        try:
+            for name, args in calls:
+                getattr(engine, name)(*args)
+            engine.runAndWait()
+            conn.send(None)
+        except Exception as exc:
+            conn.send(f"{type(exc).__name__}: {exc}")
+
+
+def configured_engine(factory: Callable[[], Any], voice: str):
+    """An engine from `factory` switched to `voice` once, up front (picklable with functools.partial)."""
+    engine = factory()
+    engine.setProperty("voice", voice)
+    return engine
+
+
+class ProcessEngine:
+    """pyttsx3-shaped proxy for an engine that lives in its own process.
+
+    Calls are batched and shipped over a pipe on runAndWait; audio comes
+    back the way save_to_file already works, as a file at the path given,
+    so only short strings cross the process boundary. A child that takes
+    longer than `timeout` or dies is killed and reported as a failure, and
+    TTSService builds a new one for the next job.
+    """
+
+    def __init__(self, factory: Callable[[], Any], timeout: float = 120.0, start_method: str = "spawn"):
+        ctx = multiprocessing.get_context(start_method)
+        self.timeout = timeout
+        self._conn, child = ctx.Pipe()
+        self._process = ctx.Process(target=_engine_process, args=(factory, child), daemon=True)
+        self._process.start()
+        child.close()
+        self._pending = []
+
+    def setProperty(self, name: str, value):
+        self._pending.append(("setProperty", (name, value)))
+
+    def say(self, text: str):
+        self._pending.append(("say", (text,)))
+
+    def save_to_file(self, text: str, path: str):
+        self._pending.append(("save_to_file", (text, path)))
+
+    def runAndWait(self):
+        calls, self._pending = self._pending, []
+        try:
+            self._conn.send(calls)
+            if not self._conn.poll(self.timeout):
+                raise TimeoutError(f"engine process took over {self.timeout:.0f}s")
+            error = self._conn.recv()
+        except (OSError, EOFError, TimeoutError):
+            self.close()
+            raise
+        if error:
+            raise RuntimeError(error)
+
+    def close(self):
+        try:
+            self._conn.send(None)
+        except OSError:
+            pass
+        self._process.join(1.0)
+        if self._process.is_alive():
+            self._process.kill()
+            self._process.join()
+        self._conn.close()
+
+
+class TTSJob:
+    __slots__ = ("id", "text", "lang", "voice", "priority", "output_path", "status", "error", "queued_at",
+                 "started_at", "finished_at", "on_finish", "cancelled")
+
+    def __init__(self, text: str, lang: str, priority: str, output_path: str | None = None,
+                 on_finish: Callable[["TTSJob"], None] | None = None):
+        self.id = uuid.uuid4().hex
+        self.text = text
+        self.lang = lang
+        self.voice: str | None = None
+        self.priority = priority
+        # render to this WAV file instead of playing on the server's speakers
+        self.output_path = output_path
+        # called from the worker thread once the job is done, failed or expired
+        self.on_finish = on_finish
+        # set by `cancel`; read by the worker that takes the job off the queue
+        self.cancelled = False
+        self.status = "queued"
+        self.error: str | None = None
+        self.queued_at = time.time()
+        self.started_at: float | None = None
+        self.finished_at: float | None = None
+
+    def cancel(self):
+        """Nobody wants the result any more: a worker that hasn't started the job skips it."""
+        self.cancelled = True
+
+    def view(self) -> dict:
+        return {
+            "job_id": self.id,
+            "status": self.status,
+            "language": self.lang,
+            "voice": self.voice,
+            "priority": self.priority,
+            "error": self.error,
+            "queued_at": self.queued_at,
+            "started_at": self.started_at,
+            "finished_at": self.finished_at,
+        }
+
+
+class _Lane:
+    """One queue and its workers; `voice` is what the lane's engines are set to (None = engine default).
+
+    Lane queues are unbounded: TTSService bounds the jobs waiting across all lanes.
+    """
+
+    def __init__(self, name: str, voice: str | None, workers: int):
+        self.name = name
+        self.voice = voice
+        self.workers = workers
+        self.queue: "queue.PriorityQueue" = queue.PriorityQueue()
+        self.threads: List[threading.Thread] = []
+        self.peak_depth = 0
+
+
+class TTSService:
+    """Worker threads, each owning one long-lived engine from `engine_factory`.
+
+    Engines are created in (and only ever used by) their own thread, so
+    pyttsx3's runAndWait never runs concurrently on one engine. A failed
+    engine is dropped and rebuilt for the next job. `submit` raises
+    TTSQueueFull once `max_queue` jobs are waiting, counted across all lanes;
+    jobs that waited longer
+    than `max_age` seconds are skipped as stale rather than spoken late,
+    and cancelled ones (`TTSJob.cancel`) are dropped without rendering.
+    pyttsx3 hands out one shared engine per driver within a process, so
+    more than one in-process worker only helps with other engines; the
+    "process" backend gives every worker its own engine process instead.
+
+    `load_voices` maps languages to installed voices. With `lane_workers`
+    set, each mapped language also gets its own lane: a queue and workers
+    whose engines are built with that voice at start, so a request never
+    pays to reconfigure one. Other languages share the default lane, whose
+    workers only switch voice when consecutive jobs need different ones.
+    """
+
+    def __init__(self, engine_factory: Callable[[], Any], workers: int = 1, max_queue: int = 32,
+                 max_age: float = 30.0, history: int = 1000, backend: str = "thread", lane_workers: int = 0):
+        self.engine_factory = engine_factory
+        self.workers = workers
+        # "process": each worker thread drives a ProcessEngine, spreading synthesis across cores
+        self.backend = backend
+        self.lane_workers = lane_workers
+        self.max_queue = max_queue
+        self.max_age = max_age
+        self.voices: Dict[str, str] = {}
+        self.default_voice: str | None = None
+        self._lanes: Dict[str, _Lane] = {"default": _Lane("default", None, workers)}
+        # jobs submitted but not yet taken by a worker, in any lane
+        self._waiting = 0
+        self._seq = itertools.count()
+        self._jobs: "OrderedDict[str, TTSJob]" = OrderedDict()
+        self._history = history
+        self._lock = threading.Lock()
+        self._synth_ms = deque(maxlen=500)
+        self._wait_ms = deque(maxlen=500)
+        self.busy = 0
+        self.counts = {"submitted": 0, "rejected": 0, "done": 0, "failed": 0, "expired": 0, "cancelled": 0,
+                       "engine_inits": 0, "voice_switches": 0}
+
+    def load_voices(self, languages: Iterable[str]) -> Dict[str, str]:
+        """Enumerate installed voices once (before `start`) and map `languages` onto them."""
+        engine = self.engine_factory()
+        voices = installed_voices(engine)
+        current = engine.getProperty("voice")
+        self.default_voice = str(current) if current else None
+        self.voices = voice_map(voices, languages)
+        if self.lane_workers > 0:
+            for lang, voice in self.voices.items():
+                self._lanes[lang] = _Lane(lang, voice, self.lane_workers)
+        logger.info("tts status=voices installed=%d mapped=%s", len(voices),
+                    ",".join(f"{lang}:{voice}" for lang, voice in sorted(self.voices.items())) or "none")
+        return self.voices
+
+    def voice_for(self, lang: str) -> str | None:
+        return self.voices.get(primary_language(lang))
+
+    def start(self):
+        for lane in self._lanes.values():
+            for i in range(lane.workers):
+                thread = threading.Thread(target=self._worker, args=(lane, i), name=f"tts-{lane.name}-{i}",
+                                          daemon=True)
+                thread.start()
+                lane.threads.append(thread)
+
+    def stop(self, timeout: float = 2.0):
+        # sentinels sort after every real job, so queued speech is dropped only if the pool can't drain in time
+        for lane in self._lanes.values():
+            for _ in lane.threads:
+                lane.queue.put((len(PRIORITIES), next(self._seq), None))
+        for lane in self._lanes.values():
+            for thread in lane.threads:
+                thread.join(timeout)
+            lane.threads = []
+
+    def submit(self, text: str, lang: str, priority: str = "normal", output_path: str | None = None,
+               on_finish: Callable[[TTSJob], None] | None = None) -> TTSJob:
+        job = TTSJob(text, lang, priority, output_path, on_finish)
+        job.voice = self.voice_for(lang)
+        lane = self._lanes.get(primary_language(lang), self._lanes["default"])
+        with self._lock:
+            if self._waiting >= self.max_queue:
+                self.counts["rejected"] += 1
+                raise TTSQueueFull(f"{self.max_queue} speech jobs already queued")
+            self._waiting += 1
+            lane.queue.put_nowait((PRIORITIES[priority], next(self._seq), job))
+            self.counts["submitted"] += 1
+            lane.peak_depth = max(lane.peak_depth, lane.queue.qsize())
+            self._jobs[job.id] = job
+            while len(self._jobs) > self._history:
+                self._jobs.popitem(last=False)
+        return job
+
+    def get(self, job_id: str) -> TTSJob | None:
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def queue_depth(self) -> int:
+        with self._lock:
+            return self._waiting
+
+    def _new_engine(self, lane: _Lane):
+        factory = self.engine_factory
+        if lane.voice:
+            factory = functools.partial(configured_engine, factory, lane.voice)
+        if self.backend == "process":
+            engine = ProcessEngine(factory)
+        else:
+            engine = factory()
+        with self._lock:
+            self.counts["engine_inits"] += 1
+        return engine
+
+    def _worker(self, lane: _Lane, number: int):
+        # warm: the engine (and its voice) is ready before the first job arrives
+        engine, voice = None, lane.voice or self.default_voice
+        try:
+            engine = self._new_engine(lane)
+        except Exception as exc:
+            logger.warning("tts_worker=%s-%d status=engine_error error=%s", lane.name, number, exc)
+        while True:
+            _, _, job = lane.queue.get()
+            if job is None:
+                if hasattr(engine, "close"):
+                    engine.close()
+                return
+            with self._lock:
+                self._waiting -= 1
+            if job.cancelled:
+                self._finish(job, "cancelled")
+                continue
+            job.started_at = time.time()
+            waited = job.started_at - job.queued_at
+            self._wait_ms.append(waited * 1000)
+            if waited > self.max_age:
+                self._finish(job, "expired")
+                continue
+            job.status = "rendering" if job.output_path else "speaking"
+            with self._lock:
+                self.busy += 1
+            try:
+                if engine is None:
+                    engine, voice = self._new_engine(lane), lane.voice or self.default_voice
+                wanted = job.voice or lane.voice or self.default_voice
+                if wanted and wanted != voice:
+                    # shared lane only: a dedicated lane's engine already has its voice
+                    engine.setProperty("voice", wanted)
+                    voice = wanted
+                    with self._lock:
+                        self.counts["voice_switches"] += 1
+                t0 = time.perf_counter()
+                if job.output_path:
+                    engine.save_to_file(job.text, job.output_path)
+                else:
+                    engine.say(job.text)
+                engine.runAndWait()
+                if job.output_path and not os.path.getsize(job.output_path):
+                    raise RuntimeError("engine wrote an empty file")
+                self._synth_ms.append((time.perf_counter() - t0) * 1000)
+                self._finish(job, "done")
+            except Exception as exc:
+                logger.warning("tts_worker=%s-%d job=%s status=failed error=%s", lane.name, number, job.id, exc)
+                if hasattr(engine, "close"):
+                    engine.close()
+                engine = None
+                self._finish(job, "failed", str(exc))
+            finally:
+                with self._lock:
+                    self.busy -= 1
+
+    def _finish(self, job: TTSJob, status: str, error: str | None = None):
+        job.status, job.error, job.finished_at = status, error, time.time()
+        with self._lock:
+            self.counts[status] += 1
+        if job.on_finish is not None:
+            try:
+                job.on_finish(job)
+            except Exception as exc:
+                logger.warning("tts job=%s status=callback_error error=%s", job.id, exc)
+
+    def stats(self) -> Dict[str, Any]:
+        def pct(samples, p: float) -> float:
+            samples = sorted(samples)
+            return round(samples[min(len(samples) - 1, int(len(samples) * p))], 1) if samples else 0.0
+
+        with self._lock:
+            counts = dict(self.counts)
+            busy = self.busy
+        lanes = {name: {"voice": lane.voice, "workers": lane.workers, "queue_depth": lane.queue.qsize(),
+                        "peak_queue_depth": lane.peak_depth}
+                 for name, lane in self._lanes.items()}
+        return {
+            "backend": self.backend,
+            "workers": sum(lane.workers for lane in self._lanes.values()),
+            "busy": busy,
+            "queue_depth": self.queue_depth(),
+            "max_queue": self.max_queue,
+            **counts,
+            "voices": dict(self.voices),
+            "lanes": lanes,
+            "synthesis_ms": {"p50": pct(self._synth_ms, 0.5), "p95": pct(self._synth_ms, 0.95),
+                             "max": pct(self._synth_ms, 1.0)},
+            "queue_wait_ms": {"p50": pct(self._wait_ms, 0.5), "p95": pct(self._wait_ms, 0.95)},
+        }
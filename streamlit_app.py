@@ -2,6 +2,7 @@
 import streamlit as st
 import requests
 import os
+import json
 import traceback
 from dotenv import load_dotenv
 
@@ -9,6 +10,10 @@ load_dotenv()  # safe to call; Streamlit Cloud will ignore .env in repo
 
 # default backend URL — override via Streamlit Secrets or the UI
 DEFAULT_BACKEND = os.getenv("BACKEND_URL", "http://localhost:8000")
+# The backend answers within X-Request-Timeout (best effort once it runs out),
+# so ask for a little less than we are willing to wait
+TRANSLATE_TIMEOUT = 12
+DEADLINE_HEADERS = {"X-Request-Timeout": str(TRANSLATE_TIMEOUT - 2)}
 
 st.set_page_config(page_title="Multilingual Health Assistant — Demo", layout="centered")
 
@@ -42,14 +47,52 @@ with st.expander("Backend status / debug"):
 st.header("Translate")
 txt = st.text_area("Health message", "")
 lang = st.selectbox("Language", ["hi","ta","te","bn","es","fr","ar","en"], index=0)
+stream = st.checkbox("Show the translation as it arrives", value=True)
+
+
+def stream_translation(text, target):
+    """Render /translate/stream progressively; returns the final translation."""
+    placeholder = st.empty()
+    parts, event, final = {}, None, ""
+    with requests.post(f"{BACKEND}/translate/stream", json={"text": text, "target_lang": target},
+                       headers=DEADLINE_HEADERS, stream=True, timeout=TRANSLATE_TIMEOUT) as resp:
+        if not resp.ok:
+            st.error(f"Translate failed: {resp.status_code} — {resp.text}")
+            return ""
+        resp.encoding = "utf-8"
+        for line in resp.iter_lines(decode_unicode=True):
+            if line.startswith("event:"):
+                event = line[len("event:"):].strip()
+                continue
+            if not line.startswith("data:"):
+                continue
+            data = json.loads(line[len("data:"):])
+            if event == "delta":
+                parts[data["index"]] = parts.get(data["index"], "") + data["delta"]
+            elif event == "segment":
+                parts[data["index"]] = data["translated_text"]
+            elif event == "done":
+                final = data.get("translated_text", "")
+            placeholder.write(final or "".join(parts[i] for i in sorted(parts)))
+    return final
+
 
 if st.button("Translate"):
     if not txt.strip():
         st.warning("Please enter a short health message to translate.")
+    elif stream:
+        try:
+            st.success("Translation:")
+            if not stream_translation(txt, lang):
+                st.warning("Translation returned empty.")
+        except Exception:
+            st.error("Exception calling translate stream endpoint. See details below.")
+            st.code(traceback.format_exc(), language="python")
     else:
         with st.spinner("Translating..."):
             try:
-                resp = requests.post(f"{BACKEND}/translate", json={"text": txt, "target_lang": lang}, timeout=12)
+                resp = requests.post(f"{BACKEND}/translate", json={"text": txt, "target_lang": lang},
+                                     headers=DEADLINE_HEADERS, timeout=TRANSLATE_TIMEOUT)
                 if resp.ok:
                     data = resp.json()
                     translated = data.get("translated_text") or data.get("translation") or ""